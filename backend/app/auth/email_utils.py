@@ -1,20 +1,172 @@
+# FILE: app/auth/email_utils.py
+#
+# Outgoing mail goes through the Mongo outbox (app/models/email_outbox_model.py):
+# request handlers only enqueue, and EmailWorker sends in the background
+# over long-lived SMTP connections.
+#
+# SMTP_EMAIL and SMTP_PASSWORD have no defaults: without them the worker
+# does not start and messages wait in the outbox. An empty SMTP_PASSWORD
+# skips login. For local testing point it at an SMTP stand-in, e.g.
+#   python -m aiosmtpd -n -l localhost:8025
+#   SMTP_HOST=localhost SMTP_PORT=8025 SMTP_STARTTLS=false SMTP_EMAIL=dev@localhost SMTP_PASSWORD= uvicorn app.main:app
+
+import asyncio
+import os
 import smtplib
+import uuid
+from datetime import datetime, timedelta
 from email.mime.text import MIMEText
 
-SMTP_EMAIL = "aditya639036@gmail.com"
-SMTP_PASSWORD = "lans yhwr bwsg ylsh"
+from app.models.email_outbox_model import (
+    enqueue_email,
+    claim_next_email,
+    mark_email_sent,
+    mark_email_failed,
+    mark_email_dropped,
+    email_drop_reason,
+)
+
+SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "true").lower() == "true"
+SMTP_EMAIL = os.getenv("SMTP_EMAIL")
+SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
+
+# Number of concurrent senders; each keeps one authenticated connection
+EMAIL_CONCURRENCY = int(os.getenv("EMAIL_CONCURRENCY", "2"))
+EMAIL_POLL_SECONDS = float(os.getenv("EMAIL_POLL_SECONDS", "2.0"))
+
 
-def send_otp_email(to_email, otp):
-    msg = MIMEText(f"Your password reset OTP is: {otp}\nValid for 10 minutes.")
-    msg["Subject"] = "Password Reset OTP"
+def build_message(to_email: str, subject: str, body: str):
+    msg = MIMEText(body)
+    msg["Subject"] = subject
     msg["From"] = SMTP_EMAIL
     msg["To"] = to_email
+    return msg
+
+
+# ---------------------------
+# ENQUEUE (request path)
+# ---------------------------
+async def send_otp_email(to_email, otp):
+    await enqueue_email(
+        to_email,
+        "Password Reset OTP",
+        f"Your password reset OTP is: {otp}\nValid for 10 minutes.",
+        # verify_otp rejects it after 10 minutes; don't send a dead code
+        expires_at=datetime.utcnow() + timedelta(minutes=10),
+    )
+
+
+# ---------------------------
+# SMTP CONNECTION (reused across messages)
+# ---------------------------
+class SMTPConnection:
+    def __init__(self):
+        self.server = None
+
+    def _connect(self):
+        server = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=30)
+        if SMTP_STARTTLS:
+            server.starttls()
+        if SMTP_PASSWORD:
+            server.login(SMTP_EMAIL, SMTP_PASSWORD)
+        self.server = server
+
+    def send(self, to_email: str, subject: str, body: str):
+        msg = build_message(to_email, subject, body)
+
+        if self.server is None:
+            self._connect()
+        try:
+            self.server.sendmail(SMTP_EMAIL, to_email, msg.as_string())
+        except smtplib.SMTPServerDisconnected:
+            # Idle connection was dropped by the server: reconnect once
+            self._connect()
+            self.server.sendmail(SMTP_EMAIL, to_email, msg.as_string())
+
+    def close(self):
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except Exception:
+                pass
+            self.server = None
+
+
+# ---------------------------
+# BACKGROUND SENDER
+# ---------------------------
+class EmailWorker:
+    """
+    EMAIL_CONCURRENCY sender loops, each owning one SMTP connection.
+    Every loop claims a message from the outbox, sends it off the event
+    loop, and records success or schedules a retry with backoff.
+    """
+
+    def __init__(self, concurrency: int, poll_seconds: float):
+        self.concurrency = concurrency
+        self.poll_seconds = poll_seconds
+        self.worker_id = uuid.uuid4().hex
+        self._stopping = None
+        self._tasks = []
+
+    def start(self):
+        if SMTP_EMAIL is None or SMTP_PASSWORD is None:
+            print("Email Worker disabled: set SMTP_EMAIL and SMTP_PASSWORD")
+            return
+
+        self._stopping = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._run(SMTPConnection()))
+            for _ in range(self.concurrency)
+        ]
+
+    async def stop(self):
+        if self._stopping is None:
+            return
+        self._stopping.set()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._stopping = None
+
+    async def _run(self, conn: SMTPConnection):
+        try:
+            while not self._stopping.is_set():
+                try:
+                    sent = await self._send_next(conn)
+                except Exception as e:
+                    print("Email Worker Error:", e)
+                    sent = False
+
+                if not sent:
+                    try:
+                        await asyncio.wait_for(self._stopping.wait(), self.poll_seconds)
+                    except asyncio.TimeoutError:
+                        pass
+        finally:
+            await asyncio.to_thread(conn.close)
+
+    async def _send_next(self, conn: SMTPConnection):
+        msg = await claim_next_email(self.worker_id)
+        if not msg:
+            return False
+
+        reason = email_drop_reason(msg)
+        if reason:
+            await mark_email_dropped(msg["_id"], reason)
+            return True
+
+        try:
+            await asyncio.to_thread(conn.send, msg["to"], msg["subject"], msg["body"])
+        except Exception as e:
+            await asyncio.to_thread(conn.close)
+            print("Email Error:", e)
+            await mark_email_failed(msg["_id"], msg.get("attempts", 0), str(e))
+            return True
+
+        await mark_email_sent(msg["_id"])
+        return True
+
 
-    try:
-        server = smtplib.SMTP("smtp.gmail.com", 587)
-        server.starttls()
-        server.login(SMTP_EMAIL, SMTP_PASSWORD)
-        server.sendmail(SMTP_EMAIL, to_email, msg.as_string())
-        server.quit()
-    except Exception as e:
-        print("Email Error:", e)
+email_worker = EmailWorker(EMAIL_CONCURRENCY, EMAIL_POLL_SECONDS)
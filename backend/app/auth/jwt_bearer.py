@@ -2,7 +2,7 @@
 
 from fastapi import Request, HTTPException
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from app.auth.jwt_handler import decode_access_token
+from app.auth.jwt_handler import decode_access_token_cached
 
 class JwtBearer(HTTPBearer):
     def __init__(self, auto_error: bool = True):
@@ -15,7 +15,7 @@ class JwtBearer(HTTPBearer):
             if credentials.scheme != "Bearer":
                 raise HTTPException(status_code=403, detail="Invalid token scheme")
         
-            payload = decode_access_token(credentials.credentials)
+            payload = await decode_access_token_cached(credentials.credentials)
             return payload  # contains user_id
 
         raise HTTPException(status_code=403, detail="Invalid authorization")
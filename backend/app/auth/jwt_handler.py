@@ -1,7 +1,14 @@
+import hashlib
+import os
+import threading
 import time
+from collections import OrderedDict
+
 import jwt
 from fastapi import HTTPException
 
+from app.models.user_model import get_tokens_valid_after, revoke_user_tokens
+
 SECRET_KEY = "secret123"
 ALGORITHM = "HS256"
 
@@ -11,6 +18,7 @@ EXPIRE_SECONDS = 60 * 60 * 24
 
 def create_access_token(data: dict):
     payload = data.copy()
+    payload["iat"] = time.time()  # fractional: a login right after a revocation must postdate it
     payload["exp"] = int(time.time()) + EXPIRE_SECONDS
     token = jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
     return token
@@ -23,3 +31,126 @@ def decode_access_token(token: str):
         raise HTTPException(status_code=401, detail="Token expired")
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
+
+
+# ---------------------------------------------------
+# VERIFIED-TOKEN CACHE
+# ---------------------------------------------------
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+# How long a worker trusts its copy of a user's tokens_valid_after. The
+# worker that revokes sees it at once; other workers within this window.
+TOKEN_REVOCATION_CHECK_SECONDS = int(os.getenv("TOKEN_REVOCATION_CHECK_SECONDS", "30"))
+
+
+class TokenCache:
+    """
+    Bounded LRU of verified token payloads, keyed by the token's SHA-256.
+    An entry is never served past the token's own exp. Also remembers
+    each user's tokens_valid_after for TOKEN_REVOCATION_CHECK_SECONDS.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()   # digest -> payload
+        self._by_user = {}              # user_id -> {digest}
+        self._valid_after = OrderedDict()  # user_id -> (tokens_valid_after, read at)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _digest(token: str):
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str):
+        digest = self._digest(token)
+        with self._lock:
+            payload = self._entries.get(digest)
+            if payload is None:
+                self.misses += 1
+                return None
+
+            if payload.get("exp", 0) <= time.time():
+                self._remove(digest)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return payload
+
+    def put(self, token: str, payload: dict):
+        if "exp" not in payload:
+            return  # only cache what we know how to expire
+
+        digest = self._digest(token)
+        with self._lock:
+            self._entries[digest] = payload
+            self._entries.move_to_end(digest)
+            self._by_user.setdefault(payload.get("user_id"), set()).add(digest)
+
+            while len(self._entries) > self.maxsize:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+
+    def valid_after(self, user_id: str):
+        """The user's tokens_valid_after, or None when it must be re-read."""
+        with self._lock:
+            entry = self._valid_after.get(user_id)
+            if entry is None or entry[1] + TOKEN_REVOCATION_CHECK_SECONDS <= time.monotonic():
+                return None
+            return entry[0]
+
+    def set_valid_after(self, user_id: str, valid_after: float):
+        with self._lock:
+            self._valid_after[user_id] = (valid_after, time.monotonic())
+            self._valid_after.move_to_end(user_id)
+            while len(self._valid_after) > self.maxsize:
+                self._valid_after.popitem(last=False)
+
+    def invalidate_user(self, user_id: str):
+        """Drop every cached token of a user (logout, password change)."""
+        with self._lock:
+            for digest in self._by_user.pop(user_id, set()):
+                self._entries.pop(digest, None)
+
+    def _remove(self, digest):
+        payload = self._entries.pop(digest, None)
+        if payload is not None:
+            digests = self._by_user.get(payload.get("user_id"))
+            if digests:
+                digests.discard(digest)
+                if not digests:
+                    del self._by_user[payload.get("user_id")]
+
+    def stats(self):
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+token_cache = TokenCache(TOKEN_CACHE_SIZE)
+
+
+async def decode_access_token_cached(token: str):
+    payload = token_cache.get(token)
+    if payload is None:
+        payload = decode_access_token(token)
+        token_cache.put(token, payload)
+
+    # Cached or not, the token must postdate the user's last revocation
+    user_id = payload.get("user_id")
+    valid_after = token_cache.valid_after(user_id)
+    if valid_after is None:
+        valid_after = await get_tokens_valid_after(user_id)
+        token_cache.set_valid_after(user_id, valid_after)
+
+    if payload.get("iat", 0) < valid_after:
+        raise HTTPException(status_code=401, detail="Token revoked")
+
+    return payload
+
+
+async def invalidate_user_tokens(user_id: str):
+    """Revoke every token issued to a user so far (logout, password change)."""
+    valid_after = await revoke_user_tokens(user_id)
+    token_cache.invalidate_user(user_id)
+    token_cache.set_valid_after(user_id, valid_after)
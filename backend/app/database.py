@@ -1,10 +1,29 @@
-from pymongo import MongoClient
+import os
+from motor.motor_asyncio import AsyncIOMotorClient
 
-client = MongoClient("mongodb://localhost:27017/")
+MONGO_URL = os.getenv("MONGO_URL", "mongodb://localhost:27017/")
+
+# Motor connects lazily on the first operation; main.py pings it on
+# startup and closes it on shutdown (see lifespan).
+client = AsyncIOMotorClient(MONGO_URL)
 db = client["task_manager_db"]
 
 users_collection = db["users"]
 tasks_collection = db["tasks"]
 activity_collection = db["activity_logs"]
+activity_daily_collection = db["activity_daily"]
 otp_collection = db["otp_codes"]
+email_outbox_collection = db["email_outbox"]
+reminder_runs_collection = db["reminder_runs"]
+attachments_collection = db["attachments"]
+task_stats_collection = db["task_stats"]
+ai_summaries_collection = db["ai_summaries"]
+task_tombstones_collection = db["task_tombstones"]
+
+
+async def connect_to_mongo():
+    await client.admin.command("ping")
+
 
+def close_mongo_connection():
+    client.close()
@@ -0,0 +1,154 @@
+# FILE: app/indexes.py
+
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+from pymongo.errors import OperationFailure
+
+from app.database import (
+    users_collection,
+    tasks_collection,
+    activity_collection,
+    activity_daily_collection,
+    otp_collection,
+    email_outbox_collection,
+    task_tombstones_collection,
+)
+from app.models.activity_model import ACTIVITY_RETENTION_DAYS
+from app.models.sync_model import SYNC_TOMBSTONE_DAYS
+from app.models.email_outbox_model import EMAIL_RETENTION_DAYS
+
+
+# ---------------------------------------------------
+# INDEXES REQUIRED BY THE MODEL QUERIES
+# ---------------------------------------------------
+# Every index has an explicit name so re-running on startup is a no-op.
+INDEXES = [
+    (users_collection, [
+        # get_user_by_email
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+    ]),
+    (tasks_collection, [
+        # get_tasks_by_user, get_overdue_tasks, get_upcoming_tasks,
+        # get_tasks_page sorted by date
+        IndexModel(
+            [("user_id", ASCENDING), ("date", ASCENDING), ("_id", ASCENDING)],
+            name="user_date_id",
+        ),
+        # get_tasks_page sorted by creation
+        IndexModel([("user_id", ASCENDING), ("_id", ASCENDING)], name="user_id_created"),
+        # get_tasks_page filtered by status / priority; reminder_scheduler.load
+        IndexModel(
+            [("user_id", ASCENDING), ("status", ASCENDING), ("date", ASCENDING), ("_id", ASCENDING)],
+            name="user_status_date_id",
+        ),
+        IndexModel(
+            [("user_id", ASCENDING), ("priority", ASCENDING), ("date", ASCENDING), ("_id", ASCENDING)],
+            name="user_priority_date_id",
+        ),
+        # Kanban columns in order: get_tasks_page(sort="rank", status=...),
+        # get_column_tail_rank, rebalance_column
+        IndexModel(
+            [("user_id", ASCENDING), ("status", ASCENDING), ("rank", ASCENDING), ("_id", ASCENDING)],
+            name="user_status_rank_id",
+        ),
+        # search_tasks: user_id prefix keeps every text search to one user
+        IndexModel(
+            [("user_id", ASCENDING), ("title", TEXT), ("description", TEXT)],
+            name="user_title_description_text",
+            weights={"title": 3, "description": 1},
+            default_language="english",
+        ),
+        # autocomplete_tasks (title_prefixes is multikey)
+        IndexModel(
+            [("user_id", ASCENDING), ("title_prefixes", ASCENDING), ("_id", ASCENDING)],
+            name="user_title_prefixes_id",
+        ),
+        # get_task_changes: stamped changes in order, and pending ones
+        IndexModel([("user_id", ASCENDING), ("seq", ASCENDING), ("_id", ASCENDING)], name="user_seq_id"),
+        IndexModel(
+            [("user_id", ASCENDING)],
+            name="user_sync_pending",
+            partialFilterExpression={"sync_pending": True},
+        ),
+        # cron_overdue.py: open tasks overdue or due tomorrow, across all users
+        IndexModel([("date", ASCENDING), ("status", ASCENDING)], name="date_status"),
+        # reminder_scheduler.resync: tasks written since the last one
+        IndexModel([("updated_at", ASCENDING)], name="updated_at"),
+    ]),
+    (task_tombstones_collection, [
+        # get_task_changes
+        IndexModel([("user_id", ASCENDING), ("seq", ASCENDING), ("_id", ASCENDING)], name="user_seq_id"),
+        IndexModel(
+            [("user_id", ASCENDING)],
+            name="user_sync_pending",
+            partialFilterExpression={"sync_pending": True},
+        ),
+        # Deletes stay syncable for SYNC_TOMBSTONE_DAYS
+        IndexModel(
+            [("deleted_at", ASCENDING)],
+            name="deleted_at_ttl",
+            expireAfterSeconds=SYNC_TOMBSTONE_DAYS * 24 * 60 * 60,
+        ),
+    ]),
+    (activity_collection, [
+        # get_user_activity_page (newest first, optionally by action)
+        IndexModel(
+            [("user_id", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)],
+            name="user_timestamp_id",
+        ),
+        IndexModel(
+            [("user_id", ASCENDING), ("action", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)],
+            name="user_action_timestamp_id",
+        ),
+        # Retention; also serves the rollup job's per-day windows
+        IndexModel(
+            [("timestamp", ASCENDING)],
+            name="timestamp_ttl",
+            expireAfterSeconds=ACTIVITY_RETENTION_DAYS * 24 * 60 * 60,
+        ),
+    ]),
+    (activity_daily_collection, [
+        # rollup upserts, get_user_activity_daily
+        IndexModel(
+            [("user_id", ASCENDING), ("day", DESCENDING), ("action", ASCENDING)],
+            name="user_day_action_unique",
+            unique=True,
+        ),
+    ]),
+    (email_outbox_collection, [
+        # claim_next_email: due pending messages, and expired leases
+        IndexModel([("status", ASCENDING), ("next_attempt_at", ASCENDING)], name="status_next_attempt"),
+        IndexModel([("status", ASCENDING), ("locked_at", ASCENDING)], name="status_locked_at"),
+        # enqueue_email(dedupe_key=...)
+        IndexModel(
+            [("dedupe_key", ASCENDING)],
+            name="dedupe_key_unique",
+            unique=True,
+            partialFilterExpression={"dedupe_key": {"$type": "string"}},
+        ),
+        # Finished messages are kept EMAIL_RETENTION_DAYS
+        IndexModel(
+            [("sent_at", ASCENDING)],
+            name="sent_at_ttl",
+            expireAfterSeconds=EMAIL_RETENTION_DAYS * 24 * 60 * 60,
+        ),
+        IndexModel(
+            [("failed_at", ASCENDING)],
+            name="failed_at_ttl",
+            expireAfterSeconds=EMAIL_RETENTION_DAYS * 24 * 60 * 60,
+        ),
+    ]),
+    (otp_collection, [
+        # verify_otp, mark_otp_used
+        IndexModel([("email", ASCENDING), ("otp", ASCENDING)], name="email_otp"),
+    ]),
+]
+
+
+async def ensure_indexes():
+    for collection, models in INDEXES:
+        for model in models:
+            try:
+                await collection.create_indexes([model])
+            except OperationFailure as e:
+                # e.g. duplicate emails blocking the unique index; keep serving
+                print(f"Index Error ({collection.name}.{model.document['name']}):", e)
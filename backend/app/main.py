@@ -1,3 +1,7 @@
+from dotenv import load_dotenv
+load_dotenv()  # first: app modules read their settings at import time
+
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from app.routes.auth_routes import router as auth_router
 from app.routes.task_routes import router as task_router
@@ -6,10 +10,36 @@ from app.routes.activity_routes import router as activity_router
 from fastapi.staticfiles import StaticFiles
 from app.routes.voice_routes import router as voice_router 
 from app.routes.ai_routes import router as ai_router
-from dotenv import load_dotenv
-load_dotenv()
+from app.database import connect_to_mongo, close_mongo_connection
+from app.indexes import ensure_indexes
+from app.utils.pdf_report import shutdown_report_pool
+from app.models.activity_model import activity_writer
+from app.auth.hash import shutdown_hash_pool
+from app.auth.email_utils import email_worker
+from app.utils.reminder_scheduler import reminder_scheduler, REMINDER_SCHEDULER
+from app.utils.llm_client import start_llm_client, close_llm_client
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await connect_to_mongo()
+    await ensure_indexes()
+    activity_writer.start()
+    email_worker.start()
+    start_llm_client()
+    if REMINDER_SCHEDULER:
+        reminder_scheduler.start()
+    yield
+    await reminder_scheduler.stop()
+    await close_llm_client()
+    await email_worker.stop()
+    await activity_writer.stop()
+    shutdown_report_pool()
+    shutdown_hash_pool()
+    close_mongo_connection()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -17,6 +47,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
@@ -1,19 +1,231 @@
 # FILE: app/models/activity_model.py
 
-from app.database import activity_collection
-from datetime import datetime
+import asyncio
+import os
 
-def log_activity(data):
-    # Always store in UTC
+from app.database import activity_collection, activity_daily_collection
+from app.utils.pagination import encode_cursor, decode_cursor, keyset_filter
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+from pymongo import UpdateOne
+
+ACTIVITY_QUEUE_SIZE = int(os.getenv("ACTIVITY_QUEUE_SIZE", "10000"))
+ACTIVITY_BATCH_SIZE = int(os.getenv("ACTIVITY_BATCH_SIZE", "200"))
+ACTIVITY_FLUSH_SECONDS = float(os.getenv("ACTIVITY_FLUSH_SECONDS", "1.0"))
+
+# Raw entries older than ROLLUP_DAYS are compacted into daily summaries;
+# the TTL index removes anything older than RETENTION_DAYS regardless.
+ACTIVITY_ROLLUP_DAYS = int(os.getenv("ACTIVITY_ROLLUP_DAYS", "30"))
+ACTIVITY_RETENTION_DAYS = int(os.getenv("ACTIVITY_RETENTION_DAYS", "90"))
+
+
+# ---------------------------
+# BUFFERED WRITER
+# ---------------------------
+class ActivityWriter:
+    """
+    Bounded in-process queue of activity records, drained by a background
+    task that writes them with insert_many once a batch fills up or the
+    flush interval passes.
+
+    Backpressure: when the queue is full the caller writes its own record
+    directly, so memory stays bounded and nothing is dropped; only
+    requests made during an overload pay for the audit write.
+    """
+
+    def __init__(self, maxsize: int, batch_size: int, flush_seconds: float):
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.queue = None
+        self._task = None
+
+    def start(self):
+        self.queue = asyncio.Queue(maxsize=self.maxsize)
+        self._task = asyncio.create_task(self._run(self.queue))
+
+    async def stop(self):
+        """Flush everything queued so far and stop the drain task."""
+        if self.queue is None:
+            return
+
+        queue, self.queue = self.queue, None
+        await queue.put(None)  # sentinel: flush and exit
+        await self._task
+        self._task = None
+
+    async def write(self, entry: dict):
+        if self.queue is None:
+            # Not started (scripts, shutdown): write straight through
+            await activity_collection.insert_one(entry)
+            return
+
+        try:
+            self.queue.put_nowait(entry)
+        except asyncio.QueueFull:
+            await activity_collection.insert_one(entry)
+
+    async def write_many(self, entries: list):
+        queue = self.queue
+        if queue is None or queue.maxsize - queue.qsize() < len(entries):
+            # One insert_many rather than a round-trip per entry
+            await activity_collection.insert_many(entries, ordered=False)
+            return
+
+        for entry in entries:
+            queue.put_nowait(entry)
+
+    async def _run(self, queue: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            entry = await queue.get()
+            if entry is None:
+                return
+
+            batch = [entry]
+            deadline = loop.time() + self.flush_seconds
+            stopping = False
+
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    entry = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if entry is None:
+                    stopping = True
+                    break
+                batch.append(entry)
+
+            await self._flush(batch)
+            if stopping:
+                return
+
+    async def _flush(self, batch: list):
+        try:
+            await activity_collection.insert_many(batch, ordered=False)
+        except Exception as e:
+            # Never let a bad batch kill the drain task
+            print("Activity Flush Error:", e)
+
+
+activity_writer = ActivityWriter(ACTIVITY_QUEUE_SIZE, ACTIVITY_BATCH_SIZE, ACTIVITY_FLUSH_SECONDS)
+
+
+async def log_activity(data):
+    # Always store in UTC (stamped now, not when the batch is flushed)
     data["timestamp"] = datetime.utcnow()
-    activity_collection.insert_one(data)
+    await activity_writer.write(data)
+
+
+async def log_activities(entries: list):
+    if not entries:
+        return
+    now = datetime.utcnow()
+    for data in entries:
+        data["timestamp"] = now
+    await activity_writer.write_many(entries)
+
+
+# ---------------------------
+# READ (keyset paginated, newest first)
+# ---------------------------
+async def get_user_activity_page(
+    user_id: str,
+    limit: int,
+    cursor: str = None,
+    action: str = None,
+    since: datetime = None,
+    until: datetime = None,
+):
+    """Returns (logs, next_cursor)."""
+    query = {"user_id": user_id}
+    if action:
+        query["action"] = action
+    if since or until:
+        query["timestamp"] = {}
+        if since:
+            query["timestamp"]["$gte"] = since
+        if until:
+            query["timestamp"]["$lt"] = until
+
+    if cursor:
+        after = decode_cursor(cursor)
+        try:
+            last_ts = datetime.fromisoformat(after["v"])
+        except (KeyError, TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query.update(keyset_filter("timestamp", last_ts, after.get("id"), descending=True))
+
+    logs = await activity_collection.find(query) \
+        .sort([("timestamp", -1), ("_id", -1)]) \
+        .limit(limit + 1).to_list(length=limit + 1)
+
+    next_cursor = None
+    if len(logs) > limit:
+        logs = logs[:limit]
+        last = logs[-1]
+        next_cursor = encode_cursor({"v": last["timestamp"].isoformat(), "id": str(last["_id"])})
 
+    return logs, next_cursor
 
-def get_user_activity(user_id: str):
-    return list(
-        activity_collection.find({"user_id": user_id}).sort("timestamp", -1)
-    )
 
-def delete_user_activity(user_id: str):
-    activity_collection.delete_many({"user_id": user_id})
+async def get_user_activity_daily(user_id: str, limit: int, action: str = None):
+    """Daily per-action rollups of activity older than the rollup window."""
+    query = {"user_id": user_id}
+    if action:
+        query["action"] = action
+
+    return await activity_daily_collection.find(query, {"_id": 0, "user_id": 0}) \
+        .sort([("day", -1), ("action", 1)]) \
+        .limit(limit).to_list(length=limit)
+
+
+async def delete_user_activity(user_id: str):
+    await activity_collection.delete_many({"user_id": user_id})
+    await activity_daily_collection.delete_many({"user_id": user_id})
     return True
+
+
+# ---------------------------
+# ROLLUP (see rollup_activity.py)
+# ---------------------------
+async def rollup_activity_day(day_start: datetime):
+    """
+    Compact one UTC day of raw activity into per-user, per-action counts,
+    then delete the raw entries. $max makes a re-run after a crash
+    between the two steps harmless.
+    """
+    day_end = day_start + timedelta(days=1)
+    day = day_start.strftime("%Y-%m-%d")
+    window = {"timestamp": {"$gte": day_start, "$lt": day_end}}
+
+    groups = await activity_collection.aggregate([
+        {"$match": window},
+        {"$group": {
+            "_id": {"user_id": "$user_id", "action": "$action"},
+            "count": {"$sum": 1},
+        }},
+    ]).to_list(length=None)
+
+    if groups:
+        await activity_daily_collection.bulk_write([
+            UpdateOne(
+                {"user_id": g["_id"]["user_id"], "day": day, "action": g["_id"]["action"]},
+                {"$max": {"count": g["count"]}},
+                upsert=True,
+            )
+            for g in groups
+        ], ordered=False)
+
+    result = await activity_collection.delete_many(window)
+    return len(groups), result.deleted_count
+
+
+async def oldest_activity_timestamp():
+    first = await activity_collection.find({}, {"timestamp": 1}) \
+        .sort("timestamp", 1).limit(1).to_list(length=1)
+    return first[0]["timestamp"] if first else None
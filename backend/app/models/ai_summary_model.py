@@ -0,0 +1,36 @@
+# FILE: app/models/ai_summary_model.py
+#
+# Last AI summary per user, tagged with the hash of the prompt it was
+# generated from:
+#
+#   {_id: user_id, hash: "<sha256>", summary: "...", created_at: datetime}
+#
+# A summary is only served while the user's current prompt hashes the
+# same, so any change the model would see (a title, priority, status, or
+# a task becoming overdue) invalidates it.
+
+import hashlib
+from datetime import datetime
+
+from app.database import ai_summaries_collection
+
+# Everything app/utils/prompt_builder.py reads from a task
+SUMMARY_FIELDS = ["title", "priority", "status", "date"]
+
+
+def prompt_hash(prompt: str):
+    return hashlib.sha256(prompt.encode()).hexdigest()
+
+
+async def get_cached_summary(user_id: str, task_hash: str):
+    doc = await ai_summaries_collection.find_one({"_id": user_id, "hash": task_hash})
+    return doc["summary"] if doc else None
+
+
+async def save_summary(user_id: str, task_hash: str, summary: str):
+    await ai_summaries_collection.replace_one(
+        {"_id": user_id},
+        {"hash": task_hash, "summary": summary, "created_at": datetime.utcnow()},
+        upsert=True,
+    )
+
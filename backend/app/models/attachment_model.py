@@ -0,0 +1,75 @@
+# FILE: app/models/attachment_model.py
+
+from datetime import datetime
+from pymongo import ReturnDocument
+
+from app.database import attachments_collection
+from app.utils.file_store import save_stream, save_bytes, delete_blob, CHUNK_SIZE
+
+
+# ---------------------------
+# REGISTER / RELEASE BLOBS
+# ---------------------------
+# One document per unique blob (keyed by SHA-256). ref_count tracks how
+# many tasks point at it so the file is removed with its last reference.
+async def register_blob(sha256: str, size: int, content_type: str):
+    await attachments_collection.update_one(
+        {"_id": sha256},
+        {
+            "$inc": {"ref_count": 1},
+            "$setOnInsert": {
+                "size": size,
+                "content_type": content_type,
+                "created_at": datetime.utcnow(),
+            },
+        },
+        upsert=True,
+    )
+
+
+async def release_blob(sha256: str):
+    doc = await attachments_collection.find_one_and_update(
+        {"_id": sha256},
+        {"$inc": {"ref_count": -1}},
+        return_document=ReturnDocument.AFTER,
+    )
+
+    if doc and doc["ref_count"] <= 0:
+        result = await attachments_collection.delete_one({"_id": sha256, "ref_count": {"$lte": 0}})
+        if result.deleted_count:
+            delete_blob(sha256)
+
+
+def _metadata(sha256: str, size: int, name: str, content_type: str):
+    return {
+        "name": name,
+        "size": size,
+        "hash": sha256,
+        "content_type": content_type,
+    }
+
+
+# ---------------------------
+# SAVE ATTACHMENTS
+# ---------------------------
+async def save_attachment_upload(upload):
+    """Stream a multipart UploadFile into the store."""
+    async def chunks():
+        while True:
+            chunk = await upload.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+    content_type = upload.content_type or "application/octet-stream"
+    sha256, size = await save_stream(chunks())
+    await register_blob(sha256, size, content_type)
+
+    return _metadata(sha256, size, upload.filename, content_type)
+
+
+async def save_attachment_bytes(raw: bytes, name: str, content_type: str):
+    sha256, size = await save_bytes(raw)
+    await register_blob(sha256, size, content_type)
+
+    return _metadata(sha256, size, name, content_type)
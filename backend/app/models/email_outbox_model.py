@@ -0,0 +1,140 @@
+# FILE: app/models/email_outbox_model.py
+#
+# Durable outbox for outgoing email. Requests only insert a document;
+# the EmailWorker (app/auth/email_utils.py) claims and sends them.
+#
+# Every claim counts as an attempt, including reclaiming a message whose
+# worker died mid-send, so a message that crashes its sender is given up
+# after EMAIL_MAX_ATTEMPTS like one that keeps failing. A message with
+# an expires_at (OTP codes) is dropped rather than sent late. Sent and
+# failed messages are deleted EMAIL_RETENTION_DAYS later (TTL indexes);
+# this also bounds how long a dedupe_key suppresses a repeat.
+
+import os
+from datetime import datetime, timedelta
+
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from app.database import email_outbox_collection
+
+EMAIL_MAX_ATTEMPTS = int(os.getenv("EMAIL_MAX_ATTEMPTS", "5"))
+EMAIL_RETRY_BASE_SECONDS = int(os.getenv("EMAIL_RETRY_BASE_SECONDS", "30"))
+# A message stuck in "sending" longer than this (worker crashed) is retried
+EMAIL_LEASE_SECONDS = int(os.getenv("EMAIL_LEASE_SECONDS", "300"))
+EMAIL_RETENTION_DAYS = int(os.getenv("EMAIL_RETENTION_DAYS", "7"))
+
+
+def _outbox_doc(to_email: str, subject: str, body: str, dedupe_key: str = None, expires_at: datetime = None):
+    now = datetime.utcnow()
+    doc = {
+        "to": to_email,
+        "subject": subject,
+        "body": body,
+        "status": "pending",
+        "attempts": 0,
+        "next_attempt_at": now,
+        "created_at": now,
+    }
+    if dedupe_key:
+        # Unique: enqueueing the same logical message twice is a no-op
+        doc["dedupe_key"] = dedupe_key
+    if expires_at:
+        doc["expires_at"] = expires_at
+    return doc
+
+
+# ---------------------------
+# ENQUEUE
+# ---------------------------
+async def enqueue_email(to_email: str, subject: str, body: str, dedupe_key: str = None, expires_at: datetime = None):
+    try:
+        result = await email_outbox_collection.insert_one(
+            _outbox_doc(to_email, subject, body, dedupe_key, expires_at)
+        )
+        return str(result.inserted_id)
+    except DuplicateKeyError:
+        return None
+
+
+async def enqueue_emails(messages: list):
+    """Enqueue (to, subject, body, dedupe_key) tuples in one round-trip.
+    Returns how many were new."""
+    if not messages:
+        return 0
+
+    try:
+        result = await email_outbox_collection.insert_many(
+            [_outbox_doc(*m) for m in messages], ordered=False
+        )
+        return len(result.inserted_ids)
+    except BulkWriteError as e:
+        errors = e.details.get("writeErrors", [])
+        if any(err.get("code") != 11000 for err in errors):
+            raise
+        return e.details.get("nInserted", 0)
+
+
+# ---------------------------
+# WORKER SIDE
+# ---------------------------
+async def claim_next_email(worker_id: str):
+    now = datetime.utcnow()
+    return await email_outbox_collection.find_one_and_update(
+        {"$or": [
+            {"status": "pending", "next_attempt_at": {"$lte": now}},
+            {"status": "sending", "locked_at": {"$lt": now - timedelta(seconds=EMAIL_LEASE_SECONDS)}},
+        ]},
+        {"$set": {"status": "sending", "locked_at": now, "worker": worker_id},
+         "$inc": {"attempts": 1}},
+        sort=[("next_attempt_at", 1)],
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+async def mark_email_sent(email_id):
+    await email_outbox_collection.update_one(
+        {"_id": email_id},
+        {"$set": {"status": "sent", "sent_at": datetime.utcnow()},
+         "$unset": {"locked_at": "", "worker": ""}}
+    )
+
+
+def email_drop_reason(msg: dict):
+    """Why a just-claimed message must not be sent, or None."""
+    if msg.get("expires_at") and msg["expires_at"] <= datetime.utcnow():
+        return "Expired before it could be sent"
+    if msg.get("attempts", 0) > EMAIL_MAX_ATTEMPTS:
+        # Reclaimed after its last attempt's worker died
+        return "Lease expired on the last attempt"
+    return None
+
+
+async def mark_email_failed(email_id, attempts: int, error: str):
+    """
+    Schedule a retry with exponential backoff, or give up. `attempts`
+    already counts the attempt that failed (claim_next_email adds it).
+    """
+    update = {"last_error": error}
+
+    if attempts >= EMAIL_MAX_ATTEMPTS:
+        update["status"] = "failed"
+        update["failed_at"] = datetime.utcnow()
+    else:
+        update["status"] = "pending"
+        update["next_attempt_at"] = datetime.utcnow() + timedelta(
+            seconds=EMAIL_RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+        )
+
+    await email_outbox_collection.update_one(
+        {"_id": email_id},
+        {"$set": update, "$unset": {"locked_at": "", "worker": ""}}
+    )
+
+
+async def mark_email_dropped(email_id, reason: str):
+    await email_outbox_collection.update_one(
+        {"_id": email_id},
+        {"$set": {"status": "failed", "failed_at": datetime.utcnow(), "last_error": reason},
+         "$unset": {"locked_at": "", "worker": ""}}
+    )
@@ -1,16 +1,16 @@
 from app.database import otp_collection
 from datetime import datetime, timedelta
 
-def save_otp(email, otp):
-    otp_collection.insert_one({
+async def save_otp(email, otp):
+    await otp_collection.insert_one({
         "email": email,
         "otp": otp,
         "used": False,
         "created_at": datetime.utcnow()
     })
 
-def verify_otp(email, otp):
-    record = otp_collection.find_one({
+async def verify_otp(email, otp):
+    record = await otp_collection.find_one({
         "email": email,
         "otp": otp,
         "used": False
@@ -25,8 +25,8 @@ def verify_otp(email, otp):
 
     return True
 
-def mark_otp_used(email, otp):
-    otp_collection.update_one(
+async def mark_otp_used(email, otp):
+    await otp_collection.update_one(
         {"email": email, "otp": otp},
         {"$set": {"used": True}}
     )
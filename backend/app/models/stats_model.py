@@ -0,0 +1,149 @@
+# FILE: app/models/stats_model.py
+#
+# Per-user analytics counters, kept in step with the tasks collection by
+# $inc deltas from every task mutation:
+#
+#   {_id: user_id, seeded: True, seq: n,
+#    status: {todo: n, ...}, priority: {High: n, ...}, weekly: {"<iso week>": n}}
+#
+# `seq` is the user's change counter (see task_model.bump_task_seq); the
+# same $inc bumps it, so it costs no extra write.
+
+from datetime import datetime
+
+from pymongo import ReturnDocument
+
+from app.database import task_stats_collection
+from app.models.task_model import get_task_analytics
+
+TASK_STATUSES = ("todo", "inprogress", "completed", "blocked")
+TASK_PRIORITIES = ("High", "Medium", "Low")
+
+
+# ---------------------------
+# COUNTER KEYS FOR ONE TASK
+# ---------------------------
+def _status_key(status):
+    # Missing or unknown statuses are reported as To Do
+    return status if status in TASK_STATUSES else "todo"
+
+
+def _week_key(task):
+    if task.get("status") != "completed" or not task.get("date"):
+        return None
+    try:
+        return str(datetime.strptime(task["date"], "%Y-%m-%d").isocalendar().week)
+    except (TypeError, ValueError):
+        return None
+
+
+def task_counters(task: dict):
+    """The counter paths one task contributes 1 to."""
+    if not task:
+        return {}
+
+    counters = {f"status.{_status_key(task.get('status'))}": 1}
+
+    priority = task.get("priority", "Low")
+    if priority in TASK_PRIORITIES:
+        counters[f"priority.{priority}"] = 1
+
+    week = _week_key(task)
+    if week:
+        counters[f"weekly.{week}"] = 1
+
+    return counters
+
+
+def task_delta(before: dict, after: dict):
+    delta = dict(task_counters(after))
+    for path, n in task_counters(before).items():
+        delta[path] = delta.get(path, 0) - n
+
+    return {path: n for path, n in delta.items() if n}
+
+
+# ---------------------------
+# APPLY DELTAS
+# ---------------------------
+async def apply_task_delta(user_id: str, before: dict = None, after: dict = None):
+    """
+    Apply the change from `before` to `after` (None for create/delete)
+    and bump the change counter; returns the new counter value. Runs
+    after every task write (via sync_model.record_task_change), including
+    ones that change no counters. Counters of a user whose stats are not
+    seeded yet are rebuilt from scratch on the next analytics read.
+    """
+    return await apply_task_deltas(user_id, [(before, after)])
+
+
+async def apply_task_deltas(user_id: str, changes: list):
+    """apply_task_delta for many (before, after) pairs in a single $inc."""
+    delta = {}
+    for before, after in changes:
+        for path, n in task_delta(before, after).items():
+            delta[path] = delta.get(path, 0) + n
+
+    delta = {path: n for path, n in delta.items() if n}
+    stats = await task_stats_collection.find_one_and_update(
+        {"_id": user_id},
+        {"$inc": {**delta, "seq": 1}},
+        projection={"seq": 1},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    return stats["seq"]
+
+
+# ---------------------------
+# READ / REBUILD
+# ---------------------------
+def counts_to_stats(counts: dict):
+    """Normalise raw get_task_analytics counts into counter form."""
+    status = {}
+    for s, n in counts["status"].items():
+        key = _status_key(s)
+        status[key] = status.get(key, 0) + n
+
+    return {
+        "status": status,
+        "priority": {p: n for p, n in counts["priority"].items() if p in TASK_PRIORITIES},
+        "weekly": {str(week): n for week, n in counts["weekly"].items()},
+    }
+
+
+async def rebuild_task_stats(user_id: str):
+    """Recompute a user's counters from the tasks collection.
+    Returns (previous, rebuilt)."""
+    rebuilt = counts_to_stats(await get_task_analytics(user_id))
+
+    # $set whole sections rather than replace, so `seq` survives
+    previous = await task_stats_collection.find_one_and_update(
+        {"_id": user_id},
+        {"$set": {"seeded": True, **rebuilt}},
+        upsert=True
+    )
+
+    return previous, rebuilt
+
+
+async def get_task_stats(user_id: str):
+    stats = await task_stats_collection.find_one({"_id": user_id, "seeded": True})
+    if stats:
+        return stats
+
+    _, rebuilt = await rebuild_task_stats(user_id)
+    return rebuilt
+
+
+def stats_drift(stored: dict, rebuilt: dict):
+    """Counter paths whose stored value differs from the rebuilt one."""
+    drift = {}
+    for section in ("status", "priority", "weekly"):
+        have = (stored or {}).get(section, {})
+        want = rebuilt.get(section, {})
+        for key in set(have) | set(want):
+            if have.get(key, 0) != want.get(key, 0):
+                drift[f"{section}.{key}"] = (have.get(key, 0), want.get(key, 0))
+
+    return drift
@@ -0,0 +1,208 @@
+# FILE: app/models/sync_model.py
+#
+# Delta sync (GET /tasks/changes). Every task write is stamped with the
+# user's change counter (task_stats.seq) and every delete leaves a
+# tombstone, so a client holding a cursor can fetch just what changed
+# since:
+#
+#   tasks:           {..., updated_at, version, seq}
+#   task_tombstones: {_id: task id, user_id, deleted_at, seq}
+#
+# The counter is bumped after the data write and the stamp lands after
+# that, so in between the task / tombstone carries sync_pending instead
+# of a seq. Pending entries are returned by every changes call: a write
+# is either stamped at or below the counter value a call reads first,
+# or it is still pending, or its bump comes after that read (and the
+# next call picks it up). Tombstones expire after SYNC_TOMBSTONE_DAYS;
+# older cursors get 410 and the client reloads everything.
+#
+# A mark older than SYNC_PENDING_SECONDS was left by a process that died
+# before stamping it; the next changes call stamps it with a fresh
+# counter value. A call returns at most `limit` pending entries of each
+# kind; when there are more, the cursor stays where it was and has_more
+# is set.
+
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta
+
+from bson.objectid import ObjectId
+from fastapi import HTTPException
+from pymongo.errors import BulkWriteError
+
+from app.database import tasks_collection, task_tombstones_collection
+from app.models.stats_model import apply_task_deltas
+from app.models.task_model import get_task_seq, bump_task_seq, stamp_tasks, TASK_LIST_PROJECTION
+from app.utils.pagination import encode_cursor, decode_cursor, keyset_filter
+
+SYNC_TOMBSTONE_DAYS = int(os.getenv("SYNC_TOMBSTONE_DAYS", "30"))
+# Seconds; an hour's slack for tombstones written just before the
+# counter read a cursor was issued from
+SYNC_CURSOR_MAX_AGE = SYNC_TOMBSTONE_DAYS * 24 * 60 * 60 - 60 * 60
+SYNC_PENDING_SECONDS = int(os.getenv("SYNC_PENDING_SECONDS", "60"))
+
+# Task fields as in the list endpoints, plus seq for ordering
+SYNC_PROJECTION = {k: v for k, v in TASK_LIST_PROJECTION.items() if k != "seq"}
+
+
+# ---------------------------
+# RECORD WRITES
+# ---------------------------
+async def record_task_changes(user_id: str, changes: list):
+    """
+    Bookkeeping after applied task writes, given as (before, after) pairs
+    (before None for a create, after None for a delete): tombstones,
+    analytics counters, the change counter and sync stamps.
+    Returns the new counter value.
+    """
+    if not changes:
+        return None
+
+    deleted = [ObjectId(str(before["_id"])) for before, after in changes if after is None]
+    if deleted:
+        now = datetime.utcnow()
+        try:
+            await task_tombstones_collection.insert_many([
+                {"_id": task_id, "user_id": user_id, "deleted_at": now, "sync_pending": True}
+                for task_id in deleted
+            ], ordered=False)
+        except BulkWriteError as e:
+            print("Tombstone Error:", e.details.get("writeErrors"))
+
+    seq = await apply_task_deltas(user_id, changes)
+
+    stamps = [stamp_tasks(seq, [
+        (after["_id"], after.get("version", 0)) for _, after in changes if after is not None
+    ])]
+    if deleted:
+        stamps.append(task_tombstones_collection.update_many(
+            {"_id": {"$in": deleted}, "sync_pending": True},
+            {"$set": {"seq": seq}, "$unset": {"sync_pending": ""}}
+        ))
+    await asyncio.gather(*stamps)
+
+    return seq
+
+
+async def record_task_change(user_id: str, before: dict = None, after: dict = None):
+    return await record_task_changes(user_id, [(before, after)])
+
+
+# ---------------------------
+# READ CHANGES
+# ---------------------------
+def _read_cursor(cursor: str):
+    values = decode_cursor(cursor)
+    try:
+        after_seq = int(values["v"])
+        issued = float(values["t"])
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return after_seq, values.get("id"), issued
+
+
+async def stamp_stale_pending(user_id: str):
+    """
+    Stamp pending marks older than SYNC_PENDING_SECONDS, whose writer
+    never did. Read first, then bump, then stamp, like any write.
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=SYNC_PENDING_SECONDS)
+    tasks, tombstones = await asyncio.gather(
+        tasks_collection.find(
+            # Rank-only writes (rebalance_column) leave updated_at alone
+            {"user_id": user_id, "sync_pending": True, "updated_at": {"$not": {"$gte": cutoff}}},
+            {"version": 1}
+        ).to_list(length=None),
+        task_tombstones_collection.find(
+            {"user_id": user_id, "sync_pending": True, "deleted_at": {"$lt": cutoff}}, {"_id": 1}
+        ).to_list(length=None),
+    )
+    if not tasks and not tombstones:
+        return
+
+    seq = await bump_task_seq(user_id)
+    await asyncio.gather(
+        stamp_tasks(seq, [(t["_id"], t.get("version")) for t in tasks]),
+        task_tombstones_collection.update_many(
+            {"_id": {"$in": [d["_id"] for d in tombstones]}, "sync_pending": True},
+            {"$set": {"seq": seq}, "$unset": {"sync_pending": ""}}
+        ),
+    )
+
+
+async def get_task_changes(user_id: str, limit: int, cursor: str = None):
+    """
+    Tasks created or updated, and ids deleted, after `cursor` (from the
+    beginning without one), oldest change first. Clients apply `tasks`,
+    then `deleted`, and keep `cursor` for the next call; `has_more`
+    means call again straight away.
+    """
+    now = time.time()
+    await stamp_stale_pending(user_id)
+    head = await get_task_seq(user_id)  # read first; see the header
+
+    after_seq, after_id, issued = 0, None, now
+    if cursor:
+        after_seq, after_id, issued = _read_cursor(cursor)
+        if now - issued > SYNC_CURSOR_MAX_AGE or after_seq > head:
+            raise HTTPException(status_code=410, detail="Sync cursor expired, reload all tasks")
+
+    if after_id is None:
+        in_range = {"seq": {"$gt": after_seq, "$lte": head}}
+    else:
+        in_range = {"$and": [keyset_filter("seq", after_seq, after_id), {"seq": {"$lte": head}}]}
+
+    order = [("seq", 1), ("_id", 1)]
+    tasks, tombstones, pending_tasks, pending_tombstones = await asyncio.gather(
+        tasks_collection.find({"user_id": user_id, **in_range}, SYNC_PROJECTION)
+            .sort(order).limit(limit + 1).to_list(length=limit + 1),
+        task_tombstones_collection.find({"user_id": user_id, **in_range}, {"seq": 1})
+            .sort(order).limit(limit + 1).to_list(length=limit + 1),
+        tasks_collection.find({"user_id": user_id, "sync_pending": True}, SYNC_PROJECTION)
+            .limit(limit + 1).to_list(length=limit + 1),
+        task_tombstones_collection.find({"user_id": user_id, "sync_pending": True}, {"_id": 1})
+            .limit(limit + 1).to_list(length=limit + 1),
+    )
+    overflow = len(pending_tasks) > limit or len(pending_tombstones) > limit
+    pending_tasks, pending_tombstones = pending_tasks[:limit], pending_tombstones[:limit]
+
+    # Merge both collections in (seq, _id) order; one page of changes
+    page = sorted(
+        [(t["seq"], t["_id"], t) for t in tasks] +
+        [(d["seq"], d["_id"], None) for d in tombstones],
+        key=lambda e: e[:2]
+    )
+    has_more = len(page) > limit
+    page = page[:limit]
+
+    if overflow:
+        # Pending entries left unread: the next call must see them too
+        page = []
+        next_cursor = {"v": after_seq, "id": after_id, "t": issued}
+    elif has_more:
+        seq, last_id, _ = page[-1]
+        next_cursor = {"v": seq, "id": str(last_id), "t": issued}
+    else:
+        next_cursor = {"v": head, "id": None, "t": now}
+
+    deleted = {str(d["_id"]) for d in pending_tombstones}
+    deleted |= {str(task_id) for _, task_id, task in page if task is None}
+
+    # A task can be read twice (pending and in range); keep the newest
+    changed = {}
+    for task in pending_tasks + [task for _, _, task in page if task is not None]:
+        task_id = str(task.pop("_id"))
+        task.pop("seq", None)
+        if task_id in deleted:
+            continue
+        kept = changed.get(task_id)
+        if kept is None or task.get("version", 0) >= kept.get("version", 0):
+            changed[task_id] = {"_id": task_id, **task}
+
+    return {
+        "tasks": list(changed.values()),
+        "deleted": sorted(deleted),
+        "cursor": encode_cursor(next_cursor),
+        "has_more": has_more or overflow,
+    }
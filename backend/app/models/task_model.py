@@ -1,7 +1,17 @@
 # FILE: app/models/task_model.py
 
-from app.database import tasks_collection
+from app.database import tasks_collection, task_stats_collection
+from app.utils.pagination import encode_cursor, decode_cursor, keyset_filter
+from app.utils.rank import rank_between, rank_after, spread_ranks, RANK_MAX_LENGTH
+from app.utils.search import search_fields, query_prefixes
 from bson.objectid import ObjectId
+from fastapi import HTTPException
+import asyncio
+import os
+from datetime import datetime
+
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
 
 
 from fastapi import Depends
@@ -9,70 +19,624 @@ from app.auth.jwt_bearer import JwtBearer
 
 
 
+# Legacy tasks may still carry an inline base64 body (see
+# migrate_attachments.py); reads never need it. title_prefixes only
+# exists for the autocomplete index, seq / sync_pending for delta sync.
+TASK_LIST_PROJECTION = {"file": 0, "title_prefixes": 0, "seq": 0, "sync_pending": 0}
+
+SEARCH_MAX_RESULTS = int(os.getenv("SEARCH_MAX_RESULTS", "1000"))
+
+
+# ---------------------------
+# CHANGE COUNTER
+# ---------------------------
+# A per-user counter (task_stats.seq) that only ever goes up, bumped
+# after every write to the user's tasks: routes bump it with the stats
+# $inc (stats_model.apply_task_delta), background writes here directly.
+# It is read before the tasks, so a response is never older than the
+# counter value it is tagged with (see routes/task_routes.py, ETags).
+async def get_task_seq(user_id: str):
+    stats = await task_stats_collection.find_one({"_id": user_id}, {"seq": 1})
+    return (stats or {}).get("seq", 0)
+
+
+async def bump_task_seq(user_id: str):
+    """Bump the counter; returns the new value."""
+    stats = await task_stats_collection.find_one_and_update(
+        {"_id": user_id},
+        {"$inc": {"seq": 1}},
+        projection={"seq": 1},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    return stats["seq"]
+
+
+# ---------------------------
+# DELTA SYNC STAMPS (see sync_model.py)
+# ---------------------------
+# A write marks the task sync_pending in the same update as the data,
+# then (after the counter bump) stamp_tasks() replaces the mark with
+# seq = the new counter value. Either way a written task is always
+# visible to GET /tasks/changes. The stamp matches on the version the
+# write produced, so it never clears the mark of a later write.
+def sync_fields():
+    """$set alongside every task write."""
+    return {"updated_at": datetime.utcnow(), "sync_pending": True}
+
+
+async def stamp_tasks(seq: int, tasks: list):
+    """Stamp (task id, version) pairs written before counter value `seq`."""
+    if not tasks:
+        return
+    await tasks_collection.bulk_write([
+        UpdateOne(
+            # None also matches tasks from before versions existed
+            {"_id": ObjectId(str(task_id)), "version": version, "sync_pending": True},
+            {"$set": {"seq": seq}, "$unset": {"sync_pending": ""}}
+        )
+        for task_id, version in tasks
+    ], ordered=False)
+
+
 # ---------------------------
 # CREATE TASK
 # ---------------------------
-def create_task(data: dict):
-    res = tasks_collection.insert_one(data)
+async def create_task(data: dict):
+    res = await tasks_collection.insert_one({**data, **search_fields(data), **sync_fields()})
     return str(res.inserted_id)
 
 
 # ---------------------------
 # GET ALL TASKS OF USER
 # ---------------------------
-def get_tasks_by_user(user_id: str):
-    tasks = list(tasks_collection.find({"user_id": user_id}))
+async def get_tasks_by_user(user_id: str):
+    tasks = await tasks_collection.find(
+        {"user_id": user_id}, TASK_LIST_PROJECTION
+    ).to_list(length=None)
+
+    for t in tasks:
+        t["_id"] = str(t["_id"])
+
+    return tasks
+
+
+# ---------------------------
+# STREAM ALL TASKS OF USER
+# ---------------------------
+async def iter_tasks_by_user(user_id: str, fields: list, batch_size: int = 500):
+    """Async iterator over a user's tasks, fetching only `fields`."""
+    cursor = tasks_collection.find(
+        {"user_id": user_id},
+        {field: 1 for field in fields},
+        batch_size=batch_size
+    ).sort([("date", 1), ("_id", 1)])
+
+    async for task in cursor:
+        yield task
+
+
+# ---------------------------
+# GET ONE PAGE OF TASKS
+# ---------------------------
+# sort key -> (field, descending); each is backed by a (user_id, ..., _id) index
+TASK_SORTS = {
+    "date": ("date", False),
+    "-date": ("date", True),
+    "created": ("_id", False),
+    "-created": ("_id", True),
+    # Kanban column order; pass status= so the (user_id, status, rank) index serves it
+    "rank": ("rank", False),
+}
+
+
+async def get_tasks_page(
+    user_id: str,
+    limit: int,
+    cursor: str = None,
+    sort: str = "date",
+    status: str = None,
+    priority: str = None,
+    date_from: str = None,
+    date_to: str = None,
+):
+    """Keyset-paginated task list. Returns (tasks, next_cursor)."""
+    field, descending = TASK_SORTS[sort]
+
+    query = {"user_id": user_id}
+    if status:
+        query["status"] = status
+    if priority:
+        query["priority"] = priority
+    if date_from or date_to:
+        query["date"] = {}
+        if date_from:
+            query["date"]["$gte"] = date_from
+        if date_to:
+            query["date"]["$lte"] = date_to
+
+    if cursor:
+        after = decode_cursor(cursor)
+        if after.get("s") != sort:
+            raise HTTPException(status_code=400, detail="Cursor does not match sort")
+        query.update(keyset_filter(field, after.get("v"), after.get("id"), descending))
+
+    direction = -1 if descending else 1
+    order = [("_id", direction)] if field == "_id" else [(field, direction), ("_id", direction)]
+
+    # One extra row tells us whether another page exists
+    tasks = await tasks_collection.find(query, TASK_LIST_PROJECTION) \
+        .sort(order).limit(limit + 1).to_list(length=limit + 1)
+
+    next_cursor = None
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        last = tasks[-1]
+        next_cursor = encode_cursor({"s": sort, "v": last.get(field), "id": str(last["_id"])})
+
+    for t in tasks:
+        t["_id"] = str(t["_id"])
+
+    return tasks, next_cursor
+
+
+# ---------------------------
+# SEARCH
+# ---------------------------
+async def search_tasks(user_id: str, q: str, limit: int, cursor: str = None, prefix: bool = False):
+    """
+    Full-text search over title and description, best match first.
+    Relevance is not an indexable sort key, so pages are offsets into the
+    ranked result (capped at SEARCH_MAX_RESULTS). Returns (tasks, next_cursor).
+
+    The text index only matches whole words; with prefix=True (search as
+    you type) every word of `q` matches the start of a title word instead,
+    newest first, served by the title_prefixes index.
+    """
+    if prefix:
+        return await _search_title_prefixes(user_id, q, limit, cursor)
+
+    offset = 0
+    if cursor:
+        after = decode_cursor(cursor)
+        if after.get("q") != q:
+            raise HTTPException(status_code=400, detail="Cursor does not match query")
+        offset = after.get("o", 0)
+
+    limit = min(limit, SEARCH_MAX_RESULTS - offset)
+    if limit <= 0:
+        return [], None
+
+    score = {"$meta": "textScore"}
+    tasks = await tasks_collection.find(
+        {"user_id": user_id, "$text": {"$search": q}},
+        {**TASK_LIST_PROJECTION, "score": score}
+    ).sort([("score", score), ("_id", -1)]).skip(offset) \
+        .limit(limit + 1).to_list(length=limit + 1)
+
+    next_cursor = None
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        next_cursor = encode_cursor({"q": q, "o": offset + limit})
+
+    for t in tasks:
+        t["_id"] = str(t["_id"])
+
+    return tasks, next_cursor
+
+
+async def _search_title_prefixes(user_id: str, q: str, limit: int, cursor: str = None):
+    prefixes = query_prefixes(q)
+    if not prefixes:
+        return [], None
+
+    # The index scan follows the first prefix; make it the most selective
+    prefixes.sort(key=len, reverse=True)
+    query = {"user_id": user_id, "title_prefixes": {"$all": prefixes}}
+    if cursor:
+        after = decode_cursor(cursor)
+        if after.get("q") != q:
+            raise HTTPException(status_code=400, detail="Cursor does not match query")
+        query.update(keyset_filter("_id", None, after.get("id"), descending=True))
+
+    tasks = await tasks_collection.find(query, TASK_LIST_PROJECTION) \
+        .sort("_id", -1).limit(limit + 1).to_list(length=limit + 1)
+
+    next_cursor = None
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        next_cursor = encode_cursor({"q": q, "id": tasks[-1]["_id"]})
+
+    for t in tasks:
+        t["_id"] = str(t["_id"])
+
+    return tasks, next_cursor
+
+
+async def autocomplete_tasks(user_id: str, q: str, limit: int):
+    """
+    Newest tasks whose title has a word starting with each word of `q`
+    ("rev bud" matches "Review Q3 budget"). Returns [{_id, title}].
+    """
+    prefixes = query_prefixes(q)
+    if not prefixes:
+        return []
+
+    # The index scan follows the first prefix; make it the most selective
+    prefixes.sort(key=len, reverse=True)
+    tasks = await tasks_collection.find(
+        {"user_id": user_id, "title_prefixes": {"$all": prefixes}},
+        {"title": 1}
+    ).sort("_id", -1).limit(limit).to_list(length=limit)
 
     for t in tasks:
         t["_id"] = str(t["_id"])
-        if "file" in t:
-            t["file"] = t["file"]  # Base64 file (optional)
 
     return tasks
 
 
+# ---------------------------
+# ANALYTICS (single aggregation)
+# ---------------------------
+def _strptime_part(part: dict, space_padded: bool = False):
+    """
+    A month or day from a split date, padded to the two digits
+    $dateFromString wants. strptime("%Y-%m-%d") also reads "1" and,
+    for days, " 1"; anything else is left for $dateFromString to reject.
+    """
+    branches = [{"case": {"$eq": [{"$strLenCP": part}, 1]}, "then": {"$concat": ["0", part]}}]
+    if space_padded:
+        branches.append({
+            "case": {"$and": [
+                {"$eq": [{"$strLenCP": part}, 2]},
+                {"$eq": [{"$substrCP": [part, 0, 1]}, " "]},
+            ]},
+            "then": {"$concat": ["0", {"$substrCP": [part, 1, 1]}]},
+        })
+    return {"$switch": {"branches": branches, "default": part}}
+
+
+async def get_task_analytics(user_id: str):
+    """
+    Raw status/priority counts and completed-per-ISO-week counts,
+    computed in Mongo so only the totals cross the wire.
+    """
+    pipeline = [
+        {"$match": {"user_id": user_id}},
+        {"$facet": {
+            "status": [
+                {"$group": {"_id": "$status", "count": {"$sum": 1}}},
+            ],
+            "priority": [
+                # A missing priority counts as Low (an explicit null does not)
+                {"$group": {
+                    "_id": {"$cond": [
+                        {"$eq": [{"$type": "$priority"}, "missing"]}, "Low", "$priority"
+                    ]},
+                    "count": {"$sum": 1},
+                }},
+            ],
+            "weekly": [
+                {"$match": {"status": "completed", "date": {"$type": "string", "$ne": ""}}},
+                # Read dates the way the counters' strptime does ("2024-1-5" too)
+                {"$project": {"parts": {"$split": ["$date", "-"]}}},
+                {"$project": {"date": {"$cond": [
+                    {"$eq": [{"$size": "$parts"}, 3]},
+                    {"$concat": [
+                        {"$arrayElemAt": ["$parts", 0]}, "-",
+                        _strptime_part({"$arrayElemAt": ["$parts", 1]}), "-",
+                        _strptime_part({"$arrayElemAt": ["$parts", 2]}, space_padded=True),
+                    ]},
+                    None,
+                ]}}},
+                {"$project": {"week": {"$isoWeek": {"$dateFromString": {
+                    "dateString": "$date",
+                    "format": "%Y-%m-%d",
+                    "onError": None,
+                    "onNull": None,
+                }}}}},
+                {"$match": {"week": {"$ne": None}}},
+                {"$group": {"_id": "$week", "count": {"$sum": 1}}},
+            ],
+        }},
+    ]
+
+    result = await tasks_collection.aggregate(pipeline).to_list(length=1)
+    facets = result[0] if result else {"status": [], "priority": [], "weekly": []}
+
+    return {
+        "status": {row["_id"]: row["count"] for row in facets["status"]},
+        "priority": {row["_id"]: row["count"] for row in facets["priority"]},
+        "weekly": {row["_id"]: row["count"] for row in facets["weekly"]},
+    }
+
+
 # ---------------------------
 # GET ONE TASK BY ID
 # ---------------------------
-def get_task_by_id(task_id: str):
-    task = tasks_collection.find_one({"_id": ObjectId(task_id)})
-    
+async def get_task_by_id(task_id: str, projection: dict = None):
+    task = await tasks_collection.find_one({"_id": ObjectId(task_id)}, projection)
+
     if task:
         task["_id"] = str(task["_id"])
-        if "file" in task:
-            task["file"] = task["file"]
 
     return task
 
 
 # ---------------------------
-# UPDATE TASK
+# GET TASK ATTACHMENT
 # ---------------------------
-def update_task(task_id: str, data: dict):
-    result = tasks_collection.update_one(
+async def get_task_attachment(task_id: str):
+    if not ObjectId.is_valid(task_id):
+        return None
+    return await tasks_collection.find_one(
         {"_id": ObjectId(task_id)},
-        {"$set": data}
+        {"user_id": 1, "attachment": 1}
     )
-    return result.modified_count > 0
 
 
 # ---------------------------
-# DELETE TASK
+# OWNERSHIP-SCOPED WRITES
 # ---------------------------
-def delete_task(task_id: str):
-    result = tasks_collection.delete_one({"_id": ObjectId(task_id)})
-    return result.deleted_count > 0
+# One conditional write each, filtered on _id + user_id (+ version when
+# the client sent If-Match). Every write bumps `version`; tasks written
+# before the field existed count as 0. Only a write that matched nothing
+# costs a second query, to tell 404 / 403 / 412 apart.
+def _owned_filter(task_id: str, user_id: str, version: int = None):
+    if not ObjectId.is_valid(task_id):
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    query = {"_id": ObjectId(task_id), "user_id": user_id}
+    if version is not None:
+        # null also matches a missing field
+        query["version"] = version if version else {"$in": [0, None]}
+    return query
+
+
+async def _raise_write_miss(task_id: str, user_id: str):
+    task = await tasks_collection.find_one({"_id": ObjectId(task_id)}, {"user_id": 1})
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    if task["user_id"] != user_id:
+        raise HTTPException(status_code=403, detail="Unauthorized")
+    raise HTTPException(status_code=412, detail="Task was changed since you loaded it")
+
+
+async def update_owned_task(task_id: str, user_id: str, updates: dict, version: int = None, where: dict = None):
+    """
+    $set `updates`; returns the task (before, after) the write. A status
+    change without an explicit rank puts the card at the end of its new
+    column, as a move without neighbours does. `where` adds conditions
+    to the filter (a miss on them reads as 412).
+    """
+    sync = sync_fields()
+    fields = {**updates, **search_fields(updates), **sync}
+
+    if "status" in updates and "rank" not in updates:
+        # Still one write: the rank only changes if the stored status does,
+        # decided by the update itself rather than an earlier read
+        tail_rank = rank_after(await get_column_tail_rank(user_id, updates["status"]))
+        update = [{"$set": {
+            **{k: {"$literal": v} for k, v in fields.items()},
+            "rank": {"$cond": [{"$eq": ["$status", updates["status"]]}, "$rank", tail_rank]},
+            "version": {"$add": [{"$ifNull": ["$version", 0]}, 1]},
+        }}]
+    else:
+        tail_rank = None
+        update = {"$set": fields, "$inc": {"version": 1}}
+
+    before = await tasks_collection.find_one_and_update(
+        {**_owned_filter(task_id, user_id, version), **(where or {})},
+        update,
+        projection=TASK_LIST_PROJECTION,
+        return_document=ReturnDocument.BEFORE,
+    )
+    if before is None:
+        await _raise_write_miss(task_id, user_id)
+
+    before["_id"] = str(before["_id"])
+    after = {**before, **updates, "updated_at": sync["updated_at"], "version": before.get("version", 0) + 1}
+    after.pop("file", None)
+    if tail_rank and before.get("status") != updates["status"]:
+        after["rank"] = tail_rank
+    if after.get("rank") and after.get("rank") != before.get("rank"):
+        check_rank_length(user_id, after["status"], after["rank"])
+    return before, after
+
+
+async def delete_owned_task(task_id: str, user_id: str, version: int = None):
+    """Delete; returns the task as it was."""
+    before = await tasks_collection.find_one_and_delete(
+        _owned_filter(task_id, user_id, version),
+        projection=TASK_LIST_PROJECTION,
+    )
+    if before is None:
+        await _raise_write_miss(task_id, user_id)
+
+    before["_id"] = str(before["_id"])
+    return before
 
 
 # ---------------------------
-# UPDATE STATUS (KANBAN)
+# KANBAN ORDER (see app/utils/rank.py)
 # ---------------------------
-def update_task_status(task_id: str, status: str):
-    result = tasks_collection.update_one(
-        {"_id": ObjectId(task_id)},
-        {"$set": {"status": status}}
+_rebalancing = {}  # (user_id, status) -> running rebalance task
+
+
+async def get_column_tail_rank(user_id: str, status: str):
+    """Rank of the last card in a column (None if empty or unranked)."""
+    last = await tasks_collection.find(
+        {"user_id": user_id, "status": status}, {"rank": 1}
+    ).sort([("rank", -1), ("_id", -1)]).limit(1).to_list(length=1)
+    return last[0].get("rank") if last else None
+
+
+async def rebalance_column(user_id: str, status: str):
+    """
+    Re-spread a column's ranks evenly (short keys again), keeping the
+    current order; tasks that predate ranks keep their place at the top.
+    A card moved while this runs keeps its new rank (the write is
+    conditional on the old one). Ranks are layout, so version is not bumped.
+    """
+    tasks = await tasks_collection.find(
+        {"user_id": user_id, "status": status}, {"rank": 1, "version": 1}
+    ).to_list(length=None)
+    tasks.sort(key=lambda t: (t.get("rank") is not None, t.get("rank") or "", t["_id"]))
+
+    moved = [
+        (t, rank) for t, rank in zip(tasks, spread_ranks(len(tasks)))
+        if t.get("rank") != rank
+    ]
+    if not moved:
+        return 0
+
+    await tasks_collection.bulk_write([
+        UpdateOne(
+            {"_id": t["_id"], "user_id": user_id, "status": status, "rank": t.get("rank")},
+            {"$set": {"rank": rank, "sync_pending": True}}
+        )
+        for t, rank in moved
+    ], ordered=False)
+
+    # The column's order changed
+    seq = await bump_task_seq(user_id)
+    await stamp_tasks(seq, [(t["_id"], t.get("version")) for t, _ in moved])
+    return len(moved)
+
+
+async def _run_rebalance(key: tuple):
+    try:
+        await rebalance_column(*key)
+    except Exception as e:
+        print("Rank Rebalance Error:", e)
+    finally:
+        _rebalancing.pop(key, None)
+
+
+def schedule_rebalance(user_id: str, status: str):
+    """Rebalance a column in the background (once, however often asked)."""
+    key = (user_id, status)
+    if key not in _rebalancing:
+        _rebalancing[key] = asyncio.create_task(_run_rebalance(key))
+
+
+def check_rank_length(user_id: str, status: str, rank: str):
+    if len(rank) > RANK_MAX_LENGTH:
+        schedule_rebalance(user_id, status)
+
+
+async def _neighbor_ranks(user_id: str, status: str, after_id: str = None, before_id: str = None):
+    ids = [i for i in (after_id, before_id) if i]
+    found = {}
+    if ids:
+        docs = await tasks_collection.find(
+            {"_id": {"$in": [ObjectId(i) for i in ids]}, "user_id": user_id},
+            {"rank": 1, "status": 1}
+        ).to_list(length=None)
+        found = {str(d["_id"]): d for d in docs}
+
+    for i in ids:
+        if i not in found or found[i].get("status") != status:
+            raise HTTPException(status_code=400, detail="Neighbour task is not in the target column")
+
+    if not ids:
+        # No neighbours given: end of the column
+        return await get_column_tail_rank(user_id, status), None
+
+    return (
+        found[after_id].get("rank") if after_id else None,
+        found[before_id].get("rank") if before_id else None,
     )
-    return result.modified_count > 0
+
+
+async def move_task(
+    task_id: str,
+    user_id: str,
+    status: str,
+    after_id: str = None,
+    before_id: str = None,
+    version: int = None,
+):
+    """
+    Put a task into `status` between the cards `after_id` (above) and
+    `before_id` (below). Writes only the moved task; returns (before, after).
+    """
+    for i in (after_id, before_id):
+        if i is not None and (i == task_id or not ObjectId.is_valid(i)):
+            raise HTTPException(status_code=400, detail="Invalid neighbour task id")
+
+    low, high = await _neighbor_ranks(user_id, status, after_id, before_id)
+
+    unranked = (after_id and low is None) or (before_id and high is None)
+    if unranked or (low is not None and high is not None and low >= high):
+        # Cards from before ranks existed, or neighbours that moved concurrently
+        await rebalance_column(user_id, status)
+        low, high = await _neighbor_ranks(user_id, status, after_id, before_id)
+        if low is not None and high is not None and low >= high:
+            raise HTTPException(status_code=400, detail="Neighbour tasks are in the wrong order")
+
+    rank = rank_after(low) if high is None else rank_between(low, high)
+    return await update_owned_task(task_id, user_id, {"status": status, "rank": rank}, version)
+
+
+# ---------------------------
+# BULK (POST /tasks/bulk)
+# ---------------------------
+async def get_tasks_by_ids(task_ids: list, projection: dict = None):
+    """{str id: task} for the ids that exist, in one query."""
+    tasks = await tasks_collection.find(
+        {"_id": {"$in": [ObjectId(t) for t in task_ids]}}, projection
+    ).to_list(length=None)
+
+    return {str(t["_id"]): t for t in tasks}
+
+
+async def bulk_write_tasks(writes: list):
+    """
+    Apply a batch of task writes: ("insert", doc), ("update", filter,
+    update) or ("delete", filter). Inserts go in one unordered
+    insert_many; each update/delete is its own conditional write, run
+    concurrently, so every one reports whether its filter (owner +
+    version) matched. Returns {index: (status_code, detail)} for the
+    writes that were not applied.
+    """
+    failed = {}
+
+    inserts = [n for n, w in enumerate(writes) if w[0] == "insert"]
+    if inserts:
+        try:
+            await tasks_collection.insert_many([writes[n][1] for n in inserts], ordered=False)
+        except BulkWriteError as e:
+            for err in e.details.get("writeErrors", []):
+                failed[inserts[err["index"]]] = (500, err.get("errmsg", "Write failed"))
+
+    async def apply(write):
+        if write[0] == "update":
+            return await tasks_collection.find_one_and_update(write[1], write[2], projection={"_id": 1})
+        return await tasks_collection.find_one_and_delete(write[1], projection={"_id": 1})
+
+    others = [n for n, w in enumerate(writes) if w[0] != "insert"]
+    results = await asyncio.gather(*(apply(writes[n]) for n in others), return_exceptions=True)
+
+    missed = {}
+    for n, result in zip(others, results):
+        if isinstance(result, Exception):
+            failed[n] = (500, str(result))
+        elif result is None:
+            missed[n] = writes[n][1]["_id"]
+
+    if missed:
+        # Matched nothing: gone (404) or changed since it was read (412)
+        found = {
+            t["_id"]
+            async for t in tasks_collection.find({"_id": {"$in": list(missed.values())}}, {"_id": 1})
+        }
+        for n, task_id in missed.items():
+            failed[n] = (412, "Task was changed since you loaded it") if task_id in found \
+                else (404, "Task not found")
+
+    return failed
+
 
 ## Upcominggg
 from bson import ObjectId
@@ -82,24 +646,24 @@ def serialize_task(task):
     task["_id"] = str(task["_id"])
     return task
 
-def get_overdue_tasks(user_id: str):
+async def get_overdue_tasks(user_id: str):
     today = datetime.today().strftime("%Y-%m-%d")
 
-    tasks = list(tasks_collection.find({
+    tasks = await tasks_collection.find({
         "user_id": user_id,
         "date": {"$lt": today},
         "status": {"$ne": "completed"}
-    }))
+    }, TASK_LIST_PROJECTION).to_list(length=None)
 
     return [serialize_task(t) for t in tasks]
 
 
-def get_upcoming_tasks(user_id: str):
+async def get_upcoming_tasks(user_id: str):
     today = datetime.today().strftime("%Y-%m-%d")
 
-    tasks = list(tasks_collection.find({
+    tasks = await tasks_collection.find({
         "user_id": user_id,
         "date": {"$gt": today}
-    }))
+    }, TASK_LIST_PROJECTION).to_list(length=None)
 
     return [serialize_task(t) for t in tasks]
@@ -2,51 +2,73 @@ from bson.objectid import ObjectId
 from app.database import users_collection
 from bson.objectid import ObjectId
 from app.database import users_collection
-from app.auth.hash import hash_password, verify_password
+from app.auth.hash import hash_password_async
+import time
 
 # ----------------------------
 # CREATE USER
 # ----------------------------
-def create_user(user_data):
-    result = users_collection.insert_one(user_data)
+async def create_user(user_data):
+    result = await users_collection.insert_one(user_data)
     return str(result.inserted_id)
 
 
 # ----------------------------
 # GET USER BY EMAIL
 # ----------------------------
-def get_user_by_email(email: str):
-    return users_collection.find_one({"email": email})
+async def get_user_by_email(email: str):
+    return await users_collection.find_one({"email": email})
 
 
 # ----------------------------
 # GET USER BY ID
 # ----------------------------
-def get_user_by_id(user_id: str):
+async def get_user_by_id(user_id: str):
     try:
         obj_id = ObjectId(user_id)
     except:
         return None
 
-    return users_collection.find_one({"_id": obj_id})
+    return await users_collection.find_one({"_id": obj_id})
 
 
 # ----------------------------
 # UPDATE USER PROFILE
 # ----------------------------
-def update_user_profile(user_id: str, data: dict):
-    result = users_collection.update_one(
+async def update_user_profile(user_id: str, data: dict):
+    result = await users_collection.update_one(
         {"_id": ObjectId(user_id)},
         {"$set": data}
     )
     return result.modified_count > 0
 
 
-def update_user_password(user_id: str, new_password: str):
-    new_hashed = hash_password(new_password)
+async def update_user_password(user_id: str, new_password: str):
+    new_hashed = await hash_password_async(new_password)
 
-    users_collection.update_one(
+    await users_collection.update_one(
         {"_id": ObjectId(user_id)},
         {"$set": {"password": new_hashed}}
     )
     return True
+
+
+# ----------------------------
+# TOKEN REVOCATION
+# ----------------------------
+# Tokens issued (iat) before tokens_valid_after are rejected; see
+# app/auth/jwt_handler.py.
+async def get_tokens_valid_after(user_id: str):
+    if not ObjectId.is_valid(user_id):
+        return 0
+    user = await users_collection.find_one({"_id": ObjectId(user_id)}, {"tokens_valid_after": 1})
+    return (user or {}).get("tokens_valid_after", 0)
+
+
+async def revoke_user_tokens(user_id: str):
+    valid_after = time.time()
+    await users_collection.update_one(
+        {"_id": ObjectId(user_id)},
+        {"$set": {"tokens_valid_after": valid_after}}
+    )
+    return valid_after
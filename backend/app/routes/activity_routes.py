@@ -1,11 +1,13 @@
 # FILE: app/routes/activity_routes.py
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
 from datetime import datetime
+from typing import Optional
 import pytz
 
 from app.auth.jwt_bearer import JwtBearer
-from app.models.activity_model import get_user_activity
+from app.models.activity_model import get_user_activity_page, get_user_activity_daily
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 router = APIRouter(prefix="/activity", tags=["Activity"])
 
@@ -44,9 +46,22 @@ def clean_device_name(device_str: str):
 # Fetch Activity Logs
 # -----------------------
 @router.get("/")
-def fetch_activity(user_id: str = Depends(get_current_user)):
+async def fetch_activity(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    action: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    user_id: str = Depends(get_current_user)
+):
+
+    logs, next_cursor = await get_user_activity_page(
+        user_id, limit, cursor=cursor, action=action, since=since, until=until
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
 
-    logs = get_user_activity(user_id)
     formatted_logs = []
 
     ist = pytz.timezone("Asia/Kolkata")
@@ -76,3 +91,15 @@ def fetch_activity(user_id: str = Depends(get_current_user)):
         })
 
     return formatted_logs
+
+
+# -----------------------
+# Daily Summaries (rolled-up history)
+# -----------------------
+@router.get("/daily")
+async def fetch_activity_daily(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    action: Optional[str] = None,
+    user_id: str = Depends(get_current_user)
+):
+    return await get_user_activity_daily(user_id, limit, action=action)
@@ -1,73 +1,202 @@
 from fastapi import APIRouter, Depends, HTTPException
 from app.auth.jwt_bearer import JwtBearer
-from app.models.task_model import get_tasks_by_user
-import requests
+from app.models.task_model import iter_tasks_by_user
+from app.models.ai_summary_model import (
+    SUMMARY_FIELDS,
+    prompt_hash,
+    get_cached_summary,
+    save_summary,
+)
+from app.routes.task_routes import get_user_from_request
+from app.utils.prompt_builder import PromptCompactor
+from app.utils.llm_client import LLMError, chat_completion, stream_chat_completion
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+import asyncio
+import json
 import traceback
 
 router = APIRouter(prefix="/ai", tags=["AI Summary"])
 
-# 🔥 Replace with your Groq API Key
-GROQ_API_KEY = "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"
+NO_TASKS_MESSAGE = "You don’t have any tasks yet. Add tasks to receive analysis."
 
-@router.get("/summary")
-def ai_summary(payload: dict = Depends(JwtBearer())):
-    try:
-        user_id = payload["user_id"]
+# (user_id, task hash) -> future of the upstream call already in flight
+_inflight = {}
+# (user_id, task hash) -> SummaryStream of a streaming call in flight
+# (its `done` future is in _inflight too)
+_streams = {}
 
-        tasks = get_tasks_by_user(user_id)
 
-        if not tasks:
-            return {"summary": "You don’t have any tasks yet. Add tasks to receive analysis."}
+async def build_user_prompt(user_id: str):
+    """Compacted prompt for the user's tasks, or None if they have none."""
+    compactor = PromptCompactor()
+    async for task in iter_tasks_by_user(user_id, SUMMARY_FIELDS):
+        compactor.add(task)
+    return compactor.build() if compactor.total else None
 
-        # Convert tasks to text
-        tasks_text = "\n".join([
-            f"- {t['title']} | Priority: {t.get('priority')} | Status: {t.get('status')}"
-            for t in tasks
-        ])
 
-        prompt = f"""
-        Analyze these tasks and provide:
-        1) A short productivity summary
-        2) Weak areas / what to improve
-        3) Actionable suggestions
+async def generate_summary(user_id: str, task_hash: str, prompt: str):
+    summary = await chat_completion(prompt)
+    await save_summary(user_id, task_hash, summary)
+    return summary
 
-        Tasks:
-        {tasks_text}
-        """
 
-        url = "https://api.groq.com/openai/v1/chat/completions"
+async def get_summary(user_id: str, prompt: str):
+    """
+    Cached summary for this exact task set, or a fresh one. Concurrent
+    requests for the same (user, hash) share one upstream call.
+    """
+    task_hash = prompt_hash(prompt)
+    cached = await get_cached_summary(user_id, task_hash)
+    if cached is not None:
+        return cached
 
-        headers = {
-            "Authorization": f"Bearer {GROQ_API_KEY}",
-            "Content-Type": "application/json",
-        }
+    key = (user_id, task_hash)
+    future = _inflight.get(key)
+    if future is None:
+        # A task of its own, so a disconnecting first caller doesn't cancel it for the rest
+        future = asyncio.ensure_future(generate_summary(user_id, task_hash, prompt))
+        _inflight[key] = future
+        future.add_done_callback(lambda _: _inflight.pop(key, None))
 
-        data = {
-            "model": "llama-3.1-8b-instant",  # ✔ ACTIVE MODEL
-            "messages": [
-                {"role": "user", "content": prompt}
-            ]
-        }
+    return await asyncio.shield(future)
 
-        response = requests.post(url, json=data, headers=headers)
 
-        print("\n===== GROQ API DEBUG =====")
-        print("STATUS:", response.status_code)
-        print("BODY:", response.text)
-        print("==========================\n")
+@router.get("/summary")
+async def ai_summary(payload: dict = Depends(JwtBearer())):
+    try:
+        user_id = payload["user_id"]
+
+        prompt = await build_user_prompt(user_id)
 
-        if response.status_code != 200:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Groq Error: {response.text}"
-            )
+        if not prompt:
+            return {"summary": NO_TASKS_MESSAGE}
 
-        reply = response.json()["choices"][0]["message"]["content"]
-        return {"summary": reply}
+        summary = await get_summary(user_id, prompt)
+        return {"summary": summary}
 
+    except LLMError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(
             status_code=500,
             detail=f"Server Error: {str(e)}"
         )
+
+
+# ---------------------------------------------------
+# STREAMING (Server-Sent Events)
+# ---------------------------------------------------
+def sse(data: dict, event: str = None):
+    head = f"event: {event}\n" if event else ""
+    return f"{head}data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+class SummaryStream:
+    """
+    One upstream stream, replayed to every request that joins it: each
+    listener gets the tokens so far, then the rest as they arrive.
+    """
+
+    def __init__(self):
+        self.tokens = []
+        self.done = asyncio.get_running_loop().create_future()  # the whole summary
+        self._changed = asyncio.Event()
+
+    def _wake(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def run(self, user_id: str, task_hash: str, prompt: str):
+        try:
+            async for token in stream_chat_completion(prompt):
+                self.tokens.append(token)
+                self._wake()
+            summary = "".join(self.tokens)
+            await save_summary(user_id, task_hash, summary)
+            self.done.set_result(summary)
+        except Exception as e:
+            self.done.set_exception(e)
+            self.done.exception()  # listeners re-raise it; don't warn if none are left
+        finally:
+            self._wake()
+
+    async def listen(self):
+        sent = 0
+        while True:
+            changed = self._changed
+            while sent < len(self.tokens):
+                yield self.tokens[sent]
+                sent += 1
+            if self.done.done():
+                self.done.result()  # raises the upstream error
+                return
+            await changed.wait()
+
+
+def join_stream(user_id: str, task_hash: str, prompt: str):
+    """The in-flight stream for this (user, hash), started if there is none."""
+    key = (user_id, task_hash)
+    stream = _streams.get(key)
+    if stream is None:
+        stream = SummaryStream()
+        _streams[key] = stream
+        _inflight[key] = stream.done
+
+        def finished(_):
+            _streams.pop(key, None)
+            _inflight.pop(key, None)
+
+        # A task of its own, so a disconnecting first listener doesn't cancel it for the rest
+        task = asyncio.ensure_future(stream.run(user_id, task_hash, prompt))
+        task.add_done_callback(finished)
+    return stream
+
+
+async def stream_summary_events(user_id: str, prompt: str):
+    """
+    Emits `data: {"token": ...}` events as the model writes, then
+    `event: done`. Concurrent streams of the same task set share one
+    upstream call. Cached summaries, and ones a non-streaming call is
+    already fetching, arrive as a single token. Only a completed stream
+    is cached.
+    """
+    task_hash = prompt_hash(prompt)
+    key = (user_id, task_hash)
+    try:
+        cached = await get_cached_summary(user_id, task_hash)
+        if cached is None and key in _inflight and key not in _streams:
+            cached = await asyncio.shield(_inflight[key])
+
+        if cached is not None:
+            yield sse({"token": cached})
+        else:
+            async for token in join_stream(user_id, task_hash, prompt).listen():
+                yield sse({"token": token})
+
+        yield sse({}, event="done")
+
+    except LLMError as e:
+        yield sse({"detail": e.detail}, event="error")
+    except Exception as e:
+        traceback.print_exc()
+        yield sse({"detail": f"Server Error: {str(e)}"}, event="error")
+
+
+@router.get("/summary/stream")
+async def ai_summary_stream(request: Request):
+    # EventSource can't send headers, so ?token= is accepted too
+    user_id = await get_user_from_request(request)
+
+    prompt = await build_user_prompt(user_id)
+    if not prompt:
+        events = iter([sse({"token": NO_TASKS_MESSAGE}), sse({}, event="done")])
+    else:
+        events = stream_summary_events(user_id, prompt)
+
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -9,8 +9,8 @@ from app.models.user_model import (
     update_user_profile,
     update_user_password
 )
-from app.auth.hash import hash_password, verify_password
-from app.auth.jwt_handler import create_access_token
+from app.auth.hash import hash_password_async, verify_password_async
+from app.auth.jwt_handler import create_access_token, invalidate_user_tokens
 from app.auth.jwt_bearer import JwtBearer
 from app.models.activity_model import log_activity
 
@@ -24,7 +24,6 @@ from app.models.user_model import (
     update_user_profile,
     update_user_password,   # already there
 )
-from app.auth.hash import hash_password, verify_password
 
 
 router = APIRouter(prefix="/auth")
@@ -60,13 +59,13 @@ async def signup(request: Request):
     body = await request.json()
     user = UserCreate(**body)
 
-    existing = get_user_by_email(user.email)
+    existing = await get_user_by_email(user.email)
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    hashed = hash_password(user.password)
+    hashed = await hash_password_async(user.password)
 
-    user_id = create_user({
+    user_id = await create_user({
         "name": user.name,
         "email": user.email,
         "password": hashed,
@@ -75,7 +74,7 @@ async def signup(request: Request):
 
     # Log activity
     device, ip = detect_device(request)
-    log_activity({
+    await log_activity({
         "user_id": user_id,
         "action": "signup",
         "description": "User created an account",
@@ -93,18 +92,18 @@ async def signup(request: Request):
 async def login(request: Request):
     body = await request.json()
     user = UserLogin(**body)
-    db_user = get_user_by_email(user.email)
+    db_user = await get_user_by_email(user.email)
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    if not verify_password(user.password, db_user["password"]):
+    if not await verify_password_async(user.password, db_user["password"]):
         raise HTTPException(status_code=400, detail="Incorrect password")
 
     token = create_access_token({"user_id": str(db_user["_id"])})
 
     # Log activity
     device, ip = detect_device(request)
-    log_activity({
+    await log_activity({
         "user_id": str(db_user["_id"]),
         "action": "login",
         "description": "User logged in",
@@ -122,70 +121,13 @@ async def login(request: Request):
         }
     }
 
-from fastapi import APIRouter, HTTPException, Request, Depends
-from pydantic import BaseModel
-
-# ---------- Pydantic Schemas ----------
-class ForgotPasswordRequest(BaseModel):
-  email: str
-
-class ResetPasswordRequest(BaseModel):
-  email: str
-  otp: str
-  new_password: str
-
-@router.post("/forgot-password")
-async def forgot_password(data: ForgotPasswordRequest):
-    """Step 1: User enters email, we send OTP to email."""
-    email = data.email.strip().lower()
-
-    user = get_user_by_email(email)
-    if not user:
-        # Don't reveal if user exists or not (for security),
-        # but for now you can send 404:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    # Generate 6-digit OTP
-    import random
-    otp = str(random.randint(100000, 999999))
-
-  
-
-    # Send email via Gmail SMTP
-    send_otp_email(email, otp)
-
-    return {"message": "OTP sent to your email"}
-
-@router.post("/reset-password")
-async def reset_password(data: ResetPasswordRequest):
-    """
-    Step 2: User sends email + OTP + new password.
-    If OTP is valid, update password.
-    """
-    email = data.email.strip().lower()
-    otp = data.otp.strip()
-    new_password = data.new_password
-
-    user = get_user_by_email(email)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    
-
-    # Hash new password
-    hashed = hash_password(new_password)
-
-    # Update user password
-    update_user_password(str(user["_id"]), new_password)
-
-   
 # ----------------------------------------------------
 # GET PROFILE
 # ----------------------------------------------------
 @router.get("/me")
-def get_profile(payload: dict = Depends(JwtBearer())):
+async def get_profile(payload: dict = Depends(JwtBearer())):
     user_id = payload["user_id"]
-    user = get_user_by_id(user_id)
+    user = await get_user_by_id(user_id)
 
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -210,13 +152,13 @@ async def update_profile(
 
     user_id = payload["user_id"]
 
-    updated = update_user_profile(user_id, data.dict(exclude_none=True))
+    updated = await update_user_profile(user_id, data.dict(exclude_none=True))
     if not updated:
         raise HTTPException(status_code=400, detail="Update failed")
 
     # Log activity
     device, ip = detect_device(request)
-    log_activity({
+    await log_activity({
         "user_id": user_id,
         "action": "profile_update",
         "description": "User updated profile",
@@ -238,17 +180,18 @@ async def change_password(request: Request, payload: dict = Depends(JwtBearer())
     new_password = body.get("new_password")
 
     user_id = payload["user_id"]
-    user = get_user_by_id(user_id)
+    user = await get_user_by_id(user_id)
 
-    if not verify_password(current_password, user["password"]):
+    if not await verify_password_async(current_password, user["password"]):
         raise HTTPException(status_code=400, detail="Incorrect current password")
 
-    hashed = hash_password(new_password)
-    update_user_password(user_id, hashed)
+    # update_user_password hashes it (passing a hash here double-hashed it)
+    await update_user_password(user_id, new_password)
+    await invalidate_user_tokens(user_id)
 
     # Log activity
     device, ip = detect_device(request)
-    log_activity({
+    await log_activity({
         "user_id": user_id,
         "action": "password_change",
         "description": "User changed password",
@@ -261,11 +204,12 @@ async def change_password(request: Request, payload: dict = Depends(JwtBearer())
 from app.models.activity_model import delete_user_activity
 
 @router.post("/logout")
-def logout_user(payload: dict = Depends(JwtBearer())):
+async def logout_user(payload: dict = Depends(JwtBearer())):
     user_id = payload["user_id"]
 
     from app.models.activity_model import delete_user_activity
-    delete_user_activity(user_id)
+    await delete_user_activity(user_id)
+    await invalidate_user_tokens(user_id)
 
     return {"message": "Logout successful, activity cleared"}
 
@@ -281,20 +225,19 @@ class ForgotPasswordRequest(BaseModel):
 async def forgot_password(data: ForgotPasswordRequest):
     email = data.email.lower()
 
-    user = get_user_by_email(email)
+    user = await get_user_by_email(email)
     if not user:
         raise HTTPException(status_code=404, detail="Email not found")
 
     import random
     otp = str(random.randint(100000, 999999))
 
-    save_otp(email, otp)
-    send_otp_email(email, otp)
+    await save_otp(email, otp)
+    await send_otp_email(email, otp)
 
     return {"message": "OTP sent to your email"}
 
 from app.models.otp_model import verify_otp, mark_otp_used
-from app.auth.hash import hash_password
 
 class ResetPasswordRequest(BaseModel):
     email: str
@@ -308,23 +251,24 @@ async def reset_password(data: ResetPasswordRequest):
     otp = data.otp.strip()
     new_password = data.new_password
 
-    user = get_user_by_email(email)
+    user = await get_user_by_email(email)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
     # Check OTP
-    if not verify_otp(email, otp):
+    if not await verify_otp(email, otp):
         raise HTTPException(status_code=400, detail="Invalid or expired OTP")
 
     # Hash new password
-    hashed = hash_password(new_password)
+    hashed = await hash_password_async(new_password)
 
     # Directly update password (no old password needed)
-    users_collection.update_one(
+    await users_collection.update_one(
         {"_id": user["_id"]},
         {"$set": {"password": hashed}}
     )
 
-    mark_otp_used(email, otp)
+    await mark_otp_used(email, otp)
+    await invalidate_user_tokens(str(user["_id"]))
 
     return {"message": "Password reset successful"}
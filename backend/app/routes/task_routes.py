@@ -1,24 +1,57 @@
 # FILE: app/routes/task_routes.py
 
-from fastapi import APIRouter, Depends, HTTPException, Request
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile, File, Query
+from fastapi.responses import StreamingResponse, Response
+from typing import Literal, Optional
 from datetime import datetime
-from io import StringIO, BytesIO
+from bson.objectid import ObjectId
+from pydantic import ValidationError
+from io import StringIO
 import csv
-from reportlab.pdfgen import canvas
 
-from app.schemas.task_schema import TaskCreate, TaskUpdate
+from app.schemas.task_schema import TaskCreate, TaskUpdate, TaskMove, BulkTaskRequest
 from app.auth.jwt_bearer import JwtBearer
 from app.models.task_model import (
     create_task,
-    get_tasks_by_user,
-    update_task,
-    delete_task,
+    get_tasks_page,
+    iter_tasks_by_user,
+    update_owned_task,
+    delete_owned_task,
     get_task_by_id,
+    get_task_attachment,
     get_upcoming_tasks,
-    get_overdue_tasks
+    get_overdue_tasks,
+    get_tasks_by_ids,
+    bulk_write_tasks,
+    get_column_tail_rank,
+    check_rank_length,
+    move_task,
+    search_tasks,
+    autocomplete_tasks,
+    get_task_seq,
+    sync_fields,
+    TASK_LIST_PROJECTION
+)
+from app.models.activity_model import log_activity, log_activities
+from app.models.stats_model import get_task_stats, TASK_STATUSES
+from app.models.sync_model import record_task_change, record_task_changes, get_task_changes
+from app.utils.reminder_scheduler import reminder_scheduler
+from app.models.attachment_model import (
+    save_attachment_upload,
+    save_attachment_bytes,
+    release_blob
 )
-from app.models.activity_model import log_activity
+from app.utils.file_store import (
+    decode_data_url,
+    content_disposition,
+    parse_range,
+    iter_blob,
+    blob_exists
+)
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.utils.etag import task_etag, parse_if_match, collection_etag, etag_matches
+from app.utils.rank import rank_after
+from app.utils.search import search_fields
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
@@ -34,41 +67,48 @@ def get_current_user(payload: dict = Depends(JwtBearer())):
 
 
 # ---------------------------------------------------
-# ANALYTICS (MUST BE ABOVE /{task_id})
+# CONDITIONAL GET
 # ---------------------------------------------------
-@router.get("/analytics")
-def analytics(user_id: str = Depends(get_current_user)):
+async def not_modified(request: Request, response: Response, user_id: str, *parts):
+    """
+    Tag a task-derived response with the user's change counter. Returns a
+    304 response when the client's copy is current (without querying the
+    tasks), else None and the caller builds the body.
+    """
+    etag = collection_etag(user_id, await get_task_seq(user_id), request.url.path, request.url.query, *parts)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
 
-    tasks = get_tasks_by_user(user_id)
+    if etag_matches(request.headers.get("If-None-Match"), etag):
+        return Response(status_code=304, headers=headers)
 
-    status_map = {
-        "todo": "To Do",
-        "inprogress": "In Progress",
-        "completed": "Completed",
-        "blocked": "Blocked",
-    }
+    response.headers.update(headers)
+    return None
 
-    status_count = {v: 0 for v in status_map.values()}
-    priority_count = {"High": 0, "Medium": 0, "Low": 0}
-    weekly = {}
 
-    for t in tasks:
-        s = t.get("status", "todo")
-        status_count[status_map.get(s, "To Do")] += 1
+# ---------------------------------------------------
+# ANALYTICS (MUST BE ABOVE /{task_id})
+# ---------------------------------------------------
+STATUS_LABELS = {
+    "todo": "To Do",
+    "inprogress": "In Progress",
+    "completed": "Completed",
+    "blocked": "Blocked",
+}
+
+
+def format_analytics(counts: dict):
+    """Shape raw status/priority/weekly counts for the Analytics page."""
+    status_count = {v: 0 for v in STATUS_LABELS.values()}
+    for s, n in counts["status"].items():
+        # Missing or unknown statuses count as To Do
+        status_count[STATUS_LABELS.get(s, "To Do")] += n
 
-        p = t.get("priority", "Low")
+    priority_count = {"High": 0, "Medium": 0, "Low": 0}
+    for p, n in counts["priority"].items():
         if p in priority_count:
-            priority_count[p] += 1
-
-        if t.get("status") == "completed":
-            date_str = t.get("date")
-            if date_str:
-                try:
-                    dt = datetime.strptime(date_str, "%Y-%m-%d")
-                    week_no = dt.isocalendar().week
-                    weekly[week_no] = weekly.get(week_no, 0) + 1
-                except:
-                    pass
+            priority_count[p] += n
+
+    weekly = {int(week): n for week, n in counts["weekly"].items() if n}
 
     return {
         "statusData": [
@@ -89,11 +129,28 @@ def analytics(user_id: str = Depends(get_current_user)):
     }
 
 
+@router.get("/analytics")
+async def analytics(request: Request, response: Response, user_id: str = Depends(get_current_user)):
+    cached = await not_modified(request, response, user_id)
+    if cached:
+        return cached
+
+    return format_analytics(await get_task_stats(user_id))
+
+
 # ---------------------------------------------------
 # CREATE TASK
 # ---------------------------------------------------
+def decode_file_field(file_data: str):
+    """decode_data_url for a request body field; bad input is a 400."""
+    try:
+        return decode_data_url(file_data)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid file data")
+
+
 @router.post("/")
-def add_task(task: TaskCreate, request: Request, user_id: str = Depends(get_current_user)):
+async def add_task(task: TaskCreate, request: Request, user_id: str = Depends(get_current_user)):
 
     data = {
         "title": task.title,
@@ -101,15 +158,23 @@ def add_task(task: TaskCreate, request: Request, user_id: str = Depends(get_curr
         "priority": task.priority,
         "date": task.date,
         "status": task.status or "todo",
-        "file": task.file,
-        "file_name": task.file_name,
-        "original_file_name": task.original_file_name,
         "user_id": user_id,
+        "version": 0,
     }
+    # New cards go to the bottom of their Kanban column
+    data["rank"] = rank_after(await get_column_tail_rank(user_id, data["status"]))
+    check_rank_length(user_id, data["status"], data["rank"])
+
+    # Legacy clients still send the file inline as base64
+    if task.file:
+        raw, content_type = decode_file_field(task.file)
+        data["attachment"] = await save_attachment_bytes(raw, task.original_file_name, content_type)
 
-    task_id = create_task(data)
+    task_id = await create_task(data)
+    await record_task_change(user_id, after={**data, "_id": task_id})
+    reminder_scheduler.touch(user_id)
 
-    log_activity({
+    await log_activity({
         "user_id": user_id,
         "action": "task_create",
         "description": f"Created task: {task.title}",
@@ -124,18 +189,37 @@ def add_task(task: TaskCreate, request: Request, user_id: str = Depends(get_curr
 # UPDATE TASK
 # ---------------------------------------------------
 @router.put("/{task_id}")
-def edit_task(task_id: str, task: TaskUpdate, request: Request, user_id: str = Depends(get_current_user)):
-
-    existing = get_task_by_id(task_id)
-    if not existing:
-        raise HTTPException(status_code=404, detail="Task not found")
-
-    if existing["user_id"] != user_id:
-        raise HTTPException(status_code=403, detail="Unauthorized")
-
-    update_task(task_id, task.dict(exclude_none=True))
-
-    log_activity({
+async def edit_task(
+    task_id: str,
+    task: TaskUpdate,
+    request: Request,
+    response: Response,
+    user_id: str = Depends(get_current_user)
+):
+
+    version = parse_if_match(request.headers.get("If-Match"))
+
+    updates = task.dict(exclude_none=True, exclude={"file", "file_name", "original_file_name"})
+    if task.file:
+        raw, content_type = decode_file_field(task.file)
+        updates["attachment"] = await save_attachment_bytes(raw, task.original_file_name, content_type)
+        updates["file"] = None
+
+    try:
+        existing, updated = await update_owned_task(task_id, user_id, updates, version)
+    except HTTPException:
+        if task.file:
+            await release_blob(updates["attachment"]["hash"])
+        raise
+
+    await record_task_change(user_id, existing, updated)
+    if "date" in updates or "status" in updates:
+        reminder_scheduler.touch(user_id)
+
+    if task.file and existing.get("attachment"):
+        await release_blob(existing["attachment"]["hash"])
+
+    await log_activity({
         "user_id": user_id,
         "action": "task_update",
         "description": f"Updated task: {task_id}",
@@ -143,25 +227,25 @@ def edit_task(task_id: str, task: TaskUpdate, request: Request, user_id: str = D
         "ip": request.client.host,
     })
 
-    return {"message": "Task updated"}
+    response.headers["ETag"] = task_etag(updated)
+    return {"message": "Task updated", "task": updated}
 
 
 # ---------------------------------------------------
 # DELETE TASK
 # ---------------------------------------------------
 @router.delete("/{task_id}")
-def remove_task(task_id: str, request: Request, user_id: str = Depends(get_current_user)):
+async def remove_task(task_id: str, request: Request, user_id: str = Depends(get_current_user)):
 
-    existing = get_task_by_id(task_id)
-    if not existing:
-        raise HTTPException(status_code=404, detail="Task not found")
-
-    if existing["user_id"] != user_id:
-        raise HTTPException(status_code=403, detail="Unauthorized")
+    version = parse_if_match(request.headers.get("If-Match"))
+    existing = await delete_owned_task(task_id, user_id, version)
+    await record_task_change(user_id, before=existing)
+    reminder_scheduler.touch(user_id)
 
-    delete_task(task_id)
+    if existing.get("attachment"):
+        await release_blob(existing["attachment"]["hash"])
 
-    log_activity({
+    await log_activity({
         "user_id": user_id,
         "action": "task_delete",
         "description": f"Deleted task: {task_id}",
@@ -172,63 +256,485 @@ def remove_task(task_id: str, request: Request, user_id: str = Depends(get_curre
     return {"message": "Task deleted"}
 
 
+# ---------------------------------------------------
+# BULK CREATE / UPDATE / STATUS / DELETE
+# ---------------------------------------------------
+FILE_FIELDS = {"file", "file_name", "original_file_name"}
+
+
+@router.post("/bulk")
+async def bulk_tasks(body: BulkTaskRequest, request: Request, user_id: str = Depends(get_current_user)):
+    """
+    Apply a batch of operations: one ownership query, the writes in
+    parallel (see bulk_write_tasks), one stats $inc and one activity
+    insert. Each operation gets its own result; a failing item does not
+    stop the others.
+    """
+    ops = body.operations
+    results = [None] * len(ops)
+
+    def fail(i, status_code, detail):
+        results[i] = {"index": i, "op": ops[i].op, "id": ops[i].id, "ok": False,
+                      "status_code": status_code, "detail": detail}
+
+    # 1) Every task the batch touches, in one query
+    seen = set()
+    for i, op in enumerate(ops):
+        if op.op == "create":
+            continue
+        if not op.id or not ObjectId.is_valid(op.id):
+            fail(i, 400, "Invalid task id")
+        elif op.id in seen:
+            # Unordered writes give no order between two ops on one task
+            fail(i, 409, "Task appears more than once in this batch")
+        else:
+            seen.add(op.id)
+
+    existing = await get_tasks_by_ids(list(seen), TASK_LIST_PROJECTION) if seen else {}
+
+    # 2) Validate and build the writes
+    tails = {}  # status -> rank of the last card, for appending creates and status changes
+
+    async def append_rank(status):
+        if status not in tails:
+            tails[status] = await get_column_tail_rank(user_id, status)
+        tails[status] = rank_after(tails[status])
+        return tails[status]
+
+    writes = []
+    planned = []  # (op index, before, after, activity description)
+    for i, op in enumerate(ops):
+        if results[i]:
+            continue
+
+        if op.op == "create":
+            try:
+                task = TaskCreate(**(op.data or {}))
+            except ValidationError:
+                fail(i, 422, "Invalid task data")
+                continue
+            if task.file:
+                fail(i, 400, "Upload attachments with POST /tasks/{task_id}/attachment")
+                continue
+
+            data = {
+                "_id": ObjectId(),
+                "title": task.title,
+                "description": task.description,
+                "priority": task.priority,
+                "date": task.date,
+                "status": task.status or "todo",
+                "user_id": user_id,
+                "version": 0,
+            }
+            data["rank"] = await append_rank(data["status"])
+
+            ops[i].id = str(data["_id"])
+            writes.append(("insert", {**data, **search_fields(data), **sync_fields()}))
+            planned.append((i, None, data, f"Created task: {task.title}"))
+            continue
+
+        before = existing.get(op.id)
+        if not before:
+            fail(i, 404, "Task not found")
+            continue
+        if before["user_id"] != user_id:
+            fail(i, 403, "Unauthorized")
+            continue
+
+        # Same guard as the single-task writes: applied only if nobody wrote
+        # the task since it was read above (missing version counts as 0)
+        current = before.get("version", 0)
+        owned = {"_id": before["_id"], "user_id": user_id,
+                 "version": current if current else {"$in": [0, None]}}
+        version = current + 1  # after the write
+
+        if op.op == "update":
+            try:
+                task = TaskUpdate(**(op.data or {}))
+            except ValidationError:
+                fail(i, 422, "Invalid task data")
+                continue
+            if task.file:
+                fail(i, 400, "Upload attachments with POST /tasks/{task_id}/attachment")
+                continue
+            updates = task.dict(exclude_none=True, exclude=FILE_FIELDS)
+            if not updates:
+                fail(i, 400, "Nothing to update")
+                continue
+            if "status" in updates and updates["status"] != before.get("status"):
+                updates["rank"] = await append_rank(updates["status"])
+
+            sync = sync_fields()
+            writes.append(("update", owned, {
+                "$set": {**updates, **search_fields(updates), **sync}, "$inc": {"version": 1}
+            }))
+            after = {**before, **updates, "updated_at": sync["updated_at"], "version": version}
+            planned.append((i, before, after, f"Updated task: {op.id}"))
+
+        elif op.op == "status":
+            if op.status not in TASK_STATUSES:
+                fail(i, 400, "Invalid status")
+                continue
+
+            updates = {"status": op.status}
+            if op.status != before.get("status"):
+                updates["rank"] = await append_rank(op.status)
+
+            sync = sync_fields()
+            writes.append(("update", owned, {"$set": {**updates, **sync}, "$inc": {"version": 1}}))
+            after = {**before, **updates, "updated_at": sync["updated_at"], "version": version}
+            planned.append((i, before, after, f"Changed status to {op.status} for task {op.id}"))
+
+        else:
+            writes.append(("delete", owned))
+            planned.append((i, before, None, f"Deleted task: {op.id}"))
+
+    # 3) All writes at once; each reports whether it applied
+    errors = await bulk_write_tasks(writes) if writes else {}
+
+    # 4) Stats, attachments and activity for what was applied
+    actions = {"create": "task_create", "update": "task_update",
+               "status": "task_status_change", "delete": "task_delete"}
+    changes = []
+    entries = []
+    for n, (i, before, after, description) in enumerate(planned):
+        if n in errors:
+            fail(i, *errors[n])
+            continue
+
+        results[i] = {"index": i, "op": ops[i].op, "id": ops[i].id, "ok": True}
+        changes.append((before, after))
+        entries.append({
+            "user_id": user_id,
+            "action": actions[ops[i].op],
+            "description": description,
+            "device": request.headers.get("User-Agent"),
+            "ip": request.client.host,
+        })
+
+        if after is None and before.get("attachment"):
+            await release_blob(before["attachment"]["hash"])
+
+    await record_task_changes(user_id, changes)
+    await log_activities(entries)
+    for status, rank in tails.items():
+        check_rank_length(user_id, status, rank)
+    if changes:
+        reminder_scheduler.touch(user_id)
+
+    succeeded = sum(1 for r in results if r["ok"])
+    return {"results": results, "succeeded": succeeded, "failed": len(results) - succeeded}
+
+
 # ---------------------------------------------------
 # GET ALL TASKS
 # ---------------------------------------------------
 @router.get("/")
-def all_tasks(user_id: str = Depends(get_current_user)):
-    return get_tasks_by_user(user_id)
+async def all_tasks(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    sort: Literal["date", "-date", "created", "-created", "rank"] = "date",
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    user_id: str = Depends(get_current_user)
+):
+    cached = await not_modified(request, response, user_id)
+    if cached:
+        return cached
+
+    tasks, next_cursor = await get_tasks_page(
+        user_id,
+        limit,
+        cursor=cursor,
+        sort=sort,
+        status=status,
+        priority=priority,
+        date_from=date_from,
+        date_to=date_to,
+    )
+
+    # Body stays a plain list; the next page is advertised in a header
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+
+    return tasks
+
+
+# ---------------------------------------------------
+# SEARCH & AUTOCOMPLETE (ABOVE /{task_id})
+# ---------------------------------------------------
+@router.get("/search")
+async def search(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    prefix: bool = False,
+    user_id: str = Depends(get_current_user)
+):
+    # prefix=true: partial words in titles ("bud" finds "budget")
+    tasks, next_cursor = await search_tasks(user_id, q, limit, cursor=cursor, prefix=prefix)
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+
+    return tasks
+
+
+@router.get("/autocomplete")
+async def autocomplete(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(10, ge=1, le=50),
+    user_id: str = Depends(get_current_user)
+):
+    return await autocomplete_tasks(user_id, q, limit)
+
+
+# ---------------------------------------------------
+# DELTA SYNC (ABOVE /{task_id})
+# ---------------------------------------------------
+@router.get("/changes")
+async def task_changes(
+    since: Optional[str] = None,
+    limit: int = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    user_id: str = Depends(get_current_user)
+):
+    # No cursor: every task, as the first sync of a new replica
+    return await get_task_changes(user_id, limit, cursor=since)
 
 
 # ---------------------------------------------------
 # UPCOMING & OVERDUE (IMPORTANT: ABOVE /{task_id})
 # ---------------------------------------------------
+# Both depend on today's date as well as the tasks
 @router.get("/overdue")
-def overdue_tasks(user_id: str = Depends(get_current_user)):
-    return get_overdue_tasks(user_id)
+async def overdue_tasks(request: Request, response: Response, user_id: str = Depends(get_current_user)):
+    cached = await not_modified(request, response, user_id, datetime.today().strftime("%Y-%m-%d"))
+    if cached:
+        return cached
+
+    return await get_overdue_tasks(user_id)
 
 
 @router.get("/upcoming")
-def upcoming_tasks(user_id: str = Depends(get_current_user)):
-    return get_upcoming_tasks(user_id)
+async def upcoming_tasks(request: Request, response: Response, user_id: str = Depends(get_current_user)):
+    cached = await not_modified(request, response, user_id, datetime.today().strftime("%Y-%m-%d"))
+    if cached:
+        return cached
+
+    return await get_upcoming_tasks(user_id)
+
+
+# ---------------------------------------------------
+# ATTACHMENTS
+# ---------------------------------------------------
+async def get_user_from_request(request: Request):
+    """Bearer header, or ?token= for <img>/<iframe>/download links."""
+    auth = request.headers.get("Authorization", "")
+    if auth.startswith("Bearer "):
+        payload = await decode_access_token_cached(auth[len("Bearer "):])
+        user_id = payload.get("user_id")
+        if not user_id:
+            raise HTTPException(status_code=401, detail="Invalid token")
+        return user_id
+
+    return await get_user_from_token(request)
+
+
+async def get_owned_attachment(task_id: str, user_id: str):
+    task = await get_task_attachment(task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    if task["user_id"] != user_id:
+        raise HTTPException(status_code=403, detail="Unauthorized")
+
+    return task.get("attachment")
+
+
+@router.post("/{task_id}/attachment")
+async def upload_attachment(
+    task_id: str,
+    request: Request,
+    file: UploadFile = File(...),
+    user_id: str = Depends(get_current_user)
+):
+
+    version = parse_if_match(request.headers.get("If-Match"))
+
+    attachment = await save_attachment_upload(file)
+    try:
+        existing, updated = await update_owned_task(
+            task_id, user_id, {"attachment": attachment, "file": None}, version
+        )
+    except HTTPException:
+        await release_blob(attachment["hash"])
+        raise
+
+    await record_task_change(user_id, existing, updated)
+
+    if existing.get("attachment"):
+        await release_blob(existing["attachment"]["hash"])
+
+    await log_activity({
+        "user_id": user_id,
+        "action": "task_attachment_upload",
+        "description": f"Uploaded {attachment['name']} to task {task_id}",
+        "device": request.headers.get("User-Agent"),
+        "ip": request.client.host,
+    })
+
+    return {"message": "Attachment uploaded", "attachment": attachment}
+
+
+@router.get("/{task_id}/attachment")
+async def download_attachment(task_id: str, request: Request):
+
+    user_id = await get_user_from_request(request)
+    attachment = await get_owned_attachment(task_id, user_id)
+
+    if not attachment or not blob_exists(attachment["hash"]):
+        raise HTTPException(status_code=404, detail="Attachment not found")
+
+    size = attachment["size"]
+    etag = f'"{attachment["hash"]}"'
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "private, max-age=31536000, immutable",
+        "Content-Disposition": content_disposition(attachment.get("name"), attachment.get("content_type")),
+        # Never let the browser second-guess the stored content type
+        "X-Content-Type-Options": "nosniff",
+    }
+
+    if request.headers.get("If-None-Match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    try:
+        byte_range = parse_range(request.headers.get("Range"), size)
+    except ValueError:
+        return Response(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+
+    if byte_range and request.headers.get("If-Range", etag) != etag:
+        byte_range = None
+
+    if byte_range:
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        headers["Content-Length"] = str(end - start + 1)
+        return StreamingResponse(
+            iter_blob(attachment["hash"], start, end),
+            status_code=206,
+            media_type=attachment.get("content_type"),
+            headers=headers
+        )
+
+    headers["Content-Length"] = str(size)
+    return StreamingResponse(
+        iter_blob(attachment["hash"]),
+        media_type=attachment.get("content_type"),
+        headers=headers
+    )
+
+
+@router.delete("/{task_id}/attachment")
+async def remove_attachment(task_id: str, request: Request, user_id: str = Depends(get_current_user)):
+
+    version = parse_if_match(request.headers.get("If-Match"))
+    if not await get_owned_attachment(task_id, user_id):
+        raise HTTPException(status_code=404, detail="Attachment not found")
+
+    # Only a write that still finds the attachment releases its blob
+    existing, updated = await update_owned_task(
+        task_id, user_id, {"attachment": None}, version, where={"attachment": {"$ne": None}}
+    )
+    await record_task_change(user_id, existing, updated)
+
+    await release_blob(existing["attachment"]["hash"])
+
+    return {"message": "Attachment removed"}
 
 
 # ---------------------------------------------------
 # GET SINGLE TASK (MUST BE LAST)
 # ---------------------------------------------------
 @router.get("/{task_id}")
-def get_single_task(task_id: str, user_id: str = Depends(get_current_user)):
+async def get_single_task(task_id: str, response: Response, user_id: str = Depends(get_current_user)):
 
-    task = get_task_by_id(task_id)
+    task = await get_task_by_id(task_id, TASK_LIST_PROJECTION)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
     if task["user_id"] != user_id:
         raise HTTPException(status_code=403, detail="Unauthorized")
 
+    # Send back in If-Match to update or delete only this version
+    response.headers["ETag"] = task_etag(task)
     return task
 
 
+# ---------------------------------------------------
+# MOVE (KANBAN: COLUMN AND POSITION)
+# ---------------------------------------------------
+@router.put("/{task_id}/move")
+async def move_task_card(
+    task_id: str,
+    move: TaskMove,
+    request: Request,
+    response: Response,
+    user_id: str = Depends(get_current_user)
+):
+
+    if move.status not in TASK_STATUSES:
+        raise HTTPException(status_code=400, detail="Invalid status")
+
+    version = parse_if_match(request.headers.get("If-Match"))
+    task, updated = await move_task(task_id, user_id, move.status, move.after_id, move.before_id, version)
+    await record_task_change(user_id, task, updated)
+
+    if task.get("status") != move.status:
+        reminder_scheduler.touch(user_id)
+
+        await log_activity({
+            "user_id": user_id,
+            "action": "task_status_change",
+            "description": f"Changed status to {move.status} for task {task_id}",
+            "device": request.headers.get("User-Agent"),
+            "ip": request.client.host,
+        })
+
+    response.headers["ETag"] = task_etag(updated)
+    return {"message": "Task moved", "task": updated}
+
+
 # ---------------------------------------------------
 # UPDATE TASK STATUS
 # ---------------------------------------------------
 @router.put("/status/{task_id}")
-def update_status(task_id: str, data: dict, request: Request, user_id: str = Depends(get_current_user)):
+async def update_status(
+    task_id: str,
+    data: dict,
+    request: Request,
+    response: Response,
+    user_id: str = Depends(get_current_user)
+):
 
     status = data.get("status")
-    if status not in ["todo", "inprogress", "completed", "blocked"]:
+    if status not in TASK_STATUSES:
         raise HTTPException(status_code=400, detail="Invalid status")
 
-    task = get_task_by_id(task_id)
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
+    version = parse_if_match(request.headers.get("If-Match"))
+    task, updated = await update_owned_task(task_id, user_id, {"status": status}, version)
 
-    if task["user_id"] != user_id:
-        raise HTTPException(status_code=403, detail="Unauthorized")
+    await record_task_change(user_id, task, updated)
+    reminder_scheduler.touch(user_id)
 
-    update_task(task_id, {"status": status})
-
-    log_activity({
+    await log_activity({
         "user_id": user_id,
         "action": "task_status_change",
         "description": f"Changed status to {status} for task {task_id}",
@@ -236,24 +742,25 @@ def update_status(task_id: str, data: dict, request: Request, user_id: str = Dep
         "ip": request.client.host,
     })
 
-    return {"message": "Status updated"}
+    response.headers["ETag"] = task_etag(updated)
+    return {"message": "Status updated", "task": updated}
 
 from fastapi.responses import StreamingResponse
-from io import StringIO, BytesIO
+from io import StringIO
 import csv
-from reportlab.pdfgen import canvas
-from app.auth.jwt_handler import decode_access_token
+from app.auth.jwt_handler import decode_access_token_cached
+from app.utils.pdf_report import render_report, iter_bytes, REPORT_SECTIONS
 
 
 # ---------------------------------------------------
 # READ USER FROM TOKEN
 # ---------------------------------------------------
-def get_user_from_token(request: Request):
+async def get_user_from_token(request: Request):
     token = request.query_params.get("token")
     if not token:
         raise HTTPException(status_code=401, detail="Token missing")
 
-    payload = decode_access_token(token)
+    payload = await decode_access_token_cached(token)
     user_id = payload.get("user_id")
 
     if not user_id:
@@ -265,29 +772,42 @@ def get_user_from_token(request: Request):
 # ---------------------------------------------------
 # EXPORT CSV
 # ---------------------------------------------------
-@router.get("/export/csv")
-def export_csv(request: Request):
+CSV_COLUMNS = ["title", "description", "priority", "date", "status"]
+CSV_ROWS_PER_CHUNK = 500
 
-    user_id = get_user_from_token(request)
-    tasks = get_tasks_by_user(user_id)
 
+async def stream_tasks_csv(user_id: str):
+    """Yield the CSV a batch of rows at a time, straight off the cursor."""
     output = StringIO()
     writer = csv.writer(output)
     writer.writerow(["Title", "Description", "Priority", "Date", "Status"])
 
-    for t in tasks:
+    rows = 0
+    async for t in iter_tasks_by_user(user_id, CSV_COLUMNS, batch_size=CSV_ROWS_PER_CHUNK):
         writer.writerow([
-            t["title"],
-            t.get("description", ""),
-            t["priority"],
+            t.get("title", ""),
+            t.get("description") or "",
+            t.get("priority", ""),
             t.get("date", ""),
             t.get("status", "")
         ])
+        rows += 1
+
+        if rows % CSV_ROWS_PER_CHUNK == 0:
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate(0)
 
-    output.seek(0)
+    yield output.getvalue()
+
+
+@router.get("/export/csv")
+async def export_csv(request: Request):
+
+    user_id = await get_user_from_token(request)
 
     return StreamingResponse(
-        iter([output.getvalue()]),
+        stream_tasks_csv(user_id),
         media_type="text/csv",
         headers={"Content-Disposition":
                  "attachment; filename=tasks.csv"}
@@ -298,32 +818,22 @@ def export_csv(request: Request):
 # EXPORT PDF
 # ---------------------------------------------------
 @router.get("/export/pdf")
-def export_pdf(request: Request):
+async def export_pdf(request: Request, sections: str = ""):
 
-    user_id = get_user_from_token(request)
-    tasks = get_tasks_by_user(user_id)
+    user_id = await get_user_from_token(request)
 
-    buffer = BytesIO()
-    pdf = canvas.Canvas(buffer)
-    pdf.setFont("Helvetica", 12)
-
-    y = 800
-    pdf.drawString(50, y, "Task Report")
-    y -= 40
-
-    for t in tasks:
-        pdf.drawString(
-            50, y, 
-            f"{t['title']} | {t['priority']} | {t['status']}"
-        )
-        y -= 20
+    wanted = tuple(s for s in sections.split(",") if s in REPORT_SECTIONS)
+    rows = [
+        (t.get("title", ""), t.get("priority", ""), t.get("status", ""), t.get("date", ""))
+        async for t in iter_tasks_by_user(user_id, ["title", "priority", "status", "date"])
+    ]
 
-    pdf.save()
-    buffer.seek(0)
+    pdf_bytes = await render_report(rows, wanted)
 
     return StreamingResponse(
-        buffer,
+        iter_bytes(pdf_bytes),
         media_type="application/pdf",
         headers={"Content-Disposition":
-                 "attachment; filename=tasks.pdf"}
+                 "attachment; filename=tasks.pdf",
+                 "Content-Length": str(len(pdf_bytes))}
     )
@@ -1,7 +1,7 @@
 # FILE: app/schemas/task_schema.py
 
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
 
 
 class TaskCreate(BaseModel):
@@ -28,3 +28,22 @@ class TaskUpdate(BaseModel):
     file: Optional[str] = None
     file_name: Optional[str] = None
     original_file_name: Optional[str] = None
+
+
+class TaskMove(BaseModel):
+    # The cards that end up directly above / below; None at the top / bottom
+    # of the column (neither: append to the column)
+    status: str
+    after_id: Optional[str] = None
+    before_id: Optional[str] = None
+
+
+class BulkTaskOperation(BaseModel):
+    op: Literal["create", "update", "status", "delete"]
+    id: Optional[str] = None        # existing task (update / status / delete)
+    data: Optional[dict] = None     # TaskCreate fields (create) or TaskUpdate fields (update)
+    status: Optional[str] = None    # status
+
+
+class BulkTaskRequest(BaseModel):
+    operations: List[BulkTaskOperation] = Field(..., min_length=1, max_length=500)
@@ -0,0 +1,53 @@
+# FILE: app/utils/etag.py
+#
+# Task versions as HTTP validators. Every write bumps a task's `version`
+# (tasks written before the field existed count as 0); clients echo the
+# ETag back in If-Match to make an update or delete conditional.
+#
+# Responses built from many tasks (lists, analytics) get a weak ETag from
+# the user's change counter instead; If-None-Match then answers 304.
+
+import hashlib
+
+from fastapi import HTTPException
+
+
+def task_etag(task: dict):
+    return f'"{task.get("version", 0)}"'
+
+
+def parse_if_match(value: str = None):
+    """The version an If-Match header requires, or None for no precondition."""
+    if value is None or value.strip() == "*":
+        return None
+
+    # One task has one current version, so only the first tag can match
+    tag = value.split(",")[0].strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    tag = tag.strip('"')
+
+    if not tag.isdigit():
+        raise HTTPException(status_code=412, detail="Precondition Failed")
+    return int(tag)
+
+
+def collection_etag(user_id: str, seq: int, *parts):
+    """
+    Weak ETag for a response derived from a user's tasks at change counter
+    `seq`. `parts` (URL, today's date, ...) are whatever else the body
+    depends on; the user id keeps two accounts in one browser apart.
+    """
+    key = "\x00".join([user_id, *map(str, parts)])
+    return f'W/"{seq}-{hashlib.sha1(key.encode()).hexdigest()[:16]}"'
+
+
+def etag_matches(if_none_match: str, etag: str):
+    """If-None-Match comparison (weak: W/ prefixes are ignored)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in tags
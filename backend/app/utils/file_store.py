@@ -0,0 +1,166 @@
+# FILE: app/utils/file_store.py
+#
+# Content-addressed blob storage on the local storage/ directory.
+# Every blob lives at storage/attachments/<sha[:2]>/<sha>, so identical
+# files are stored exactly once.
+#
+# STORAGE_DIR must not be served statically (main.py mounts uploads/):
+# attachments are only readable through GET /tasks/{id}/attachment,
+# which checks ownership. Blobs written by earlier versions under
+# uploads/attachments should be moved to storage/attachments.
+
+import asyncio
+import base64
+import hashlib
+import os
+import re
+import uuid
+from urllib.parse import quote
+
+STORAGE_DIR = os.getenv("STORAGE_DIR", "storage")
+BLOB_DIR = os.path.join(STORAGE_DIR, "attachments")
+TMP_DIR = os.path.join(STORAGE_DIR, "tmp")
+
+# Shown in the browser; anything else (HTML, SVG, ...) is downloaded so it
+# can never run script on the API origin
+INLINE_CONTENT_TYPES = {
+    "image/png", "image/jpeg", "image/gif", "image/webp", "application/pdf",
+}
+
+CHUNK_SIZE = 64 * 1024
+
+
+def blob_path(sha256: str):
+    return os.path.join(BLOB_DIR, sha256[:2], sha256)
+
+
+def blob_exists(sha256: str):
+    return os.path.exists(blob_path(sha256))
+
+
+def _commit_tmp(tmp_path: str, sha256: str):
+    final = blob_path(sha256)
+    if os.path.exists(final):
+        # Duplicate content: keep the existing blob
+        os.remove(tmp_path)
+        return
+    os.makedirs(os.path.dirname(final), exist_ok=True)
+    os.replace(tmp_path, final)
+
+
+# ---------------------------
+# WRITE
+# ---------------------------
+async def save_stream(chunks):
+    """
+    Write an async iterator of byte chunks to the store while hashing it.
+    Returns (sha256, size).
+    """
+    os.makedirs(TMP_DIR, exist_ok=True)
+    tmp_path = os.path.join(TMP_DIR, uuid.uuid4().hex)
+    digest = hashlib.sha256()
+    size = 0
+
+    try:
+        with open(tmp_path, "wb") as f:
+            async for chunk in chunks:
+                digest.update(chunk)
+                size += len(chunk)
+                await asyncio.to_thread(f.write, chunk)
+
+        sha256 = digest.hexdigest()
+        await asyncio.to_thread(_commit_tmp, tmp_path, sha256)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return sha256, size
+
+
+async def save_bytes(raw: bytes):
+    async def one_chunk():
+        yield raw
+
+    return await save_stream(one_chunk())
+
+
+def decode_data_url(file_data: str):
+    """
+    Split a browser data URL (data:<mime>;base64,<body>) or bare base64
+    string into (raw_bytes, content_type). Raises ValueError (binascii.Error
+    is one) on anything else.
+    """
+    content_type = "application/octet-stream"
+    encoded = file_data
+
+    match = re.match(r"data:([^;,]+)?(;base64)?,", file_data)
+    if match:
+        content_type = match.group(1) or content_type
+        encoded = file_data[match.end():]
+
+    return base64.b64decode(encoded, validate=True), content_type
+
+
+def content_disposition(name: str, content_type: str):
+    """Content-Disposition for serving a stored file back to the browser."""
+    disposition = "inline" if content_type in INLINE_CONTENT_TYPES else "attachment"
+    name = name or "file"
+
+    # Plain ASCII fallback, plus the exact name for browsers that read filename*
+    fallback = re.sub(r'[^A-Za-z0-9._ -]', "_", name).strip() or "file"
+    return f"{disposition}; filename=\"{fallback}\"; filename*=UTF-8''{quote(name, safe='')}"
+
+
+def delete_blob(sha256: str):
+    path = blob_path(sha256)
+    if os.path.exists(path):
+        os.remove(path)
+
+
+# ---------------------------
+# READ
+# ---------------------------
+def parse_range(header: str, size: int):
+    """
+    Parse a single "bytes=start-end" Range header.
+    Returns (start, end) inclusive, None when absent/unsupported, or
+    raises ValueError when the range cannot be satisfied.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+
+    start_str, _, end_str = header[len("bytes="):].strip().partition("-")
+
+    if start_str == "":
+        # Suffix range: last N bytes
+        length = int(end_str)
+        if length <= 0:
+            raise ValueError("Unsatisfiable range")
+        return max(size - length, 0), size - 1
+
+    start = int(start_str)
+    end = int(end_str) if end_str else size - 1
+    end = min(end, size - 1)
+
+    if start > end or start >= size:
+        raise ValueError("Unsatisfiable range")
+
+    return start, end
+
+
+async def iter_blob(sha256: str, start: int = 0, end: int = None):
+    """Yield the bytes of a blob between start and end (inclusive)."""
+    path = blob_path(sha256)
+    if end is None:
+        end = os.path.getsize(path) - 1
+
+    remaining = end - start + 1
+    with open(path, "rb") as f:
+        f.seek(start)
+        while remaining > 0:
+            chunk = await asyncio.to_thread(f.read, min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
@@ -0,0 +1,160 @@
+# FILE: app/utils/llm_client.py
+#
+# Chat-completions client for the AI summary. One httpx.AsyncClient is
+# created in the app lifespan and shared, so calls reuse pooled
+# keep-alive connections instead of a new TLS handshake each time.
+#
+# Failed connections, timeouts and 429/5xx answers are retried with
+# backoff; a stream is only retried before its first token arrives.
+
+import asyncio
+import json
+import os
+
+import httpx
+
+# No default: without a key the AI summary answers 503
+GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+# Point at mock_llm.py for local testing: http://localhost:9000/v1/chat/completions
+GROQ_API_URL = os.getenv("GROQ_API_URL", "https://api.groq.com/openai/v1/chat/completions")
+GROQ_MODEL = os.getenv("GROQ_MODEL", "llama-3.1-8b-instant")  # ✔ ACTIVE MODEL
+
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", "5"))
+# Longest gap between bytes; a streamed answer may take longer in total
+LLM_READ_TIMEOUT = float(os.getenv("LLM_READ_TIMEOUT", "60"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_RETRY_BASE_SECONDS = float(os.getenv("LLM_RETRY_BASE_SECONDS", "0.5"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+_client = None
+
+
+class LLMError(Exception):
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+# ---------------------------
+# CLIENT (lifespan)
+# ---------------------------
+def start_llm_client():
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(LLM_READ_TIMEOUT, connect=LLM_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=LLM_MAX_CONNECTIONS,
+            ),
+            headers={"Authorization": f"Bearer {GROQ_API_KEY}"} if GROQ_API_KEY else {},
+        )
+    return _client
+
+
+async def close_llm_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_llm_client():
+    if not GROQ_API_KEY:
+        raise LLMError(503, "AI summary is not configured (GROQ_API_KEY is not set)")
+    # Started by the lifespan; scripts get one on first use
+    return _client or start_llm_client()
+
+
+# ---------------------------
+# RETRIES
+# ---------------------------
+def _retry_delay(attempt: int, response: httpx.Response = None):
+    if response is not None:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return float(retry_after)
+    return LLM_RETRY_BASE_SECONDS * (2 ** attempt)
+
+
+def _payload(prompt: str, stream: bool = False):
+    data = {
+        "model": GROQ_MODEL,
+        "messages": [
+            {"role": "user", "content": prompt}
+        ]
+    }
+    if stream:
+        data["stream"] = True
+    return data
+
+
+# ---------------------------
+# CALLS
+# ---------------------------
+async def chat_completion(prompt: str):
+    """Full reply text for `prompt`."""
+    client = get_llm_client()
+
+    for attempt in range(LLM_MAX_RETRIES + 1):
+        last = attempt == LLM_MAX_RETRIES
+        try:
+            response = await client.post(GROQ_API_URL, json=_payload(prompt))
+        except httpx.TransportError as e:
+            if last:
+                raise LLMError(504, f"LLM unreachable: {e}")
+            await asyncio.sleep(_retry_delay(attempt))
+            continue
+
+        if response.status_code in RETRY_STATUSES and not last:
+            await asyncio.sleep(_retry_delay(attempt, response))
+            continue
+
+        if response.status_code != 200:
+            print("Groq Error:", response.status_code, response.text)
+            raise LLMError(502, f"Groq Error: {response.text}")
+
+        return response.json()["choices"][0]["message"]["content"]
+
+
+async def stream_chat_completion(prompt: str):
+    """Async iterator over the reply's text deltas, as they are generated."""
+    client = get_llm_client()
+
+    for attempt in range(LLM_MAX_RETRIES + 1):
+        last = attempt == LLM_MAX_RETRIES
+        started = False
+        try:
+            async with client.stream("POST", GROQ_API_URL, json=_payload(prompt, stream=True)) as response:
+                if response.status_code in RETRY_STATUSES and not last:
+                    await asyncio.sleep(_retry_delay(attempt, response))
+                    continue
+
+                if response.status_code != 200:
+                    body = (await response.aread()).decode(errors="replace")
+                    print("Groq Error:", response.status_code, body)
+                    raise LLMError(502, f"Groq Error: {body}")
+
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        return
+
+                    chunk = json.loads(data)
+                    choices = chunk.get("choices") or [{}]
+                    delta = choices[0].get("delta", {}).get("content")
+                    if delta:
+                        started = True
+                        yield delta
+                return
+
+        except httpx.TransportError as e:
+            # Once text has reached the client a retry would repeat it
+            if started or last:
+                raise LLMError(504, f"LLM stream failed: {e}")
+            await asyncio.sleep(_retry_delay(attempt))
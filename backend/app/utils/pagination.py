@@ -0,0 +1,59 @@
+# FILE: app/utils/pagination.py
+#
+# Opaque keyset cursors: the last row's sort values, JSON encoded and
+# base64'd so clients treat them as tokens rather than query parameters.
+
+import base64
+import json
+
+from bson.objectid import ObjectId
+from fastapi import HTTPException
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(values: dict):
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if not isinstance(values, dict):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    return values
+
+
+def keyset_filter(field: str, value, last_id: str, descending: bool = False):
+    """
+    Match rows strictly after (value, last_id) in (field, _id) order.
+    Pass field="_id" to page on _id alone.
+    """
+    try:
+        oid = ObjectId(last_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    op = "$lt" if descending else "$gt"
+
+    if field == "_id":
+        return {"_id": {op: oid}}
+
+    if value is None:
+        # Missing values sort first; $gt/$lt never match null
+        same = {field: None, "_id": {op: oid}}
+        return same if descending else {"$or": [{field: {"$ne": None}}, same]}
+
+    return {
+        "$or": [
+            {field: {op: value}},
+            {field: value, "_id": {op: oid}},
+        ]
+    }
@@ -0,0 +1,144 @@
+# FILE: app/utils/pdf_report.py
+#
+# Multi-page task report. Rendering is CPU-bound, so it runs in a small
+# process pool instead of on the API worker's event loop.
+
+import asyncio
+import multiprocessing
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from io import BytesIO
+
+REPORT_WORKERS = int(os.getenv("REPORT_WORKERS", "2"))
+REPORT_SECTIONS = ("status", "priority")
+
+STATUS_LABELS = {
+    "todo": "To Do",
+    "inprogress": "In Progress",
+    "completed": "Completed",
+    "blocked": "Blocked",
+}
+
+_pool = None
+
+
+# ---------------------------
+# PROCESS POOL
+# ---------------------------
+def get_report_pool():
+    global _pool
+    if _pool is None:
+        # spawn, not fork: a forked child would inherit the event loop,
+        # Motor's sockets and the lock state of the other threads
+        _pool = ProcessPoolExecutor(
+            max_workers=REPORT_WORKERS, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _pool
+
+
+def shutdown_report_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+# ---------------------------
+# RENDERING (runs in a worker process)
+# ---------------------------
+def _summary_table(title, counts, styles):
+    from reportlab.platypus import Paragraph, Table, TableStyle, Spacer
+    from reportlab.lib import colors
+
+    data = [[title, "Tasks"]] + [[name, str(n)] for name, n in counts]
+    table = Table(data, colWidths=[200, 80], hAlign="LEFT")
+    table.setStyle(TableStyle([
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#E2F1E7")),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
+        ("ALIGN", (1, 0), (1, -1), "RIGHT"),
+    ]))
+
+    return [Paragraph(title, styles["Heading2"]), table, Spacer(1, 12)]
+
+
+def render_task_report(rows: list, sections: tuple = ()):
+    """
+    Build the PDF for `rows` of (title, priority, status, date) tuples.
+    Returns the document bytes.
+    """
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import (
+        SimpleDocTemplate, Paragraph, Table, TableStyle, Spacer
+    )
+    from xml.sax.saxutils import escape
+
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(
+        buffer, pagesize=A4, title="Task Report",
+        leftMargin=40, rightMargin=40, topMargin=40, bottomMargin=40
+    )
+    styles = getSampleStyleSheet()
+    cell = styles["BodyText"]
+
+    story = [
+        Paragraph("Task Report", styles["Title"]),
+        Paragraph(f"{len(rows)} tasks · generated {datetime.now():%Y-%m-%d %H:%M}", styles["Normal"]),
+        Spacer(1, 16),
+    ]
+
+    if "status" in sections:
+        counts = Counter(STATUS_LABELS.get(r[2], "To Do") for r in rows)
+        story += _summary_table(
+            "Status", [(label, counts[label]) for label in STATUS_LABELS.values()], styles
+        )
+
+    if "priority" in sections:
+        counts = Counter(r[1] for r in rows)
+        story += _summary_table(
+            "Priority", [(p, counts[p]) for p in ("High", "Medium", "Low")], styles
+        )
+
+    data = [["Title", "Priority", "Status", "Due"]]
+    for title, priority, status, date in rows:
+        data.append([
+            Paragraph(escape(title or ""), cell),
+            priority or "",
+            STATUS_LABELS.get(status, status or ""),
+            date or "",
+        ])
+
+    # repeatRows keeps the header on every page; rows split across pages
+    table = Table(data, colWidths=[265, 70, 90, 90], repeatRows=1)
+    table.setStyle(TableStyle([
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#E2F1E7")),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+        ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
+        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#F7F7F7")]),
+    ]))
+    story.append(table)
+
+    def page_number(canvas, doc):
+        canvas.setFont("Helvetica", 8)
+        canvas.drawRightString(A4[0] - 40, 20, f"Page {doc.page}")
+
+    doc.build(story, onFirstPage=page_number, onLaterPages=page_number)
+    return buffer.getvalue()
+
+
+# ---------------------------
+# ASYNC ENTRY POINT
+# ---------------------------
+async def render_report(rows: list, sections: tuple = ()):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_report_pool(), render_task_report, rows, sections)
+
+
+def iter_bytes(data: bytes, chunk_size: int = 64 * 1024):
+    for start in range(0, len(data), chunk_size):
+        yield data[start:start + chunk_size]
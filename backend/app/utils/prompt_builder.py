@@ -0,0 +1,176 @@
+# FILE: app/utils/prompt_builder.py
+#
+# Builds the AI summary prompt from a task list of any length. Tasks are
+# streamed through PromptCompactor.add(), which keeps only running counts
+# and a few bounded samples, so the prompt (and the memory used to build
+# it) stays the same size whether a user has ten tasks or ten thousand:
+#
+#   - counts by status and priority
+#   - open overdue tasks bucketed by how late they are
+#   - the oldest overdue items
+#   - a sample of titles from every (status, priority) group, added
+#     until PROMPT_TOKEN_BUDGET is reached
+#
+# Sampling is deterministic (by a hash of title and id), so an unchanged task set
+# gives a byte-identical prompt and the summary cache keeps hitting.
+
+import heapq
+import os
+import zlib
+from datetime import date
+
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "1500"))
+PROMPT_STALLED_ITEMS = int(os.getenv("PROMPT_STALLED_ITEMS", "5"))
+PROMPT_SAMPLE_PER_GROUP = int(os.getenv("PROMPT_SAMPLE_PER_GROUP", "25"))
+PROMPT_TITLE_CHARS = 80
+
+STATUSES = ("todo", "inprogress", "completed", "blocked")
+PRIORITIES = ("High", "Medium", "Low")
+OVERDUE_BUCKETS = ((7, "1-7 days"), (30, "8-30 days"), (None, "over 30 days"))
+
+INSTRUCTIONS = """Analyze these tasks and provide:
+1) A short productivity summary
+2) Weak areas / what to improve
+3) Actionable suggestions"""
+
+
+def estimate_tokens(text: str):
+    # ~4 characters per token for English text; close enough for budgeting
+    return (len(text) + 3) // 4
+
+
+def _title(task):
+    title = " ".join((task.get("title") or "Untitled").split())
+    if len(title) > PROMPT_TITLE_CHARS:
+        title = title[:PROMPT_TITLE_CHARS - 1] + "…"
+    return title
+
+
+def _rank(task):
+    # Stable pseudo-random order, independent of the order tasks arrive in
+    return zlib.crc32(f"{_title(task)}\x00{task.get('_id', '')}".encode())
+
+
+def _task_line(task, due: bool = False):
+    line = f"- {_title(task)} | Priority: {task.get('priority')} | Status: {task.get('status')}"
+    if due:
+        line += f" | Due: {task.get('date')}"
+    return line
+
+
+class PromptCompactor:
+    """Streaming summary of a task list; add() every task, then build()."""
+
+    def __init__(self, today: date = None):
+        self.today = today or date.today()
+        self.today_str = self.today.isoformat()
+        self.total = 0
+        self.status = dict.fromkeys(STATUSES, 0)
+        self.priority = dict.fromkeys(PRIORITIES, 0)
+        self.overdue = dict.fromkeys([label for _, label in OVERDUE_BUCKETS], 0)
+        self._stalled = []   # (-due ordinal, -rank, seq, task); root is the newest kept
+        self._groups = {}    # (status, priority) -> [count, heap of (-rank, seq, task)]
+        self._seq = 0
+
+    def add(self, task: dict):
+        self.total += 1
+        self._seq += 1
+
+        # Missing or unknown values count as To Do / Low, as in the analytics
+        status = task.get("status") if task.get("status") in STATUSES else "todo"
+        priority = task.get("priority") if task.get("priority") in PRIORITIES else "Low"
+        self.status[status] += 1
+        self.priority[priority] += 1
+
+        rank = _rank(task)
+        if status != "completed":
+            self._add_overdue(task, rank)
+
+        # Keep the PROMPT_SAMPLE_PER_GROUP lowest-ranked tasks of each group
+        group = self._groups.setdefault((status, priority), [0, []])
+        group[0] += 1
+        entry = (-rank, self._seq, task)
+        if len(group[1]) < PROMPT_SAMPLE_PER_GROUP:
+            heapq.heappush(group[1], entry)
+        elif entry[:1] > group[1][0][:1]:
+            heapq.heapreplace(group[1], entry)
+
+    def _add_overdue(self, task: dict, rank: int):
+        due_str = task.get("date") or ""
+        if not due_str or due_str >= self.today_str:
+            return
+        try:
+            due = date.fromisoformat(due_str)
+        except ValueError:
+            return
+
+        late = (self.today - due).days
+        for limit, label in OVERDUE_BUCKETS:
+            if limit is None or late <= limit:
+                self.overdue[label] += 1
+                break
+
+        entry = (-due.toordinal(), -rank, self._seq, task)
+        if len(self._stalled) < PROMPT_STALLED_ITEMS:
+            heapq.heappush(self._stalled, entry)
+        elif entry[:2] > self._stalled[0][:2]:
+            heapq.heapreplace(self._stalled, entry)
+
+    # ---------------------------
+    # OUTPUT
+    # ---------------------------
+    def _overview(self):
+        status = ", ".join(f"{s} {n}" for s, n in self.status.items())
+        priority = ", ".join(f"{p} {n}" for p, n in self.priority.items())
+        overdue = ", ".join(f"{label}: {n}" for label, n in self.overdue.items())
+        return [
+            f"Overview ({self.total} tasks, today is {self.today_str}):",
+            f"- Status: {status}",
+            f"- Priority: {priority}",
+            f"- Open and overdue: {overdue}",
+        ]
+
+    def _stalled_lines(self):
+        if not self._stalled:
+            return []
+        oldest = sorted(self._stalled, key=lambda e: (-e[0], -e[1]))
+        return ["", "Oldest overdue tasks:"] + [_task_line(e[3], due=True) for e in oldest]
+
+    def _sample(self):
+        """Round-robin over groups, largest first, so every group is represented."""
+        groups = sorted(self._groups.items(), key=lambda item: (-item[1][0], item[0]))
+        queues = [sorted(g[1], key=lambda e: -e[0]) for _, g in groups]
+
+        depth = 0
+        while True:
+            row = [q[depth][2] for q in queues if depth < len(q)]
+            if not row:
+                return
+            yield from row
+            depth += 1
+
+    def build(self, budget: int = PROMPT_TOKEN_BUDGET):
+        lines = [INSTRUCTIONS, ""] + self._overview() + self._stalled_lines()
+        used = estimate_tokens("\n".join(lines))
+
+        sample = []
+        for task in self._sample():
+            line = _task_line(task)
+            cost = estimate_tokens(line) + 1
+            if used + cost > budget:
+                break
+            sample.append(line)
+            used += cost
+
+        if sample:
+            shown = "all" if len(sample) == self.total else f"{len(sample)} of {self.total}"
+            lines += ["", f"Tasks ({shown}):"] + sample
+
+        return "\n".join(lines)
+
+
+def build_summary_prompt(tasks, today: date = None, budget: int = PROMPT_TOKEN_BUDGET):
+    compactor = PromptCompactor(today)
+    for task in tasks:
+        compactor.add(task)
+    return compactor.build(budget)
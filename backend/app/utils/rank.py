@@ -0,0 +1,98 @@
+# FILE: app/utils/rank.py
+#
+# Fractional indexing for card order within a Kanban column. A rank is a
+# base-62 fraction written without the leading "0." and without trailing
+# zeros, so plain string comparison (and a Mongo index) orders ranks by
+# value, and there is always another rank between any two:
+#
+#   rank_between(None, None)  -> "V"
+#   rank_between("V", None)   -> "k"
+#   rank_between("V", "W")    -> "VV"
+#   rank_after("k")           -> "s" plus a random tail, e.g. "s7Qa2"
+#
+# Moving a card therefore rewrites only that card. Keys grow by about one
+# character per repeated insert at the same spot; past RANK_MAX_LENGTH
+# the column is re-spread (see task_model.rebalance_column).
+
+import math
+import os
+import random
+
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+RANK_MAX_LENGTH = int(os.getenv("RANK_MAX_LENGTH", "24"))
+
+_VALUE = {d: i for i, d in enumerate(DIGITS)}
+
+
+def is_valid_rank(rank) -> bool:
+    return (
+        isinstance(rank, str)
+        and rank != ""
+        and not rank.endswith("0")
+        and all(c in _VALUE for c in rank)
+    )
+
+
+def _midpoint(a: str, b: str = None):
+    """A key strictly between fractions a and b (b=None means 1)."""
+    if b is not None:
+        # Copy the common prefix (a is padded with zeros)
+        n = 0
+        while n < len(b) and (a[n] if n < len(a) else "0") == b[n]:
+            n += 1
+        if n:
+            return b[:n] + _midpoint(a[n:], b[n:])
+
+    da = _VALUE[a[0]] if a else 0
+    db = _VALUE[b[0]] if b is not None else BASE
+
+    if db - da > 1:
+        return DIGITS[(da + db) // 2]
+
+    # Adjacent first digits
+    if b is not None and len(b) > 1:
+        return b[0]
+    return DIGITS[da] + _midpoint(a[1:], None)
+
+
+def rank_between(before: str = None, after: str = None):
+    """
+    A rank sorting after `before` and before `after`; None leaves that
+    side open (start / end of the column).
+    """
+    if before is not None and after is not None and before >= after:
+        raise ValueError(f"rank_between: {before!r} >= {after!r}")
+    return _midpoint(before or "", after)
+
+
+def rank_after(last: str = None):
+    """
+    A rank for appending after `last` (the column's tail). Requests
+    appending at once read the same tail; a random four-digit tail keeps
+    their ranks apart, so the cards still have a definite order.
+    """
+    return (
+        rank_between(last, None)
+        + "".join(random.choice(DIGITS) for _ in range(3))
+        + random.choice(DIGITS[1:])  # no trailing zero
+    )
+
+
+def spread_ranks(count: int):
+    """`count` evenly spaced, equally short ranks in ascending order."""
+    if count <= 0:
+        return []
+
+    width = max(1, math.ceil(math.log(count + 1, BASE)))
+    span = BASE ** width
+
+    ranks = []
+    for i in range(1, count + 1):
+        value = span * i // (count + 1)
+        digits = []
+        for _ in range(width):
+            value, d = divmod(value, BASE)
+            digits.append(DIGITS[d])
+        ranks.append("".join(reversed(digits)).rstrip("0"))
+    return ranks
@@ -0,0 +1,544 @@
+# FILE: app/utils/reminder_scheduler.py
+#
+# In-process reminder scheduler. Every user with open tasks has one entry
+# in a min-heap keyed by the next time a reminder email is due for them:
+# the day before a task is due, and every day once it is overdue. The
+# time of day is a per-user slot spread over REMINDER_WINDOW_START..END
+# in the user's timezone, so the outbox sees a steady trickle instead of
+# one daily spike.
+#
+# Task routes call touch(user_id) after a change; the entry is recomputed
+# in the background and replaced (stale heap entries are skipped when
+# popped).
+#
+# Users are sharded by crc32(user_id) % REMINDER_SHARDS. A process only
+# schedules a shard while it holds that shard's lease in reminder_runs,
+# renewed every REMINDER_LEASE_SECONDS / 3, so `uvicorn --workers N`
+# never runs two schedulers for one shard and a dead worker's shard is
+# taken over once its lease expires. With REMINDER_SHARD=auto (default)
+# a process claims the first free shard; set REMINDER_SHARDS to the
+# worker count to spread the work, or REMINDER_SHARD=<n> to pin one.
+# A worker only sees touches for its own requests, so each shard also
+# catches up every REMINDER_RESYNC_SECONDS, rescheduling just the users
+# whose tasks were written (tasks.updated_at) or deleted (tombstones'
+# deleted_at) since the last sync. The full walk of the users collection
+# only runs when a shard is gained.
+#
+# The clock is injectable: pass VirtualClock() and advance() it to drive
+# the scheduler in tests without waiting.
+
+import asyncio
+import heapq
+import itertools
+import os
+import socket
+import uuid
+import zlib
+from datetime import date, datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from bson.objectid import ObjectId
+from pymongo.errors import DuplicateKeyError
+
+from app.database import (
+    users_collection,
+    tasks_collection,
+    task_tombstones_collection,
+    reminder_runs_collection,
+)
+from app.models.email_outbox_model import enqueue_email
+
+REMINDER_SCHEDULER = os.getenv("REMINDER_SCHEDULER", "true").lower() == "true"
+REMINDER_SHARD = os.getenv("REMINDER_SHARD", "auto")
+REMINDER_SHARDS = int(os.getenv("REMINDER_SHARDS", "1"))
+REMINDER_LEASE_SECONDS = int(os.getenv("REMINDER_LEASE_SECONDS", "120"))
+REMINDER_TIMEZONE = os.getenv("REMINDER_TIMEZONE", "Asia/Kolkata")
+# Local hours between which reminders are sent
+REMINDER_WINDOW_START = int(os.getenv("REMINDER_WINDOW_START", "8"))
+REMINDER_WINDOW_END = int(os.getenv("REMINDER_WINDOW_END", "20"))
+REMINDER_RESYNC_SECONDS = int(os.getenv("REMINDER_RESYNC_SECONDS", "3600"))
+REMINDER_LOAD_BATCH = 500
+# Seconds each resync looks back past the previous one, for writes
+# stamped by another server's clock or committed while it ran
+REMINDER_RESYNC_SLACK = 60
+# Tasks listed per section; the rest are summarised as "...and N more"
+REMINDER_MAX_ITEMS = int(os.getenv("REMINDER_MAX_ITEMS", "50"))
+
+REMINDER_SUBJECT = "Task Reminders: Overdue & Upcoming"
+
+
+# ---------------------------
+# CLOCKS
+# ---------------------------
+class SystemClock:
+    def now(self):
+        return datetime.now(timezone.utc)
+
+    async def sleep(self, seconds: float):
+        await asyncio.sleep(seconds)
+
+
+class VirtualClock:
+    """Time only moves when advance() is called."""
+
+    def __init__(self, start: datetime = None):
+        self._now = start or datetime(2024, 1, 1, tzinfo=timezone.utc)
+        self._sleepers = []  # (deadline, future)
+
+    def now(self):
+        return self._now
+
+    async def sleep(self, seconds: float):
+        future = asyncio.get_running_loop().create_future()
+        self._sleepers.append((self._now + timedelta(seconds=seconds), future))
+        await future
+
+    async def advance(self, seconds: float):
+        """Move time forward, wake due sleepers and let them run."""
+        self._now += timedelta(seconds=seconds)
+
+        waiting = []
+        for deadline, future in self._sleepers:
+            if future.done():
+                continue
+            if deadline <= self._now:
+                future.set_result(None)
+            else:
+                waiting.append((deadline, future))
+        self._sleepers = waiting
+
+        # Yield a few times so woken tasks reach their next await
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+
+# ---------------------------
+# SCHEDULE MATH
+# ---------------------------
+def shard_of(user_id: str, shards: int = REMINDER_SHARDS):
+    return zlib.crc32(user_id.encode()) % shards
+
+
+def user_timezone(name: str = None):
+    try:
+        return ZoneInfo(name or REMINDER_TIMEZONE)
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo(REMINDER_TIMEZONE)
+
+
+def reminder_slot(user_id: str):
+    """Seconds after local midnight at which this user's reminder goes out."""
+    start = REMINDER_WINDOW_START * 3600
+    width = max((REMINDER_WINDOW_END - REMINDER_WINDOW_START) * 3600, 1)
+    # Different salt from shard_of so every shard gets the whole window
+    return start + zlib.crc32(b"slot:" + user_id.encode()) % width
+
+
+def next_reminder_day(dates, from_day: date):
+    """
+    First day on or after from_day that needs a reminder, given the due
+    dates of a user's open tasks: the day before each date, and every
+    day after it. None if there is nothing to remind about.
+    """
+    best = None
+    for value in dates:
+        try:
+            due = date.fromisoformat(value)
+        except (TypeError, ValueError):
+            continue
+
+        if from_day < due:
+            day = max(from_day, due - timedelta(days=1))
+        elif from_day == due:
+            day = due + timedelta(days=1)
+        else:
+            day = from_day
+
+        if best is None or day < best:
+            best = day
+    return best
+
+
+def fire_time(user_id: str, day: date, tz):
+    local = datetime.combine(day, time(0), tzinfo=tz) + timedelta(seconds=reminder_slot(user_id))
+    return local.astimezone(timezone.utc)
+
+
+# ---------------------------
+# EMAIL CONTENT (shared with cron_overdue.py)
+# ---------------------------
+def _more(lines: list, total: int):
+    if total > REMINDER_MAX_ITEMS:
+        lines.append(f"  …and {total - REMINDER_MAX_ITEMS} more")
+
+
+def build_reminder_body(name: str, overdue_tasks: list, upcoming_tasks: list, tomorrow_str: str):
+    lines = []
+    lines.append(f"Hi {name},")
+    lines.append("")
+    lines.append("Here are your task reminders from Task Manager:")
+    lines.append("")
+
+    if overdue_tasks:
+        lines.append("🔴 Overdue tasks:")
+        for t in overdue_tasks[:REMINDER_MAX_ITEMS]:
+            title = t.get("title", "Untitled")
+            date = t.get("date", "N/A")
+            priority = t.get("priority", "N/A")
+            lines.append(f"  • {title}  (Due: {date}, Priority: {priority})")
+        _more(lines, len(overdue_tasks))
+        lines.append("")
+
+    if upcoming_tasks:
+        lines.append(f"🟡 Tasks due tomorrow ({tomorrow_str}):")
+        for t in upcoming_tasks[:REMINDER_MAX_ITEMS]:
+            title = t.get("title", "Untitled")
+            priority = t.get("priority", "N/A")
+            lines.append(f"  • {title}  (Priority: {priority})")
+        _more(lines, len(upcoming_tasks))
+        lines.append("")
+
+    lines.append("Please open the app to update or complete these tasks. ✅")
+    return "\n".join(lines)
+
+
+# ---------------------------
+# SCHEDULER
+# ---------------------------
+class ReminderScheduler:
+    """
+    Due-time heap for this shard's users plus the loop that sleeps until
+    the earliest entry, fires it and reschedules that user.
+    """
+
+    def __init__(self, clock=None, shard: int = None, shards: int = REMINDER_SHARDS):
+        self.clock = clock or SystemClock()
+        if shard is None and REMINDER_SHARD != "auto":
+            shard = int(REMINDER_SHARD)
+        self.shard = shard    # None: claim whichever shard is free
+        self.shards = shards
+        self.held = None      # the shard whose lease this process holds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._heap = []       # (fire_at, seq, user_id); may hold stale entries
+        self._entries = {}    # user_id -> (fire_at, seq), the live entry
+        self._sent = {}       # user_id -> local day of the last reminder
+        self._synced_at = None  # utcnow() when the last load/resync started
+        self._seq = itertools.count()
+        self._touching = {}   # user_id -> touched again while recomputing
+        self._background = set()
+        self._wakeup = None
+        self._task = None
+        self._stopping = False
+
+    # ---- lifecycle ----
+    def start(self):
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await asyncio.gather(self._task, *self._background, return_exceptions=True)
+        self._task = None
+        try:
+            await self._release()
+        except Exception as e:
+            print("Reminder Lease Error:", e)
+
+    def owns(self, user_id: str):
+        return self.held is not None and shard_of(user_id, self.shards) == self.held
+
+    # ---- shard leases ----
+    def _lease_key(self, shard: int):
+        return f"scheduler:{shard}/{self.shards}"
+
+    async def _claim(self, shard: int):
+        """Take or renew a shard's lease; False if another process holds it."""
+        now = self.clock.now()
+        try:
+            await reminder_runs_collection.update_one(
+                {"_id": self._lease_key(shard),
+                 "$or": [{"owner": self.owner}, {"expires_at": {"$lt": now}}]},
+                {"$set": {"owner": self.owner,
+                          "expires_at": now + timedelta(seconds=REMINDER_LEASE_SECONDS)}},
+                upsert=True
+            )
+        except DuplicateKeyError:
+            return False
+        return True
+
+    async def _acquire(self):
+        if self.held is not None:
+            return self.held if await self._claim(self.held) else None
+        for shard in range(self.shards) if self.shard is None else [self.shard]:
+            if await self._claim(shard):
+                return shard
+        return None
+
+    async def _release(self):
+        if self.held is not None:
+            await reminder_runs_collection.delete_one(
+                {"_id": self._lease_key(self.held), "owner": self.owner}
+            )
+            self.held = None
+
+    def pending(self):
+        return len(self._entries)
+
+    def next_fire(self, user_id: str):
+        entry = self._entries.get(user_id)
+        return entry[0] if entry else None
+
+    # ---- heap ----
+    def _schedule(self, user_id: str, fire_at):
+        if fire_at is None:
+            self._entries.pop(user_id, None)
+            return
+
+        entry = (fire_at, next(self._seq))
+        self._entries[user_id] = entry
+        heapq.heappush(self._heap, (fire_at, entry[1], user_id))
+
+        if self._wakeup is not None and self._heap[0][2] == user_id:
+            self._wakeup.set()  # new earliest event: re-arm the sleep
+
+    def _compute(self, user_id: str, dates, tz):
+        today = self.clock.now().astimezone(tz).date()
+        from_day = today + timedelta(days=1) if self._sent.get(user_id) == today else today
+
+        day = next_reminder_day(dates, from_day)
+        return fire_time(user_id, day, tz) if day else None
+
+    # ---- updates ----
+    def touch(self, user_id: str):
+        """
+        Recompute a user's next reminder after their tasks changed, in the
+        background so the request does not wait. Touches that arrive while
+        one is running are folded into a single re-run.
+        """
+        if self._task is None or not self.owns(user_id):
+            return
+
+        if user_id in self._touching:
+            self._touching[user_id] = True
+            return
+
+        self._touching[user_id] = False
+        task = asyncio.create_task(self._touch(user_id))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _touch(self, user_id: str):
+        try:
+            while True:
+                await self.refresh(user_id)
+                if not self._touching.get(user_id):
+                    return
+                self._touching[user_id] = False
+        finally:
+            self._touching.pop(user_id, None)
+
+    async def refresh(self, user_id: str):
+        """touch(), awaited."""
+        try:
+            dates = await tasks_collection.distinct(
+                "date", {"user_id": user_id, "status": {"$ne": "completed"}}
+            )
+            tz = await self._user_tz(user_id)
+            self._schedule(user_id, self._compute(user_id, dates, tz))
+        except Exception as e:
+            # The periodic resync will pick the change up
+            print("Reminder Schedule Error:", e)
+
+    async def _user_tz(self, user_id: str):
+        try:
+            user = await users_collection.find_one({"_id": ObjectId(user_id)}, {"timezone": 1})
+        except Exception:
+            user = None
+        return user_timezone((user or {}).get("timezone"))
+
+    async def load(self):
+        """
+        Rebuild the heap (when a shard is gained). Walks the users collection
+        and fetches open-task dates a batch of this shard's users at a
+        time, so the tasks side is served by the (user_id, status, ...)
+        index instead of scanning every task.
+        """
+        started = datetime.utcnow()
+        schedule = {}
+        chunk = {}
+        async for user in users_collection.find({}, {"timezone": 1}, batch_size=REMINDER_LOAD_BATCH):
+            user_id = str(user["_id"])
+            if self.owns(user_id):
+                chunk[user_id] = user.get("timezone")
+            if len(chunk) >= REMINDER_LOAD_BATCH:
+                await self._load_chunk(chunk, schedule)
+                chunk = {}
+        if chunk:
+            await self._load_chunk(chunk, schedule)
+
+        self._heap = []
+        self._entries = {}
+        for user_id, fire_at in schedule.items():
+            self._schedule(user_id, fire_at)
+
+        self._synced_at = started
+        self._prune_sent()
+        print(f"[REMINDERS] Shard {self.held}/{self.shards}: {len(self._entries)} users scheduled")
+
+    async def resync(self):
+        """
+        Catch up with writes other workers served: reschedule only the
+        users whose tasks changed since the last load/resync. Falls back
+        to load() when there has been none for this shard.
+        """
+        if self._synced_at is None:
+            return await self.load()
+
+        started = datetime.utcnow()
+        since = self._synced_at - timedelta(seconds=REMINDER_RESYNC_SLACK)
+        changed = set(await tasks_collection.distinct("user_id", {"updated_at": {"$gt": since}}))
+        changed |= set(await task_tombstones_collection.distinct("user_id", {"deleted_at": {"$gt": since}}))
+        owned = [u for u in changed if self.owns(u) and ObjectId.is_valid(u)]
+
+        for i in range(0, len(owned), REMINDER_LOAD_BATCH):
+            batch = [ObjectId(u) for u in owned[i:i + REMINDER_LOAD_BATCH]]
+            zones = {
+                str(user["_id"]): user.get("timezone")
+                async for user in users_collection.find({"_id": {"$in": batch}}, {"timezone": 1})
+            }
+            schedule = dict.fromkeys(zones)  # no open tasks left: unscheduled
+            await self._load_chunk(zones, schedule)
+            for user_id, fire_at in schedule.items():
+                self._schedule(user_id, fire_at)
+
+        self._synced_at = started
+        self._prune_sent()
+
+    def _prune_sent(self):
+        # Only an entry for the user's local today matters (see _compute);
+        # a day's slack covers every timezone
+        oldest = self.clock.now().date() - timedelta(days=1)
+        self._sent = {u: day for u, day in self._sent.items() if day >= oldest}
+
+    async def _load_chunk(self, zones: dict, schedule: dict):
+        groups = tasks_collection.aggregate([
+            {"$match": {"user_id": {"$in": list(zones)}, "status": {"$ne": "completed"}}},
+            {"$group": {"_id": "$user_id", "dates": {"$addToSet": "$date"}}},
+        ])
+        async for g in groups:
+            tz = user_timezone(zones[g["_id"]])
+            schedule[g["_id"]] = self._compute(g["_id"], g["dates"], tz)
+
+    # ---- firing ----
+    async def run_due(self):
+        """Send every reminder whose time has come. Returns how many fired."""
+        fired = 0
+        while self._heap and self._heap[0][0] <= self.clock.now():
+            fire_at, seq, user_id = heapq.heappop(self._heap)
+            if self._entries.get(user_id) != (fire_at, seq):
+                continue  # superseded by a later touch()
+            del self._entries[user_id]
+
+            try:
+                await self._fire(user_id, fire_at)
+                fired += 1
+            except Exception as e:
+                print("Reminder Error:", e)
+        return fired
+
+    async def _fire(self, user_id: str, fire_at):
+        user = await users_collection.find_one(
+            {"_id": ObjectId(user_id)}, {"email": 1, "name": 1, "timezone": 1}
+        )
+        if not user:
+            return
+
+        tz = user_timezone(user.get("timezone"))
+        # The day it was scheduled for, even if the loop runs a bit late
+        today = fire_at.astimezone(tz).date()
+        today_str = today.isoformat()
+        tomorrow_str = (today + timedelta(days=1)).isoformat()
+
+        tasks = await tasks_collection.find(
+            {
+                "user_id": user_id,
+                "status": {"$ne": "completed"},
+                "$or": [{"date": {"$lt": today_str}}, {"date": tomorrow_str}],
+            },
+            {"title": 1, "date": 1, "priority": 1},
+        ).sort("date", 1).to_list(length=None)
+
+        overdue_tasks = [t for t in tasks if t.get("date", "") < today_str]
+        upcoming_tasks = [t for t in tasks if t.get("date") == tomorrow_str]
+
+        if user.get("email") and (overdue_tasks or upcoming_tasks):
+            body = build_reminder_body(user.get("name", "there"), overdue_tasks, upcoming_tasks, tomorrow_str)
+            # Same key as cron_overdue.py: at most one reminder per user per day
+            await enqueue_email(user["email"], REMINDER_SUBJECT, body, f"reminder:{today_str}:{user_id}")
+
+        self._sent[user_id] = today
+        dates = await tasks_collection.distinct(
+            "date", {"user_id": user_id, "status": {"$ne": "completed"}}
+        )
+        self._schedule(user_id, self._compute(user_id, dates, tz))
+
+    async def _renew(self):
+        """Keep (or win, or lose) this process's shard lease."""
+        try:
+            held = await self._acquire()
+        except Exception as e:
+            print("Reminder Lease Error:", e)
+            return False
+
+        changed = held != self.held
+        self.held = held
+        if changed:
+            self._synced_at = None  # the next resync is a full load
+        if changed and held is None:
+            # Another process has the shard now
+            self._heap = []
+            self._entries = {}
+            self._sent = {}
+        return changed and held is not None
+
+    async def _run(self):
+        renew_every = timedelta(seconds=REMINDER_LEASE_SECONDS / 3)
+        next_renew = self.clock.now()
+        next_resync = None
+
+        while not self._stopping:
+            if self.clock.now() >= next_renew:
+                if await self._renew():
+                    next_resync = self.clock.now()  # new shard: load it now
+                next_renew = self.clock.now() + renew_every
+
+            if self.held is not None:
+                if next_resync is not None and self.clock.now() >= next_resync:
+                    try:
+                        await self.resync()
+                    except Exception as e:
+                        print("Reminder Load Error:", e)
+                    next_resync = self.clock.now() + timedelta(seconds=REMINDER_RESYNC_SECONDS)
+
+                await self.run_due()
+
+            wake_at = next_renew
+            if self.held is not None and next_resync is not None and next_resync < wake_at:
+                wake_at = next_resync
+            if self.held is not None and self._heap and self._heap[0][0] < wake_at:
+                wake_at = self._heap[0][0]
+            delay = max((wake_at - self.clock.now()).total_seconds(), 0)
+
+            self._wakeup.clear()
+            sleeper = asyncio.create_task(self.clock.sleep(delay))
+            waker = asyncio.create_task(self._wakeup.wait())
+            done, pending = await asyncio.wait({sleeper, waker}, return_when=asyncio.FIRST_COMPLETED)
+            for t in pending:
+                t.cancel()
+
+
+reminder_scheduler = ReminderScheduler()
@@ -0,0 +1,45 @@
+# FILE: app/utils/search.py
+#
+# Title normalisation for autocomplete. Each task stores the prefixes of
+# every word of its normalised title in `title_prefixes`, indexed with
+# user_id, so "as you type" lookups are an index equality match:
+#
+#   "Réview Q3 budget!" -> ["r", "re", "rev", ..., "q", "q3", "b", "bu", ...]
+#
+# Full-word relevance search uses the Mongo text index instead (see
+# task_model.search_tasks).
+
+import re
+import unicodedata
+
+PREFIX_MAX_CHARS = 20   # longer words are indexed up to this length
+PREFIX_MAX_WORDS = 32
+
+_NON_WORD = re.compile(r"[^0-9a-z]+")
+
+
+def normalize(text: str):
+    """Lowercase, strip accents, and reduce to space-separated [0-9a-z] words."""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return _NON_WORD.sub(" ", text.lower()).split()
+
+
+def title_prefixes(title: str):
+    prefixes = set()
+    for word in normalize(title)[:PREFIX_MAX_WORDS]:
+        word = word[:PREFIX_MAX_CHARS]
+        prefixes.update(word[:n] for n in range(1, len(word) + 1))
+    return sorted(prefixes)
+
+
+def query_prefixes(query: str):
+    """The prefixes a title must contain to match `query` (every word)."""
+    return [word[:PREFIX_MAX_CHARS] for word in normalize(query)[:PREFIX_MAX_WORDS]]
+
+
+def search_fields(data: dict):
+    """Derived fields to store alongside a task write that sets `title`."""
+    if "title" not in data:
+        return {}
+    return {"title_prefixes": title_prefixes(data["title"])}
@@ -0,0 +1,39 @@
+# FILE: backfill_sync_seq.py
+#
+# Stamps tasks written before delta sync existed with a change counter
+# value (see app/models/sync_model.py), so GET /tasks/changes returns
+# them. Safe to re-run; only tasks with neither seq nor a pending stamp
+# are touched. Run once after deploying delta sync, before clients start
+# syncing (a changes call racing the stamp of a user could skip tasks).
+#
+#   python backfill_sync_seq.py
+
+import asyncio
+
+from dotenv import load_dotenv
+load_dotenv()  # before the app imports, which read settings
+
+from app.database import tasks_collection
+from app.models.task_model import bump_task_seq
+
+UNSTAMPED = {"seq": {"$exists": False}, "sync_pending": {"$exists": False}}
+
+
+async def backfill_sync_seq():
+    user_ids = await tasks_collection.distinct("user_id", UNSTAMPED)
+
+    stamped = 0
+    for user_id in user_ids:
+        # One counter value per user is enough; pages break ties on _id
+        seq = await bump_task_seq(user_id)
+        result = await tasks_collection.update_many(
+            {"user_id": user_id, **UNSTAMPED},
+            {"$set": {"seq": seq}}
+        )
+        stamped += result.modified_count
+
+    print(f"[SYNC] Stamped {stamped} tasks for {len(user_ids)} users")
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill_sync_seq())
@@ -0,0 +1,50 @@
+# FILE: backfill_title_prefixes.py
+#
+# Fills title_prefixes (the autocomplete key, see app/utils/search.py) on
+# tasks written before it existed. Safe to re-run; only tasks without the
+# field are touched. Run once after deploying search.
+#
+#   python backfill_title_prefixes.py
+
+import asyncio
+
+from pymongo import UpdateOne
+
+from dotenv import load_dotenv
+load_dotenv()  # before the app imports, which read settings
+
+from app.database import tasks_collection
+from app.utils.search import search_fields
+
+BATCH_SIZE = 500
+
+
+async def backfill_title_prefixes():
+    cursor = tasks_collection.find(
+        {"title_prefixes": {"$exists": False}},
+        {"title": 1},
+        batch_size=BATCH_SIZE,
+    )
+
+    writes = []
+    count = 0
+    async for task in cursor:
+        # Matched on the old title, so a concurrent rename is not overwritten
+        writes.append(UpdateOne(
+            {"_id": task["_id"], "title": task.get("title"), "title_prefixes": {"$exists": False}},
+            {"$set": search_fields({"title": task.get("title") or ""})}
+        ))
+        if len(writes) >= BATCH_SIZE:
+            await tasks_collection.bulk_write(writes, ordered=False)
+            count += len(writes)
+            writes = []
+
+    if writes:
+        await tasks_collection.bulk_write(writes, ordered=False)
+        count += len(writes)
+
+    print(f"[SEARCH] Backfilled title_prefixes on {count} tasks")
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill_title_prefixes())
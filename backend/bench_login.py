@@ -0,0 +1,65 @@
+# FILE: bench_login.py
+#
+# Login throughput vs. hash pool size: runs a burst of concurrent bcrypt
+# verifications (the CPU cost of /auth/login) through the app's own hash
+# pool (app/auth/hash.py: spawn workers plus the HASH_MAX_PENDING
+# admission limit) at increasing HASH_WORKERS, and prints logins/second
+# and how many were turned away with 503 for each.
+#
+#   python bench_login.py [logins]
+
+import asyncio
+import os
+import sys
+import time
+
+from dotenv import load_dotenv
+load_dotenv()  # before the app imports, which read settings
+
+from fastapi import HTTPException
+
+from app.auth import hash as hash_pool
+from app.auth.hash import hash_password, verify_password_async
+
+
+async def run_burst(hashed: str, logins: int):
+    """Seconds taken, and how many logins got 503."""
+    start = time.perf_counter()
+    results = await asyncio.gather(*[
+        verify_password_async("correct horse", hashed) for _ in range(logins)
+    ], return_exceptions=True)
+    rejected = sum(isinstance(r, HTTPException) and r.status_code == 503 for r in results)
+    for r in results:
+        if isinstance(r, Exception) and not isinstance(r, HTTPException):
+            raise r
+    return time.perf_counter() - start, rejected
+
+
+async def bench_login(logins: int):
+    hashed = hash_password("correct horse")
+    cores = os.cpu_count() or 1
+    max_pending = os.getenv("HASH_MAX_PENDING")
+
+    sizes = sorted({1, 2, cores // 2 or 1, cores, cores * 2})
+    print(f"[BENCH] {logins} logins, {cores} cores")
+
+    for size in sizes:
+        # As if started with HASH_WORKERS=size (and the default limit unless set)
+        hash_pool.shutdown_hash_pool()
+        hash_pool.HASH_WORKERS = size
+        hash_pool.HASH_MAX_PENDING = int(max_pending) if max_pending else size * 4
+        try:
+            # Warm the workers so process start-up isn't measured
+            await run_burst(hashed, size)
+            elapsed, rejected = await run_burst(hashed, logins)
+        finally:
+            hash_pool.shutdown_hash_pool()
+        served = logins - rejected
+        print(
+            f"[BENCH] pool={size:<3} limit={hash_pool.HASH_MAX_PENDING:<4} "
+            f"{served / elapsed:8.1f} logins/s  ({elapsed:.2f}s, {rejected} rejected with 503)"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(bench_login(int(sys.argv[1]) if len(sys.argv) > 1 else 64))
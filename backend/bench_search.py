@@ -0,0 +1,126 @@
+# FILE: bench_search.py
+#
+# Search / autocomplete latency on a synthetic corpus. Seeds a separate
+# database (task_manager_bench, dropped first) with `tasks` tasks spread
+# over 1000 users, builds the production indexes, then times
+# search_tasks (text and prefix) and autocomplete_tasks for random users
+# and prints p50 / p95 / p99.
+#
+#   python bench_search.py [tasks] [queries]      (default 1000000, 2000)
+
+import asyncio
+import random
+import sys
+import time
+
+from pymongo import InsertOne
+
+from dotenv import load_dotenv
+load_dotenv()  # before the app imports, which read settings
+
+from app.database import client, tasks_collection
+from app.indexes import INDEXES
+from app.models import task_model
+from app.utils.search import search_fields
+
+USERS = 1000
+SEED_BATCH = 5000
+
+WORDS = (
+    "review budget report meeting client invoice design deploy fix bug "
+    "write docs plan sprint call vendor update roadmap hire interview "
+    "refactor tests release backup server email newsletter research "
+    "prepare slides onboarding contract renew license audit security"
+).split()
+PRIORITIES = ("High", "Medium", "Low")
+STATUSES = ("todo", "inprogress", "completed", "blocked")
+
+
+def fake_task(rng: random.Random, user_id: str):
+    title = " ".join(rng.choices(WORDS, k=rng.randint(2, 6))).capitalize()
+    task = {
+        "title": title,
+        "description": " ".join(rng.choices(WORDS, k=rng.randint(0, 20))),
+        "priority": rng.choice(PRIORITIES),
+        "status": rng.choice(STATUSES),
+        "date": f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        "user_id": user_id,
+        "version": 0,
+    }
+    return {**task, **search_fields(task)}
+
+
+async def seed(collection, total: int, rng: random.Random):
+    await collection.drop()
+    users = [f"{i:024x}" for i in range(USERS)]
+
+    start = time.perf_counter()
+    batch = []
+    for n in range(total):
+        batch.append(InsertOne(fake_task(rng, users[n % USERS])))
+        if len(batch) >= SEED_BATCH:
+            await collection.bulk_write(batch, ordered=False)
+            batch = []
+    if batch:
+        await collection.bulk_write(batch, ordered=False)
+
+    # Same definitions as production
+    models = next(m for c, m in INDEXES if c is tasks_collection)
+    await collection.create_indexes(models)
+
+    print(f"[BENCH] Seeded {total} tasks for {USERS} users in {time.perf_counter() - start:.1f}s")
+    return users
+
+
+def percentiles(samples: list):
+    samples = sorted(samples)
+    pick = lambda p: samples[min(len(samples) - 1, int(len(samples) * p))] * 1000
+    return f"p50 {pick(0.50):7.2f}ms  p95 {pick(0.95):7.2f}ms  p99 {pick(0.99):7.2f}ms"
+
+
+async def timed(queries: int, call):
+    samples = []
+    for _ in range(queries):
+        start = time.perf_counter()
+        await call()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def bench_search(total: int, queries: int):
+    rng = random.Random(42)
+    collection = client["task_manager_bench"]["tasks"]
+    users = await seed(collection, total, rng)
+
+    # Run the real model queries against the bench collection
+    task_model.tasks_collection = collection
+
+    async def search():
+        q = " ".join(rng.sample(WORDS, rng.randint(1, 2)))
+        await task_model.search_tasks(rng.choice(users), q, 20)
+
+    def partial():
+        word = rng.choice(WORDS)
+        q = word[:rng.randint(1, len(word))]
+        if rng.random() < 0.3:
+            q = rng.choice(WORDS) + " " + q
+        return q
+
+    async def search_prefix():
+        await task_model.search_tasks(rng.choice(users), partial(), 50, prefix=True)
+
+    async def autocomplete():
+        await task_model.autocomplete_tasks(rng.choice(users), partial(), 10)
+
+    for name, call in (("search", search), ("search prefix", search_prefix), ("autocomplete", autocomplete)):
+        await timed(min(queries, 100), call)  # warm the cache
+        print(f"[BENCH] {name:<13} {percentiles(await timed(queries, call))}")
+
+    await collection.drop()
+
+
+if __name__ == "__main__":
+    asyncio.run(bench_search(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1000000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 2000,
+    ))
@@ -0,0 +1,142 @@
+# FILE: check_analytics.py
+#
+# Regression check for /tasks/analytics. Seeds a scratch database
+# (task_manager_check, dropped afterwards) with tasks that include
+# missing, unknown and malformed fields, then compares three versions of
+# the response for every user:
+#
+#   - the original loop over every task document (legacy_analytics)
+#   - the $facet aggregation (task_model.get_task_analytics), formatted
+#     as returned and as rebuild_task_stats stores it
+#   - the incremental counters (stats_model.task_counters, summed)
+#
+# Exits with status 1 on any difference. Needs a real mongod: the $facet
+# pipeline uses operators ($type, $dateFromString) that in-memory mocks
+# don't implement.
+#
+#   python check_analytics.py
+
+import asyncio
+import random
+import sys
+from datetime import datetime
+
+from dotenv import load_dotenv
+load_dotenv()  # before the app imports, which read settings
+
+from app.database import client
+from app.models import task_model
+from app.models.stats_model import counts_to_stats, task_counters
+from app.routes.task_routes import format_analytics
+
+USERS = 20
+TASKS_PER_USER = 200
+
+STATUSES = ["todo", "inprogress", "completed", "completed", "blocked", "archived", None, "missing"]
+PRIORITIES = ["High", "Medium", "Low", "Urgent", None, "missing"]
+DATES = [
+    "2024-01-01", "2024-06-15", "2024-12-30",  # 2024-12-30 is ISO week 1 of 2025
+    "2025-03-09", "", "not-a-date", "2024-13-40", None, 20240101, "missing",
+    # strptime reads unpadded months and days, and a space-padded day
+    "2024-1-5", "2024-3-09", "2024-07-8", "2024-01- 5",
+    # ...but not these
+    "2024-02-30", "2024- 1-05", "2024-1-05 ", "2024-001-05", "2024-01-05-",
+]
+
+
+def legacy_analytics(tasks: list):
+    """The handler as it was before the $facet pipeline, verbatim in effect."""
+    status_map = {
+        "todo": "To Do",
+        "inprogress": "In Progress",
+        "completed": "Completed",
+        "blocked": "Blocked",
+    }
+
+    status_count = {v: 0 for v in status_map.values()}
+    priority_count = {"High": 0, "Medium": 0, "Low": 0}
+    weekly = {}
+
+    for t in tasks:
+        s = t.get("status", "todo")
+        status_count[status_map.get(s, "To Do")] += 1
+
+        p = t.get("priority", "Low")
+        if p in priority_count:
+            priority_count[p] += 1
+
+        if t.get("status") == "completed":
+            date_str = t.get("date")
+            if date_str:
+                try:
+                    dt = datetime.strptime(date_str, "%Y-%m-%d")
+                    week_no = dt.isocalendar().week
+                    weekly[week_no] = weekly.get(week_no, 0) + 1
+                except Exception:
+                    pass
+
+    return {
+        "statusData": [{"name": name, "value": n} for name, n in status_count.items()],
+        "priorityData": [{"name": name, "count": n} for name, n in priority_count.items()],
+        "productivityData": [
+            {"week": f"Week {week}", "tasks": count}
+            for week, count in sorted(weekly.items())
+        ],
+    }
+
+
+def counter_analytics(tasks: list):
+    """What the task_stats counters hold after these tasks were created."""
+    stats = {"status": {}, "priority": {}, "weekly": {}}
+    for t in tasks:
+        for path, n in task_counters(t).items():
+            section, key = path.split(".", 1)
+            stats[section][key] = stats[section].get(key, 0) + n
+    return format_analytics(stats)
+
+
+def synthetic_task(rng: random.Random, user_id: str):
+    task = {"title": "t", "user_id": user_id}
+    for field, values in (("status", STATUSES), ("priority", PRIORITIES), ("date", DATES)):
+        value = rng.choice(values)
+        if value != "missing":
+            task[field] = value
+    return task
+
+
+async def check_analytics():
+    rng = random.Random(42)
+    collection = client["task_manager_check"]["tasks"]
+    await collection.drop()
+
+    # Run the real model query against the scratch collection
+    task_model.tasks_collection = collection
+
+    failures = 0
+    try:
+        for u in range(USERS):
+            user_id = f"{u:024x}"
+            tasks = [synthetic_task(rng, user_id) for _ in range(TASKS_PER_USER)]
+            await collection.insert_many([dict(t) for t in tasks])
+
+            expected = legacy_analytics(tasks)
+            counts = await task_model.get_task_analytics(user_id)  # the $facet pipeline
+            facet = format_analytics(counts)
+            rebuilt = format_analytics(counts_to_stats(counts))
+            counters = counter_analytics(tasks)
+
+            for label, got in (("$facet", facet), ("rebuilt counters", rebuilt), ("counters", counters)):
+                if got != expected:
+                    failures += 1
+                    print(f"[ANALYTICS] DIFF  user {user_id} ({label})")
+                    print(f"    expected {expected}")
+                    print(f"    got      {got}")
+    finally:
+        await collection.drop()
+
+    print(f"[ANALYTICS] {USERS} users, {USERS * TASKS_PER_USER} tasks, {failures} differences")
+    return failures
+
+
+if __name__ == "__main__":
+    sys.exit(1 if asyncio.run(check_analytics()) else 0)
@@ -0,0 +1,67 @@
+# FILE: check_prompt_size.py
+#
+# Builds the AI summary prompt for synthetic task lists of growing size
+# and exits with status 1 if any prompt exceeds PROMPT_TOKEN_BUDGET or
+# the prompt keeps growing with the task count.
+#
+#   python check_prompt_size.py
+
+import random
+import sys
+from datetime import date, timedelta
+
+from dotenv import load_dotenv
+load_dotenv()  # before the app imports, which read settings
+
+from app.utils.prompt_builder import (
+    PROMPT_TOKEN_BUDGET,
+    build_summary_prompt,
+    estimate_tokens,
+)
+
+SIZES = [10, 100, 1_000, 10_000, 100_000]
+TODAY = date(2024, 6, 1)
+WORDS = "review write fix plan call email deploy test refactor design update report".split()
+
+
+def synthetic_tasks(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    for i in range(count):
+        yield {
+            "title": " ".join(rng.choices(WORDS, k=rng.randint(2, 8))) + f" #{i}",
+            "priority": rng.choice(["High", "Medium", "Low"]),
+            "status": rng.choice(["todo", "inprogress", "completed", "blocked"]),
+            "date": (TODAY + timedelta(days=rng.randint(-120, 60))).isoformat(),
+        }
+
+
+def check_prompt_size():
+    failed = False
+    sizes = []
+
+    for count in SIZES:
+        prompt = build_summary_prompt(synthetic_tasks(count), today=TODAY)
+        tokens = estimate_tokens(prompt)
+        sizes.append(tokens)
+
+        over = tokens > PROMPT_TOKEN_BUDGET
+        failed = failed or over
+        print(f"{'OVER' if over else 'ok  '}  {count:>7} tasks -> ~{tokens} tokens")
+
+    # Once the sample fills the budget, more tasks must not mean a bigger prompt
+    if sizes[-1] > sizes[-2] * 1.05:
+        print("Prompt still grows with the task count")
+        failed = True
+
+    # Same input, same prompt (keeps the summary cache effective)
+    a = build_summary_prompt(synthetic_tasks(1_000), today=TODAY)
+    b = build_summary_prompt(reversed(list(synthetic_tasks(1_000))), today=TODAY)
+    if a != b:
+        print("Prompt depends on task order")
+        failed = True
+
+    return failed
+
+
+if __name__ == "__main__":
+    sys.exit(1 if check_prompt_size() else 0)
@@ -0,0 +1,136 @@
+# FILE: check_query_plans.py
+#
+# Runs explain() on every query shape issued by app/models and exits with
+# status 1 if any winning plan falls back to a collection scan.
+#
+#   python check_query_plans.py
+
+import asyncio
+import sys
+from datetime import datetime, timedelta
+
+from bson.objectid import ObjectId
+from dotenv import load_dotenv
+load_dotenv()  # before the app imports, which read settings
+
+from app.database import (
+    users_collection,
+    tasks_collection,
+    activity_collection,
+    activity_daily_collection,
+    otp_collection,
+    task_tombstones_collection,
+    email_outbox_collection,
+)
+from app.indexes import ensure_indexes
+
+SAMPLE_USER_ID = "000000000000000000000000"
+SAMPLE_EMAIL = "someone@example.com"
+TODAY = datetime.today().strftime("%Y-%m-%d")
+TOMORROW = (datetime.today() + timedelta(days=1)).strftime("%Y-%m-%d")
+
+
+# (label, collection, filter, sort)
+QUERY_SHAPES = [
+    ("user_model.get_user_by_email", users_collection,
+     {"email": SAMPLE_EMAIL}, None),
+    ("task_model.get_tasks_by_user", tasks_collection,
+     {"user_id": SAMPLE_USER_ID}, None),
+    ("task_model.get_overdue_tasks", tasks_collection,
+     {"user_id": SAMPLE_USER_ID, "date": {"$lt": TODAY}, "status": {"$ne": "completed"}}, None),
+    ("task_model.get_upcoming_tasks", tasks_collection,
+     {"user_id": SAMPLE_USER_ID, "date": {"$gt": TODAY}}, None),
+    ("task_model.get_tasks_page", tasks_collection,
+     {"user_id": SAMPLE_USER_ID, "status": "todo", "date": {"$gte": TODAY}},
+     [("date", 1), ("_id", 1)]),
+    ("task_model.get_tasks_page (rank)", tasks_collection,
+     {"user_id": SAMPLE_USER_ID, "status": "todo"}, [("rank", 1), ("_id", 1)]),
+    ("task_model.get_column_tail_rank", tasks_collection,
+     {"user_id": SAMPLE_USER_ID, "status": "todo"}, [("rank", -1), ("_id", -1)]),
+    ("task_model.rebalance_column", tasks_collection,
+     {"user_id": SAMPLE_USER_ID, "status": "todo"}, None),
+    ("task_model.get_tasks_by_ids", tasks_collection,
+     {"_id": {"$in": [ObjectId(SAMPLE_USER_ID)]}}, None),
+    ("task_model.get_tasks_page (created)", tasks_collection,
+     {"user_id": SAMPLE_USER_ID}, [("_id", -1)]),
+    ("task_model.search_tasks", tasks_collection,
+     {"user_id": SAMPLE_USER_ID, "$text": {"$search": "budget review"}}, None),
+    ("task_model.search_tasks (prefix)", tasks_collection,
+     {"user_id": SAMPLE_USER_ID, "title_prefixes": {"$all": ["budget", "rev"]},
+      "_id": {"$lt": ObjectId(SAMPLE_USER_ID)}}, [("_id", -1)]),
+    ("task_model.autocomplete_tasks", tasks_collection,
+     {"user_id": SAMPLE_USER_ID, "title_prefixes": {"$all": ["budget", "rev"]}}, [("_id", -1)]),
+    ("sync_model.get_task_changes", tasks_collection,
+     {"user_id": SAMPLE_USER_ID, "seq": {"$gt": 10, "$lte": 20}}, [("seq", 1), ("_id", 1)]),
+    ("sync_model.get_task_changes (pending)", tasks_collection,
+     {"user_id": SAMPLE_USER_ID, "sync_pending": True}, None),
+    ("sync_model.get_task_changes (tombstones)", task_tombstones_collection,
+     {"user_id": SAMPLE_USER_ID, "seq": {"$gt": 10, "$lte": 20}}, [("seq", 1), ("_id", 1)]),
+    ("sync_model.get_task_changes (pending tombstones)", task_tombstones_collection,
+     {"user_id": SAMPLE_USER_ID, "sync_pending": True}, None),
+    ("cron_overdue.reminder_pipeline ($match)", tasks_collection,
+     {"$or": [{"date": {"$lt": TODAY}}, {"date": TOMORROW}], "status": {"$ne": "completed"}}, None),
+    ("reminder_scheduler.load ($match)", tasks_collection,
+     {"user_id": {"$in": [SAMPLE_USER_ID]}, "status": {"$ne": "completed"}}, None),
+    ("reminder_scheduler.resync", tasks_collection,
+     {"updated_at": {"$gt": datetime(2024, 1, 1)}}, None),
+    ("reminder_scheduler.resync (tombstones)", task_tombstones_collection,
+     {"deleted_at": {"$gt": datetime(2024, 1, 1)}}, None),
+    ("activity_model.get_user_activity_page", activity_collection,
+     {"user_id": SAMPLE_USER_ID}, [("timestamp", -1), ("_id", -1)]),
+    ("activity_model.get_user_activity_page (action)", activity_collection,
+     {"user_id": SAMPLE_USER_ID, "action": "login", "timestamp": {"$gte": datetime(2024, 1, 1)}},
+     [("timestamp", -1), ("_id", -1)]),
+    ("activity_model.get_user_activity_daily", activity_daily_collection,
+     {"user_id": SAMPLE_USER_ID}, [("day", -1), ("action", 1)]),
+    ("activity_model.rollup_activity_day ($match, delete_many)", activity_collection,
+     {"timestamp": {"$gte": datetime(2024, 1, 1), "$lt": datetime(2024, 1, 2)}}, None),
+    ("activity_model.oldest_activity_timestamp", activity_collection,
+     {}, [("timestamp", 1)]),
+    ("email_outbox_model.claim_next_email", email_outbox_collection,
+     {"$or": [
+         {"status": "pending", "next_attempt_at": {"$lte": datetime(2024, 1, 1)}},
+         {"status": "sending", "locked_at": {"$lt": datetime(2024, 1, 1)}},
+     ]}, [("next_attempt_at", 1)]),
+    ("otp_model.verify_otp", otp_collection,
+     {"email": SAMPLE_EMAIL, "otp": "123456", "used": False}, None),
+]
+
+
+def find_stages(plan, stage):
+    """Yield every node of an explain plan tree whose stage matches."""
+    if not isinstance(plan, dict):
+        return
+    if plan.get("stage") == stage:
+        yield plan
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            yield from find_stages(plan[key], stage)
+    for child in plan.get("inputStages", []):
+        yield from find_stages(child, stage)
+
+
+async def check_query_plans():
+    await ensure_indexes()
+
+    failures = []
+    for label, collection, query, sort in QUERY_SHAPES:
+        cursor = collection.find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+
+        explain = await cursor.explain()
+        winning = explain["queryPlanner"]["winningPlan"]
+
+        if any(find_stages(winning, "COLLSCAN")):
+            failures.append(label)
+            print(f"[PLAN] COLLSCAN  {label}")
+        else:
+            print(f"[PLAN] ok        {label}")
+
+    return failures
+
+
+if __name__ == "__main__":
+    failures = asyncio.run(check_query_plans())
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,86 @@
+# FILE: check_status_ranks.py
+#
+# Regression check for Kanban order under concurrent status changes.
+# Seeds a scratch database (task_manager_check, dropped afterwards) with
+# one user's board, then:
+#
+#   - moves CARDS tasks into the "completed" column at once
+#     (update_owned_task with status only, under asyncio.gather) and
+#     checks every moved card got its own rank after the old tail
+#   - re-sends the same status for one of them and checks it kept its
+#     place
+#
+# Exits with status 1 on any failure.
+#
+#   python check_status_ranks.py
+
+import asyncio
+import sys
+
+from bson.objectid import ObjectId
+from dotenv import load_dotenv
+load_dotenv()  # before the app imports, which read settings
+
+from app.database import client
+from app.models import task_model
+from app.utils.rank import rank_after
+
+CARDS = 20
+USER_ID = "0" * 24
+
+
+async def check_status_ranks():
+    collection = client["task_manager_check"]["tasks"]
+    await collection.drop()
+
+    # Run the real model writes against the scratch collection
+    task_model.tasks_collection = collection
+
+    failures = []
+    try:
+        tail = rank_after(None)
+        await collection.insert_one({
+            "_id": ObjectId(), "user_id": USER_ID, "title": "done", "status": "completed",
+            "rank": tail, "version": 0,
+        })
+        todo = [ObjectId() for _ in range(CARDS)]
+        await collection.insert_many([
+            {"_id": oid, "user_id": USER_ID, "title": f"card {i}", "status": "todo",
+             "rank": rank_after(None), "version": 0}
+            for i, oid in enumerate(todo)
+        ])
+
+        results = await asyncio.gather(*[
+            task_model.update_owned_task(str(oid), USER_ID, {"status": "completed"})
+            for oid in todo
+        ])
+
+        stored = {
+            t["_id"]: t["rank"]
+            async for t in collection.find({"_id": {"$in": todo}}, {"rank": 1})
+        }
+        ranks = list(stored.values())
+        if len(set(ranks)) != len(ranks):
+            failures.append(f"duplicate ranks: {sorted(ranks)}")
+        if any(r <= tail for r in ranks):
+            failures.append(f"rank not after the old tail {tail!r}: {sorted(ranks)}")
+        for before, after in results:
+            if after["rank"] != stored[ObjectId(before["_id"])]:
+                failures.append(f"returned rank {after['rank']!r} was not the one stored")
+
+        # Same status again: no move
+        first = str(todo[0])
+        _, after = await task_model.update_owned_task(first, USER_ID, {"status": "completed", "title": "x"})
+        if after["rank"] != stored[todo[0]]:
+            failures.append(f"unchanged status moved the card: {stored[todo[0]]!r} -> {after['rank']!r}")
+    finally:
+        await collection.drop()
+
+    for failure in failures:
+        print(f"[RANKS] FAIL  {failure}")
+    print(f"[RANKS] {CARDS} concurrent status changes, {len(failures)} failures")
+    return len(failures)
+
+
+if __name__ == "__main__":
+    sys.exit(1 if asyncio.run(check_status_ranks()) else 0)
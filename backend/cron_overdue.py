@@ -1,104 +1,160 @@
 # FILE: cron_overdue.py
-
+#
+# Daily reminder job. One aggregation finds every user with overdue tasks
+# or tasks due tomorrow, grouped per user and joined with their account,
+# and the emails are queued in the outbox in batches.
+#
+# Progress is checkpointed in reminder_runs (one document per day), so a
+# run that crashes picks up after the last user it finished; the outbox
+# dedupe keys cover the batch that was in flight.
+#
+# The backend schedules reminders itself (app/utils/reminder_scheduler.py);
+# this script is for deployments that run with REMINDER_SCHEDULER=false.
+# Both use the same per-user, per-day dedupe keys in the outbox.
+#
+#   python cron_overdue.py
+
+import asyncio
+import os
 from datetime import datetime, timedelta
-from app.database import users_collection, tasks_collection
-from app.auth.email_utils import send_otp_email  # reuse existing email sender
-
-
-def send_reminder_email(to_email: str, subject: str, body: str):
-    """
-    Wrapper so we don't touch your existing email config.
-    We just reuse send_otp_email(to, otp_text).
-    Here 'otp_text' will actually be our whole message.
-    """
-    send_otp_email(to_email, body)
 
-
-def send_task_reminders():
+from dotenv import load_dotenv
+load_dotenv()  # before the app imports, which read settings
+
+from app.database import tasks_collection, reminder_runs_collection
+from app.models.email_outbox_model import enqueue_emails
+from app.utils.reminder_scheduler import build_reminder_body, REMINDER_SUBJECT
+
+REMINDER_BATCH_SIZE = int(os.getenv("REMINDER_BATCH_SIZE", "200"))
+
+
+# ---------------------------
+# QUERY
+# ---------------------------
+def reminder_pipeline(today_str: str, tomorrow_str: str, after_user_id: str = None):
+    match = {
+        "$or": [
+            {"date": {"$lt": today_str}},       # overdue
+            {"date": tomorrow_str},             # due tomorrow
+        ],
+        "status": {"$ne": "completed"},
+    }
+    if after_user_id:
+        match["user_id"] = {"$gt": after_user_id}
+
+    return [
+        {"$match": match},
+        {"$sort": {"user_id": 1, "date": 1}},
+        {"$group": {
+            "_id": "$user_id",
+            "tasks": {"$push": {"title": "$title", "date": "$date", "priority": "$priority"}},
+        }},
+        {"$sort": {"_id": 1}},
+        # tasks.user_id is the string form of users._id
+        {"$addFields": {
+            "user_oid": {"$convert": {"input": "$_id", "to": "objectId", "onError": None, "onNull": None}},
+        }},
+        {"$lookup": {
+            "from": "users",
+            "localField": "user_oid",
+            "foreignField": "_id",
+            "as": "user",
+        }},
+        {"$unwind": "$user"},
+        {"$project": {"tasks": 1, "user.email": 1, "user.name": 1}},
+    ]
+
+
+# ---------------------------
+# CHECKPOINT
+# ---------------------------
+async def start_run(today_str: str):
+    """Returns the run document for today, creating it if needed."""
+    now = datetime.utcnow()
+    await reminder_runs_collection.update_one(
+        {"_id": today_str},
+        {"$setOnInsert": {"status": "running", "last_user_id": None, "queued": 0, "started_at": now}},
+        upsert=True,
+    )
+    return await reminder_runs_collection.find_one({"_id": today_str})
+
+
+async def save_checkpoint(today_str: str, last_user_id: str, queued: int):
+    await reminder_runs_collection.update_one(
+        {"_id": today_str},
+        {"$set": {"last_user_id": last_user_id, "updated_at": datetime.utcnow()},
+         "$inc": {"queued": queued}},
+    )
+
+
+async def finish_run(today_str: str):
+    await reminder_runs_collection.update_one(
+        {"_id": today_str},
+        {"$set": {"status": "done", "finished_at": datetime.utcnow()}},
+    )
+
+
+# ---------------------------
+# JOB
+# ---------------------------
+async def flush_batch(today_str: str, batch: list, last_user_id: str):
+    # The backend's EmailWorker sends them; dedupe keys make a re-queue a no-op
+    queued = await enqueue_emails(batch)
+    await save_checkpoint(today_str, last_user_id, queued)
+    print(f"[CRON] Queued {queued} reminder emails (through user {last_user_id})")
+
+
+async def send_task_reminders():
     today = datetime.now().date()
     today_str = today.strftime("%Y-%m-%d")
     tomorrow_str = (today + timedelta(days=1)).strftime("%Y-%m-%d")
 
     print(f"[CRON] Running reminders for today = {today_str}, tomorrow = {tomorrow_str}")
 
-    # Get all users
-    users = list(users_collection.find({}))
+    run = await start_run(today_str)
+    if run["status"] == "done":
+        print(f"[CRON] Reminders for {today_str} already sent")
+        return
+    if run.get("last_user_id"):
+        print(f"[CRON] Resuming after user {run['last_user_id']}")
 
-    for user in users:
-        user_id = str(user["_id"])
-        email = user.get("email")
-        name = user.get("name", "there")
+    subject = REMINDER_SUBJECT
+    batch = []
+    last_user_id = run.get("last_user_id")
+
+    cursor = tasks_collection.aggregate(
+        reminder_pipeline(today_str, tomorrow_str, last_user_id),
+        allowDiskUse=True,
+        batchSize=REMINDER_BATCH_SIZE,
+    )
 
+    async for group in cursor:
+        user_id = group["_id"]
+        user = group["user"]
+        last_user_id = user_id
+
+        email = user.get("email")
         if not email:
             continue  # skip if no email
 
-        # --------------------------
-        # 1) Overdue tasks
-        # --------------------------
-        overdue_tasks = list(
-            tasks_collection.find(
-                {
-                    "user_id": user_id,
-                    "date": {"$lt": today_str},           # date before today
-                    "status": {"$ne": "completed"},       # not completed
-                }
-            )
-        )
-
-        # --------------------------
-        # 2) Tasks due tomorrow
-        # --------------------------
-        upcoming_tasks = list(
-            tasks_collection.find(
-                {
-                    "user_id": user_id,
-                    "date": tomorrow_str,                 # exactly tomorrow
-                    "status": {"$ne": "completed"},
-                }
-            )
-        )
-
-        # If no tasks to remind about, skip this user
+        overdue_tasks = [t for t in group["tasks"] if t.get("date", "") < today_str]
+        upcoming_tasks = [t for t in group["tasks"] if t.get("date") == tomorrow_str]
         if not overdue_tasks and not upcoming_tasks:
             continue
 
-        # --------------------------
-        # Build email content
-        # --------------------------
-        lines = []
-        lines.append(f"Hi {name},")
-        lines.append("")
-        lines.append("Here are your task reminders from Task Manager:")
-        lines.append("")
-
-        if overdue_tasks:
-            lines.append("🔴 Overdue tasks:")
-            for t in overdue_tasks:
-                title = t.get("title", "Untitled")
-                date = t.get("date", "N/A")
-                priority = t.get("priority", "N/A")
-                lines.append(f"  • {title}  (Due: {date}, Priority: {priority})")
-            lines.append("")
-
-        if upcoming_tasks:
-            lines.append(f"🟡 Tasks due tomorrow ({tomorrow_str}):")
-            for t in upcoming_tasks:
-                title = t.get("title", "Untitled")
-                priority = t.get("priority", "N/A")
-                lines.append(f"  • {title}  (Priority: {priority})")
-            lines.append("")
-
-        lines.append("Please open the app to update or complete these tasks. ✅")
-        body = "\n".join(lines)
-
-        subject = "Task Reminders: Overdue & Upcoming"
-
-        # --------------------------
-        # Send email
-        # --------------------------
-        send_reminder_email(email, subject, body)
-        print(f"[CRON] Reminder email sent to {email}")
+        body = build_reminder_body(user.get("name", "there"), overdue_tasks, upcoming_tasks, tomorrow_str)
+        batch.append((email, subject, body, f"reminder:{today_str}:{user_id}"))
+
+        if len(batch) >= REMINDER_BATCH_SIZE:
+            await flush_batch(today_str, batch, last_user_id)
+            batch = []
+
+    if batch:
+        await flush_batch(today_str, batch, last_user_id)
+
+    await finish_run(today_str)
+    print(f"[CRON] Reminders for {today_str} done")
 
 
 if __name__ == "__main__":
-    send_task_reminders()
+    asyncio.run(send_task_reminders())
@@ -0,0 +1,70 @@
+# FILE: migrate_attachments.py
+#
+# One-off migration: move inline base64 attachments out of the tasks
+# collection into the content-addressed store (storage/attachments).
+# Safe to re-run; only tasks that still carry a "file" body and no
+# attachment yet are touched, and each write is conditional on the body
+# it read, so a task edited meanwhile is left for the next run.
+#
+#   python migrate_attachments.py
+
+import asyncio
+import binascii
+
+from dotenv import load_dotenv
+load_dotenv()  # before the app imports, which read settings
+
+from app.database import tasks_collection
+from app.models.attachment_model import save_attachment_bytes, release_blob
+from app.models.task_model import bump_task_seq, stamp_tasks, sync_fields
+from app.utils.file_store import decode_data_url
+
+BATCH_SIZE = 50
+
+
+async def migrate_attachments():
+    moved = 0
+    failed = 0
+    skipped = 0
+
+    cursor = tasks_collection.find(
+        # attachment: None also matches a missing field
+        {"file": {"$type": "string", "$ne": ""}, "attachment": None},
+        {"file": 1, "original_file_name": 1, "user_id": 1, "version": 1},
+        batch_size=BATCH_SIZE,
+    )
+
+    async for task in cursor:
+        try:
+            raw, content_type = decode_data_url(task["file"])
+        except (binascii.Error, ValueError) as e:
+            failed += 1
+            print(f"[MIGRATE] Skipping task {task['_id']}: {e}")
+            continue
+
+        attachment = await save_attachment_bytes(raw, task.get("original_file_name"), content_type)
+
+        result = await tasks_collection.update_one(
+            {"_id": task["_id"], "file": task["file"], "attachment": None},
+            {
+                "$set": {"attachment": attachment, **sync_fields()},
+                "$unset": {"file": "", "file_name": ""},
+                "$inc": {"version": 1},
+            },
+        )
+        if not result.modified_count:
+            # Edited or migrated since it was read: drop our reference
+            await release_blob(attachment["hash"])
+            skipped += 1
+            continue
+
+        # Task lists show the attachment: new ETags, and a change to sync
+        seq = await bump_task_seq(task["user_id"])
+        await stamp_tasks(seq, [(task["_id"], (task.get("version") or 0) + 1)])
+        moved += 1
+
+    print(f"[MIGRATE] Moved {moved} attachments, {failed} failed, {skipped} changed meanwhile")
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate_attachments())
@@ -0,0 +1,69 @@
+# FILE: mock_llm.py
+#
+# Stand-in for the Groq chat-completions endpoint, for exercising
+# /ai/summary locally without a real API key or cost (any key will do):
+#
+#   uvicorn mock_llm:app --port 9000
+#   GROQ_API_KEY=mock GROQ_API_URL=http://localhost:9000/v1/chat/completions uvicorn app.main:app
+#
+# MOCK_LLM_DELAY adds latency per call; GET /calls shows how many upstream
+# calls were made, so cache hits and request coalescing are easy to see.
+
+import asyncio
+import json
+import os
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+MOCK_LLM_DELAY = float(os.getenv("MOCK_LLM_DELAY", "1.0"))
+
+app = FastAPI()
+calls = {"count": 0}
+
+
+def mock_reply(prompt: str):
+    lines = [l for l in prompt.splitlines() if l.strip().startswith("- ")]
+    return (
+        f"Summary: you have {len(lines)} tasks.\n"
+        "Weak areas: none detected by the mock.\n"
+        "Suggestions: keep going."
+    )
+
+
+async def stream_reply(text: str):
+    # Same framing as the real API: one delta per word, then [DONE]
+    words = text.split(" ")
+    for i, word in enumerate(words):
+        await asyncio.sleep(MOCK_LLM_DELAY / len(words))
+        delta = word if i == 0 else " " + word
+        chunk = {"choices": [{"index": 0, "delta": {"content": delta}}]}
+        yield f"data: {json.dumps(chunk)}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+@app.post("/v1/chat/completions")
+async def completions(request: Request):
+    body = await request.json()
+    calls["count"] += 1
+
+    prompt = body["messages"][-1]["content"]
+    if body.get("stream"):
+        return StreamingResponse(stream_reply(mock_reply(prompt)), media_type="text/event-stream")
+
+    await asyncio.sleep(MOCK_LLM_DELAY)
+    return {
+        "id": f"mock-{calls['count']}",
+        "object": "chat.completion",
+        "model": body.get("model"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": mock_reply(prompt)},
+            "finish_reason": "stop",
+        }],
+    }
+
+
+@app.get("/calls")
+def get_calls():
+    return calls
@@ -0,0 +1,38 @@
+# FILE: rebalance_ranks.py
+#
+# Gives Kanban ranks to tasks created before they existed, and re-spreads
+# columns whose ranks have grown past RANK_MAX_LENGTH. The API does the
+# latter on its own as keys grow; run this once after deploying ranks.
+#
+#   python rebalance_ranks.py
+
+import asyncio
+
+from dotenv import load_dotenv
+load_dotenv()  # before the app imports, which read settings
+
+from app.database import tasks_collection
+from app.models.task_model import rebalance_column
+from app.utils.rank import RANK_MAX_LENGTH
+
+
+async def rebalance_ranks():
+    columns = tasks_collection.aggregate([
+        {"$match": {"$or": [
+            {"rank": None},
+            {"rank": {"$regex": f"^.{{{RANK_MAX_LENGTH + 1},}}"}},
+        ]}},
+        {"$group": {"_id": {"user_id": "$user_id", "status": "$status"}}},
+    ], allowDiskUse=True)
+
+    count = 0
+    async for column in columns:
+        written = await rebalance_column(column["_id"]["user_id"], column["_id"].get("status"))
+        count += 1
+        print(f"[RANKS] {column['_id']['user_id']}/{column['_id'].get('status')}: {written} tasks re-ranked")
+
+    print(f"[RANKS] Done, {count} columns rebalanced")
+
+
+if __name__ == "__main__":
+    asyncio.run(rebalance_ranks())
@@ -0,0 +1,39 @@
+# FILE: repair_task_stats.py
+#
+# Rebuilds every user's analytics counters (task_stats) from the tasks
+# collection and reports any drift from the incrementally maintained
+# values.
+#
+#   python repair_task_stats.py
+
+import asyncio
+
+from dotenv import load_dotenv
+load_dotenv()  # before the app imports, which read settings
+
+from app.database import tasks_collection, task_stats_collection
+from app.models.stats_model import rebuild_task_stats, stats_drift
+
+
+async def repair_task_stats():
+    user_ids = set(await tasks_collection.distinct("user_id"))
+    user_ids |= set(await task_stats_collection.distinct("_id"))
+
+    drifted = 0
+    for user_id in sorted(user_ids):
+        previous, rebuilt = await rebuild_task_stats(user_id)
+        if previous is None:
+            continue
+
+        drift = stats_drift(previous, rebuilt)
+        if drift:
+            drifted += 1
+            print(f"[STATS] Drift for user {user_id}:")
+            for path, (have, want) in sorted(drift.items()):
+                print(f"    {path}: {have} -> {want}")
+
+    print(f"[STATS] Rebuilt {len(user_ids)} users, {drifted} had drift")
+
+
+if __name__ == "__main__":
+    asyncio.run(repair_task_stats())
@@ -0,0 +1,40 @@
+# FILE: rollup_activity.py
+#
+# Compacts raw activity older than ACTIVITY_ROLLUP_DAYS into daily
+# per-user, per-action counts (activity_daily), one UTC day at a time.
+# Run it daily, e.g. next to cron_overdue.py.
+#
+#   python rollup_activity.py
+
+import asyncio
+from datetime import datetime, timedelta
+
+from dotenv import load_dotenv
+load_dotenv()  # before the app imports, which read settings
+
+from app.models.activity_model import (
+    ACTIVITY_ROLLUP_DAYS,
+    rollup_activity_day,
+    oldest_activity_timestamp,
+)
+
+
+async def rollup_activity():
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    cutoff = today - timedelta(days=ACTIVITY_ROLLUP_DAYS)
+
+    oldest = await oldest_activity_timestamp()
+    if not oldest or oldest >= cutoff:
+        print("[ROLLUP] Nothing to compact")
+        return
+
+    day = oldest.replace(hour=0, minute=0, second=0, microsecond=0)
+    while day < cutoff:
+        groups, deleted = await rollup_activity_day(day)
+        if deleted:
+            print(f"[ROLLUP] {day:%Y-%m-%d}: {deleted} entries -> {groups} summaries")
+        day += timedelta(days=1)
+
+
+if __name__ == "__main__":
+    asyncio.run(rollup_activity())
@@ -53,5 +53,23 @@ api.interceptors.response.use(
   }
 );
 
+// ---------------------------------------
+// 3️⃣ Follow X-Next-Cursor until the last page
+// ---------------------------------------
+export const fetchAllPages = async (path, params = {}) => {
+  const items = [];
+  let cursor = null;
+
+  do {
+    const res = await api.get(path, {
+      params: { ...params, limit: 200, ...(cursor ? { cursor } : {}) },
+    });
+    items.push(...res.data);
+    cursor = res.headers["x-next-cursor"];
+  } while (cursor);
+
+  return items;
+};
+
 // Export for usage
 export default api;
@@ -1,7 +1,7 @@
 // FILE: src/pages/AISummary.jsx
 
 import { useEffect, useState } from "react";
-import api from "../config";
+import { API_URL } from "../config";
 
 import { Lightbulb, TrendingUp, AlertCircle } from "lucide-react";
 
@@ -45,26 +45,34 @@ export default function AISummary() {
   };
 
   useEffect(() => {
-    const fetchSummary = async () => {
-      try {
-        setLoading(true);
-        const res = await api.get("/ai/summary");
-        const sum = res.data.summary || "";
-
-        setSummary(sum);
-
-        // generate score
-        const score = generateScore(sum);
-        setAiScore(score);
-
-      } catch (err) {
-        setError("Unable to fetch AI summary.");
-      } finally {
-        setLoading(false);
-      }
+    // Streamed over SSE so the text appears as the model writes it
+    const token = localStorage.getItem("token");
+    const source = new EventSource(
+      `${API_URL}/ai/summary/stream?token=${encodeURIComponent(token || "")}`
+    );
+    let text = "";
+
+    source.onmessage = (e) => {
+      text += JSON.parse(e.data).token || "";
+      setSummary(text);
+      setLoading(false);
     };
 
-    fetchSummary();
+    source.addEventListener("done", () => {
+      source.close();
+      // generate score
+      setAiScore(generateScore(text));
+      setLoading(false);
+    });
+
+    source.addEventListener("error", () => {
+      // Server-sent error event, or the connection failed
+      source.close();
+      setError("Unable to fetch AI summary.");
+      setLoading(false);
+    });
+
+    return () => source.close();
   }, []);
 
   // Split 3 sections
@@ -15,18 +15,12 @@ export default function EditTask() {
 
   const loadTask = async () => {
     try {
-      const res = await api.get("/tasks/");
-      const task = res.data.find((t) => t._id === task_id);
+      const res = await api.get(`/tasks/${task_id}`);
 
-      if (!task) {
-        setMessage("Task not found");
-        return;
-      }
-
-      setTitle(task.title);
-      setDescription(task.description);
+      setTitle(res.data.title);
+      setDescription(res.data.description);
     } catch (err) {
-      setMessage("Failed to load task");
+      setMessage(err.response?.status === 404 ? "Task not found" : "Failed to load task");
     }
   };
 
@@ -3,7 +3,7 @@
 import { DragDropContext, Droppable, Draggable } from "react-beautiful-dnd";
 import { useEffect, useState } from "react";
 import { useNavigate } from "react-router-dom";
-import api from "../config";
+import api, { fetchAllPages } from "../config";
 
 export default function Kanban() {
   const navigate = useNavigate();
@@ -15,11 +15,13 @@ export default function Kanban() {
     blocked: { name: "Blocked", items: [] },
   });
 
-  // Load Tasks
+  // Load Tasks (each column comes back already in board order)
   const loadTasks = async () => {
     try {
-      const res = await api.get("/tasks/");
-      const tasks = res.data || [];
+      const statuses = ["todo", "inprogress", "completed", "blocked"];
+      const lists = await Promise.all(
+        statuses.map((status) => fetchAllPages("/tasks/", { status, sort: "rank" }))
+      );
 
       const grouped = {
         todo: { name: "To Do", items: [] },
@@ -28,17 +30,14 @@ export default function Kanban() {
         blocked: { name: "Blocked", items: [] },
       };
 
-      tasks.forEach((task) => {
-        const status = task.status || "todo";
-        if (!grouped[status]) return;
-
-        grouped[status].items.push({
+      statuses.forEach((status, i) => {
+        grouped[status].items = lists[i].map((task) => ({
           id: task._id,
           title: task.title,
           description: task.description,
           priority: task.priority,
           date: task.date,
-        });
+        }));
       });
 
       setColumns(grouped);
@@ -56,13 +55,15 @@ export default function Kanban() {
     if (!result.destination) return;
 
     const { source, destination } = result;
+    const sameColumn = source.droppableId === destination.droppableId;
+    if (sameColumn && source.index === destination.index) return;
+
     const sourceColumn = columns[source.droppableId];
     const destColumn = columns[destination.droppableId];
 
     const sourceItems = [...sourceColumn.items];
-    const destItems = [...destColumn.items];
-
     const [moved] = sourceItems.splice(source.index, 1);
+    const destItems = sameColumn ? sourceItems : [...destColumn.items];
     destItems.splice(destination.index, 0, moved);
 
     setColumns({
@@ -71,12 +72,16 @@ export default function Kanban() {
       [destination.droppableId]: { ...destColumn, items: destItems },
     });
 
+    // Only the moved card is written: its new rank sits between its neighbours
     try {
-      await api.put(`/tasks/status/${moved.id}`, {
+      await api.put(`/tasks/${moved.id}/move`, {
         status: destination.droppableId,
+        after_id: destItems[destination.index - 1]?.id ?? null,
+        before_id: destItems[destination.index + 1]?.id ?? null,
       });
     } catch (err) {
-      console.log("Status update failed:", err);
+      console.log("Move failed:", err);
+      loadTasks();
     }
   };
 
@@ -1,6 +1,6 @@
 import { useEffect, useState } from "react";
 import { useParams, useNavigate } from "react-router-dom";
-import api from "../config";
+import api, { API_URL } from "../config";
 
 export default function TaskDetails() {
   const { id } = useParams();
@@ -21,14 +21,18 @@ export default function TaskDetails() {
   if (!task) return <div className="p-6 text-center text-gray-600">Loading...</div>;
 
   // Detect file type
-  const getFileType = (file) => {
-    if (!file) return "none";
-    if (file.includes("application/pdf")) return "pdf";
-    if (file.includes("image")) return "image";
+  const getFileType = (attachment) => {
+    if (!attachment) return "none";
+    const type = attachment.content_type || "";
+    if (type.includes("application/pdf")) return "pdf";
+    if (type.includes("image")) return "image";
     return "other";
   };
 
-  const fileType = getFileType(task.file);
+  const fileType = getFileType(task.attachment);
+
+  // Streamed from the attachment store; token in query for <img>/<iframe>
+  const fileUrl = `${API_URL}/tasks/${id}/attachment?token=${localStorage.getItem("token")}`;
 
   return (
     <div className="p-6 min-h-screen bg-[#E2F1E7] flex justify-center fade-in">
@@ -72,15 +76,15 @@ export default function TaskDetails() {
             📎 Attached File
           </h3>
 
-          {!task.file ? (
+          {!task.attachment ? (
             <p className="text-gray-500">No file uploaded</p>
           ) : (
             <div className="flex flex-col items-start gap-4">
 
               {/* DOWNLOAD BUTTON */}
               <a
-                href={task.file}
-                download={task.original_file_name || "file"}
+                href={fileUrl}
+                download={task.attachment.name || "file"}
                 className="inline-flex items-center gap-2 px-5 py-2 bg-blue-600 text-white rounded-lg hover:bg-blue-700 shadow transition"
               >
                 ⬇ Download File
@@ -91,7 +95,7 @@ export default function TaskDetails() {
 
                 {fileType === "pdf" && (
                   <iframe
-                    src={task.file}
+                    src={fileUrl}
                     title="PDF Preview"
                     className="w-full h-[500px]"
                   ></iframe>
@@ -99,7 +103,7 @@ export default function TaskDetails() {
 
                 {fileType === "image" && (
                   <img
-                    src={task.file}
+                    src={fileUrl}
                     alt="Task File"
                     className="w-full max-h-[500px] object-contain"
                   />
@@ -1,6 +1,6 @@
 import { useEffect, useState } from "react";
 import { useNavigate } from "react-router-dom";
-import api from "../config";
+import api, { fetchAllPages } from "../config";
 import { FiEye } from "react-icons/fi";
 
 export default function Tasks() {
@@ -9,15 +9,17 @@ export default function Tasks() {
   const [tasks, setTasks] = useState([]);
   const [filteredTasks, setFilteredTasks] = useState([]);
   const [searchTerm, setSearchTerm] = useState("");
+  const [searchResults, setSearchResults] = useState(null);
+  const [suggestions, setSuggestions] = useState([]);
   const [selectedDate, setSelectedDate] = useState("");
   const [showDatePicker, setShowDatePicker] = useState(false);
 
   // Load tasks
   const loadTasks = async () => {
     try {
-      const res = await api.get("/tasks/");
-      setTasks(res.data);
-      setFilteredTasks(res.data);
+      const data = await fetchAllPages("/tasks/");
+      setTasks(data);
+      setFilteredTasks(data);
     } catch (err) {
       console.log("Fetch error:", err);
     }
@@ -27,22 +29,48 @@ export default function Tasks() {
     loadTasks();
   }, []);
 
-  // Search + Date Filter
+  // Search runs on the server as you type: every word matches the start
+  // of a title word ("bud" finds "Review budget"), newest first. One page
+  // per pause in typing; the first titles double as suggestions.
   useEffect(() => {
-    let filtered = tasks;
-
-    if (searchTerm.trim()) {
-      filtered = filtered.filter((t) =>
-        t.title.toLowerCase().includes(searchTerm.toLowerCase())
-      );
+    const q = searchTerm.trim();
+    if (!q) {
+      setSearchResults(null);
+      setSuggestions([]);
+      return;
     }
 
+    let cancelled = false;
+    const timer = setTimeout(async () => {
+      try {
+        const res = await api.get("/tasks/search", {
+          params: { q, prefix: true, limit: 50 },
+        });
+        if (!cancelled) {
+          setSearchResults(res.data);
+          setSuggestions(res.data.slice(0, 10));
+        }
+      } catch (err) {
+        console.log("Search error:", err);
+      }
+    }, 250);
+
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [searchTerm, tasks]);
+
+  // Date Filter
+  useEffect(() => {
+    let filtered = searchResults ?? tasks;
+
     if (selectedDate.trim()) {
       filtered = filtered.filter((t) => t.date === selectedDate);
     }
 
     setFilteredTasks(filtered);
-  }, [searchTerm, selectedDate, tasks]);
+  }, [searchResults, selectedDate, tasks]);
 
   // Delete task
   const deleteTask = async (id) => {
@@ -75,10 +103,16 @@ export default function Tasks() {
         <input
           className="border p-3 rounded-lg w-1/3 bg-white shadow-md
             focus:ring-2 ring-blue-400 transition-all"
-          placeholder="Search by title..."
+          placeholder="Search tasks..."
+          list="task-suggestions"
           value={searchTerm}
           onChange={(e) => setSearchTerm(e.target.value)}
         />
+        <datalist id="task-suggestions">
+          {suggestions.map((s) => (
+            <option key={s._id} value={s.title} />
+          ))}
+        </datalist>
 
         {/* Priority Filter */}
         <select className="border p-3 rounded-lg bg-white shadow-md">